@@ -0,0 +1,18 @@
+"""
+ProofGate Benchmarks Package
+
+Synthetic workloads and measurement harnesses for performance work.
+Run individual benchmarks as modules, e.g. `python -m benchmarks.retrieval`.
+"""
+
+from .corpus import (
+    SyntheticCorpus,
+    SyntheticQuestion,
+    generate_corpus,
+)
+
+__all__ = [
+    "SyntheticCorpus",
+    "SyntheticQuestion",
+    "generate_corpus",
+]
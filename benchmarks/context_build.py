@@ -0,0 +1,111 @@
+"""
+Context Build Benchmark
+
+Compares agent context construction with per-request rendering
+(re-concatenating cite token + text for every excerpt) against the
+memoized ExcerptBlock.prompt_block join used by the orchestrator.
+
+Run with: python -m benchmarks.context_build --sizes 50 200 1000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.orchestrator import ProofGateOrchestrator
+from src.schemas.documents import ExcerptBlock
+
+from .corpus import generate_corpus
+from .retrieval import _percentile
+
+
+DEFAULT_SIZES = (50, 200, 1_000)
+
+
+def render_uncached(question: str, excerpts: Dict[str, List[ExcerptBlock]]) -> str:
+    """Baseline: the same layout, rendering every block per request."""
+    sections = []
+    for doc_type, header in ProofGateOrchestrator.CONTEXT_SECTIONS:
+        ordered = sorted(excerpts.get(doc_type, []), key=lambda e: e.excerpt_id)
+        blocks = [f"{e.cite_token}\n{e.text}" for e in ordered]
+        if blocks:
+            sections.append(f"{header}\n" + "\n\n".join(blocks) + "\n")
+        else:
+            sections.append(header)
+    sections.append(f"## QUESTION\n{question}")
+    return "\n\n".join(sections)
+
+
+def _time(fn: Callable[[], Any], repeats: int) -> List[float]:
+    """Time fn() repeats times, in microseconds."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _summary(samples: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": round(_percentile(samples, 50), 2),
+        "p95": round(_percentile(samples, 95), 2),
+        "mean": round(statistics.fmean(samples), 2),
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeats: int = 200,
+) -> Dict[str, Any]:
+    """
+    Time both context builders at each excerpt count.
+
+    Returns:
+        Report dict with per-size latency (microseconds) and speedup
+    """
+    orchestrator = ProofGateOrchestrator(data_dir=Path("/tmp/proofgate_bench"))
+    question = "Can we recognize revenue this quarter?"
+    results = []
+
+    for size in sizes:
+        excerpts = generate_corpus(size, n_questions=1).excerpts
+        # Warm the block cache once, as the first request per corpus would
+        cached_context = orchestrator._build_context(question, excerpts)
+        assert cached_context == render_uncached(question, excerpts)
+
+        uncached = _time(lambda: render_uncached(question, excerpts), repeats)
+        cached = _time(lambda: orchestrator._build_context(question, excerpts), repeats)
+
+        results.append({
+            "excerpts": size,
+            "context_tokens": sum(
+                e.token_count for group in excerpts.values() for e in group
+            ),
+            "uncached_us": _summary(uncached),
+            "cached_us": _summary(cached),
+            "speedup_p50": round(
+                _percentile(uncached, 50) / max(_percentile(cached, 50), 1e-9), 2
+            ),
+        })
+
+    return {"benchmark": "context_build", "repeats": repeats, "results": results}
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.sizes, args.repeats), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
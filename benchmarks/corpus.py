@@ -0,0 +1,179 @@
+"""
+Synthetic Corpus Generator
+
+Generates doc packs (policies, contracts, evidence) in the same
+[CITE=XXX-###] format as data/docs, with labelled relevant excerpts
+per question so retrievers can be scored for recall.
+"""
+
+import random
+from itertools import product
+from string import ascii_uppercase
+from typing import Dict, Iterator, List
+
+from pydantic import BaseModel, Field
+
+from src.ingest.loader import parse_excerpts_from_document
+from src.schemas.documents import Document, ExcerptBlock
+
+
+DOC_TYPES = ("policy", "contract", "evidence")
+
+# Canonical prefix first (matches data/docs), then overflow prefixes that
+# share the type's first letter so IDs never collide across types.
+CANONICAL_PREFIXES = {
+    "policy": "POL",
+    "contract": "CON",
+    "evidence": "EVI",
+}
+
+# Excerpts per synthetic document (one document per customer/type chunk)
+EXCERPTS_PER_DOC = 50
+
+TOPICS = (
+    "acceptance",
+    "termination",
+    "invoice",
+    "delivery",
+    "payment",
+    "warranty",
+    "go-live",
+    "refund",
+)
+
+TEMPLATES = {
+    "policy": (
+        "## Policy clause on {topic}\n"
+        "Revenue for {customer} may only be recognized once {topic} "
+        "criteria are satisfied and documented."
+    ),
+    "contract": (
+        "## Contract section on {topic}\n"
+        "{customer} and the Vendor agree that {topic} obligations are "
+        "governed by this section of the master agreement."
+    ),
+    "evidence": (
+        "## Evidence record for {topic}\n"
+        "Record dated 2026-01-{day:02d} confirming {topic} status for "
+        "{customer}."
+    ),
+}
+
+
+class SyntheticQuestion(BaseModel):
+    """A generated question with its labelled relevant excerpts."""
+    question: str = Field(description="Question text")
+    customer: str = Field(description="Customer the question targets")
+    topic: str = Field(description="Topic the question targets")
+    relevant_ids: List[str] = Field(
+        default_factory=list,
+        description="Excerpt IDs labelled relevant to this question"
+    )
+
+
+class SyntheticCorpus(BaseModel):
+    """A generated doc pack with parsed excerpts and labelled questions."""
+    documents: List[Document]
+    excerpts: Dict[str, List[ExcerptBlock]]
+    questions: List[SyntheticQuestion]
+
+    @property
+    def size(self) -> int:
+        """Total number of excerpts across all doc types."""
+        return sum(len(e) for e in self.excerpts.values())
+
+
+def _excerpt_ids(doc_type: str) -> Iterator[str]:
+    """Yield excerpt IDs in [A-Z]{3}-\\d{3} format for a doc type."""
+    canonical = CANONICAL_PREFIXES[doc_type]
+    prefixes = [canonical] + [
+        canonical[0] + a + b
+        for a, b in product(ascii_uppercase, repeat=2)
+        if canonical[0] + a + b != canonical
+    ]
+    for prefix in prefixes:
+        for n in range(1, 1000):
+            yield f"{prefix}-{n:03d}"
+
+
+def _customer_name(index: int) -> str:
+    """Stable customer name, e.g. 'Customer K' or 'Customer AK'."""
+    name = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = ascii_uppercase[rem] + name
+    return f"Customer {name}"
+
+
+def generate_corpus(
+    n_excerpts: int,
+    n_questions: int = 20,
+    seed: int = 0,
+) -> SyntheticCorpus:
+    """
+    Generate a synthetic doc pack with roughly n_excerpts excerpts.
+
+    Excerpts are split evenly across policy, contract and evidence.
+    Each excerpt covers one (customer, topic) pair; an excerpt is
+    labelled relevant to a question when both match.
+
+    Args:
+        n_excerpts: Total excerpts to generate (split across types)
+        n_questions: Number of labelled questions to generate
+        seed: Random seed for reproducible corpora
+
+    Returns:
+        SyntheticCorpus with documents, parsed excerpts and questions
+    """
+    rng = random.Random(seed)
+    n_customers = max(1, n_excerpts // (len(TOPICS) * 6))
+    customers = [_customer_name(i) for i in range(n_customers)]
+
+    documents: List[Document] = []
+    excerpts: Dict[str, List[ExcerptBlock]] = {t: [] for t in DOC_TYPES}
+    relevant: Dict[tuple, List[str]] = {}
+
+    for type_index, doc_type in enumerate(DOC_TYPES):
+        count = n_excerpts // len(DOC_TYPES)
+        if type_index < n_excerpts % len(DOC_TYPES):
+            count += 1
+
+        ids = _excerpt_ids(doc_type)
+        sections = []
+        for i in range(count):
+            excerpt_id = next(ids)
+            customer = rng.choice(customers)
+            topic = rng.choice(TOPICS)
+            text = TEMPLATES[doc_type].format(
+                customer=customer, topic=topic, day=rng.randint(1, 28)
+            )
+            sections.append(f"[CITE={excerpt_id}]\n{text}\n\n---\n")
+            relevant.setdefault((customer, topic), []).append(excerpt_id)
+
+            if len(sections) == EXCERPTS_PER_DOC or i == count - 1:
+                doc = Document(
+                    doc_id=f"{doc_type}_{len(documents):06d}",
+                    doc_type=doc_type,
+                    title=f"Synthetic {doc_type} pack",
+                    content=f"# Synthetic {doc_type} pack\n\n" + "\n".join(sections),
+                )
+                documents.append(doc)
+                excerpts[doc_type].extend(parse_excerpts_from_document(doc))
+                sections = []
+
+    labelled = sorted(relevant)
+    questions = []
+    for customer, topic in rng.sample(labelled, min(n_questions, len(labelled))):
+        questions.append(SyntheticQuestion(
+            question=f"Can we recognize revenue for {customer} given the {topic} terms?",
+            customer=customer,
+            topic=topic,
+            relevant_ids=relevant[(customer, topic)],
+        ))
+
+    return SyntheticCorpus(
+        documents=documents,
+        excerpts=excerpts,
+        questions=questions,
+    )
@@ -0,0 +1,85 @@
+"""
+Job Queue Throughput Benchmark
+
+Enqueues N jobs into a fresh SQLite job queue and drains them with
+JobWorkerPool at several worker counts. The handler simulates a
+judgment's agent I/O with a sleep, so throughput should scale with
+workers until the queue's own claim/complete writes dominate.
+
+Run with: python -m benchmarks.jobs --workers 1 4 16 --jobs 64
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from src.jobs import Job, JobQueue, JobWorkerPool
+
+
+DEFAULT_WORKERS = (1, 4, 16)
+
+
+async def run_workers(workers: int, jobs: int, io_s: float) -> Dict[str, Any]:
+    """Drain `jobs` jobs with `workers` workers; report throughput."""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(Path(tmp) / "traces.db")
+        await queue.init_db()
+        for n in range(jobs):
+            await queue.enqueue({"n": n})
+
+        done = asyncio.Event()
+        finished = 0
+
+        async def handler(job: Job) -> Dict[str, Any]:
+            nonlocal finished
+            await asyncio.sleep(io_s)
+            finished += 1
+            if finished == jobs:
+                done.set()
+            return {"n": job.payload["n"]}
+
+        pool = JobWorkerPool(queue, handler, workers=workers, poll_s=0.01)
+        start = time.perf_counter()
+        pool.start()
+        await done.wait()
+        elapsed = time.perf_counter() - start
+        await pool.stop()
+
+    return {
+        "workers": workers,
+        "jobs": jobs,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_jobs_per_s": round(jobs / elapsed, 2),
+    }
+
+
+async def run_benchmark(
+    workers: Sequence[int] = DEFAULT_WORKERS,
+    jobs: int = 64,
+    io_s: float = 0.05,
+) -> Dict[str, Any]:
+    """Run the drain benchmark at each worker count."""
+    results = [await run_workers(w, jobs, io_s) for w in workers]
+    return {"benchmark": "jobs", "io_s": io_s, "results": results}
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=list(DEFAULT_WORKERS))
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--io-s", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(args.workers, args.jobs, args.io_s))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Judge Context Benchmark
+
+Compares the size of the LLM Judge input under the v1 layout (Markdown
+sections interpolating Python list reprs and full rationales) against
+the compact canonical JSON payload of prompts/judge_agent_v2.txt, over
+synthetic agent outputs with growing rationales and condition lists.
+
+Token counts are src.tokens estimates (~4 chars/token), which is
+enough to compare two renderings of the same content.
+
+Run with: python -m benchmarks.judge_context --rationale-words 20 80 300
+"""
+
+import argparse
+import json
+import random
+import sys
+from typing import Any, Dict, List, Sequence
+
+from src.judge import build_judge_payload
+from src.schemas.agents import (
+    PolicyAgentOutput,
+    RiskAgentOutput,
+    EvidenceAgentOutput,
+)
+from src.tokens import estimate_tokens
+
+from .corpus import TOPICS
+
+
+DEFAULT_RATIONALE_WORDS = (20, 80, 300)
+
+
+def render_v1(
+    question: str,
+    policy: PolicyAgentOutput,
+    risk: RiskAgentOutput,
+    evidence: EvidenceAgentOutput,
+) -> str:
+    """Baseline: the judge_agent_v1 input layout."""
+    return f"""## QUESTION
+{question}
+
+## POLICY_AGENT_OUTPUT
+Stance: {policy.stance}
+Conditions: {policy.conditions}
+Rationale: {policy.rationale}
+Citations: {policy.citations}
+
+## RISK_AGENT_OUTPUT
+Stance: {risk.stance}
+Risk Flags: {risk.risk_flags}
+Hard Stops: {risk.hard_stops}
+Rationale: {risk.rationale}
+Citations: {risk.citations}
+
+## EVIDENCE_AGENT_OUTPUT
+Stance: {evidence.stance}
+Available Evidence: {evidence.available_evidence}
+Missing Evidence: {evidence.missing_evidence}
+Rationale: {evidence.rationale}
+Citations: {evidence.citations}
+"""
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(TOPICS) for _ in range(words)).capitalize() + "."
+
+
+def generate_outputs(rationale_words: int, items: int = 3, seed: int = 0) -> tuple:
+    """Synthetic policy, risk and evidence outputs of a given verbosity."""
+    rng = random.Random(seed)
+
+    def cites(prefix: str) -> List[str]:
+        return [f"{prefix}-{i:03d}" for i in range(1, items + 1)]
+
+    def phrases() -> List[str]:
+        return [_sentence(rng, 6) for _ in range(items)]
+
+    return (
+        PolicyAgentOutput(
+            stance="YES_CONDITIONAL",
+            conditions=phrases(),
+            rationale=_sentence(rng, rationale_words),
+            citations=cites("POL"),
+        ),
+        RiskAgentOutput(
+            stance="YES_CONDITIONAL",
+            risk_flags=phrases(),
+            rationale=_sentence(rng, rationale_words),
+            citations=cites("CON"),
+        ),
+        EvidenceAgentOutput(
+            stance="SUFFICIENT",
+            available_evidence=phrases(),
+            rationale=_sentence(rng, rationale_words),
+            citations=cites("EVI"),
+        ),
+    )
+
+
+def run_benchmark(
+    rationale_words: Sequence[int] = DEFAULT_RATIONALE_WORDS,
+) -> Dict[str, Any]:
+    """
+    Measure both judge inputs at each rationale length.
+
+    Returns:
+        Report dict with per-length token estimates and savings
+    """
+    question = "Can we recognize revenue this quarter?"
+    results = []
+
+    for words in rationale_words:
+        outputs = generate_outputs(words)
+        v1 = render_v1(question, *outputs)
+        v2 = build_judge_payload(question, *outputs)
+        # Hash stability: an equal copy of the outputs renders identically
+        copies = [o.model_copy(deep=True) for o in outputs]
+        assert build_judge_payload(question, *copies) == v2
+
+        v1_tokens, v2_tokens = estimate_tokens(v1), estimate_tokens(v2)
+        results.append({
+            "rationale_words": words,
+            "v1_tokens": v1_tokens,
+            "v2_tokens": v2_tokens,
+            "v2_has_rationales": '"rationale"' in v2,
+            "saving_pct": round(100 * (1 - v2_tokens / v1_tokens), 1),
+        })
+
+    return {"benchmark": "judge_context", "results": results}
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rationale-words", type=int, nargs="+",
+        default=list(DEFAULT_RATIONALE_WORDS),
+    )
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.rationale_words), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
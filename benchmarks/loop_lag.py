@@ -0,0 +1,168 @@
+"""
+Event Loop Lag Benchmark
+
+Measures how much concurrent retrieval delays the event loop under
+each RetrievalExecutor mode. A probe coroutine sleeps in short ticks
+and records how late each wake-up is; while it runs, N concurrent
+"judgments" each retrieve with a CPU-heavy scoring retriever and then
+await simulated agent I/O.
+
+Run with: python -m benchmarks.loop_lag --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.retrieve import RetrievalExecutor, SimpleRetriever
+from src.retrieve.filters import ExcerptFilter
+from src.schemas.documents import ExcerptBlock
+
+from .corpus import generate_corpus
+from .retrieval import _percentile
+
+
+DEFAULT_MODES = ("inline", "thread", "process")
+
+
+class ScoringRetriever(SimpleRetriever):
+    """
+    Stand-in for a real scoring retriever: pure-Python term overlap
+    over every excerpt, so each query holds the GIL for milliseconds.
+    """
+
+    cpu_bound = True
+
+    def retrieve(
+        self,
+        question: str,
+        excerpt_filter: Optional[ExcerptFilter] = None,
+    ) -> Dict[str, List[ExcerptBlock]]:
+        terms = set(question.lower().split())
+        result = {}
+        for doc_type, excerpts in self.excerpts_by_type.items():
+            scored = sorted(
+                excerpts,
+                key=lambda e: -len(terms & set(e.text.lower().split())),
+            )
+            result[doc_type] = scored[:self.limits.get(doc_type, 2)]
+        return result
+
+
+async def measure_loop_lag(
+    stop: asyncio.Event,
+    interval: float = 0.005,
+) -> List[float]:
+    """
+    Record event-loop lag until stop is set.
+
+    Returns:
+        Lag samples in milliseconds (actual wake-up minus expected)
+    """
+    samples = []
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, (time.perf_counter() - expected) * 1000))
+    return samples
+
+
+async def _judgment(executor: RetrievalExecutor, question: str, io_s: float) -> None:
+    """One simulated request: retrieve, then wait on agent I/O."""
+    await executor.retrieve(question)
+    await asyncio.sleep(io_s)
+
+
+async def run_mode(
+    retriever: Any,
+    mode: str,
+    concurrency: int,
+    requests: int,
+    io_s: float,
+    max_workers: int,
+) -> Dict[str, Any]:
+    """Measure lag and throughput for one executor mode."""
+    executor = RetrievalExecutor(retriever, mode=mode, max_workers=max_workers)
+    # Warm pool workers so process start-up isn't counted as lag
+    await asyncio.gather(*(executor.retrieve("warm up") for _ in range(max_workers)))
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(measure_loop_lag(stop))
+    slots = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int) -> None:
+        async with slots:
+            await _judgment(executor, f"acceptance terms for Customer {i % 7}", io_s)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await probe
+    executor.shutdown()
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        "loop_lag_ms": {
+            "p50": round(_percentile(lag, 50), 3),
+            "p99": round(_percentile(lag, 99), 3),
+            "max": round(max(lag), 3),
+            "mean": round(statistics.fmean(lag), 3),
+        },
+    }
+
+
+async def run_benchmark(
+    corpus_size: int = 20_000,
+    modes: Sequence[str] = DEFAULT_MODES,
+    concurrency: int = 16,
+    requests: int = 64,
+    io_s: float = 0.02,
+    max_workers: int = 4,
+) -> Dict[str, Any]:
+    """Run the lag benchmark for each executor mode."""
+    retriever = ScoringRetriever(generate_corpus(corpus_size, n_questions=1).excerpts)
+    results = []
+    for mode in modes:
+        results.append(await run_mode(
+            retriever, mode, concurrency, requests, io_s, max_workers
+        ))
+    return {
+        "benchmark": "loop_lag",
+        "corpus_size": corpus_size,
+        "concurrency": concurrency,
+        "max_workers": max_workers,
+        "results": results,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus-size", type=int, default=20_000)
+    parser.add_argument("--modes", nargs="+", default=list(DEFAULT_MODES))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(
+        corpus_size=args.corpus_size,
+        modes=args.modes,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        max_workers=args.workers,
+    ))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Provider Connection Pool Benchmark
+
+Measures what the shared provider client saves on connection setup.
+A local stub server speaks just enough HTTP/1.1 keep-alive to answer
+the OpenAI client, and delays each new connection by --connect-delay-ms
+to stand in for the TCP and TLS handshakes of a real provider. Bursts of
+concurrent calls (one burst per judgment) are then sent three ways:
+with a new client per call, through one shared pool starting cold, and
+through one shared pool prewarmed at startup.
+
+Run with: python -m benchmarks.provider_pool --concurrency 4 --connect-delay-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Sequence
+
+from src.agents import ProviderClient
+
+from .retrieval import _percentile
+
+
+DEFAULT_MODES = ("per_call", "shared_cold", "shared_prewarmed")
+
+_BODY = b'{"object":"list","data":[]}'
+
+
+class StubProvider:
+    """
+    Local keep-alive HTTP server answering every request with an empty
+    model list. Each new connection waits `connect_delay_s` before its
+    first request is read, and is counted in `connections`.
+    """
+
+    def __init__(self, connect_delay_s: float):
+        self.connect_delay_s = connect_delay_s
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server = None
+
+    @property
+    def base_url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_delay_s)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method = head.split(b" ", 1)[0]
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n"
+                    + (b"" if method == b"HEAD" else _BODY)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _call(client: ProviderClient) -> float:
+    """One provider call; returns its latency in milliseconds."""
+    start = time.perf_counter()
+    await client.openai.models.list()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_mode(
+    mode: str,
+    concurrency: int,
+    bursts: int,
+    connect_delay_s: float,
+) -> Dict[str, Any]:
+    """Send `bursts` bursts of `concurrency` calls in one client mode."""
+    stub = StubProvider(connect_delay_s)
+    await stub.start()
+    shared = None
+    if mode != "per_call":
+        shared = ProviderClient(api_key="stub", base_url=stub.base_url)
+        if mode == "shared_prewarmed":
+            await shared.prewarm(concurrency)
+    # Connections opened before traffic are not counted against the calls
+    opened_before = stub.connections
+
+    async def call() -> float:
+        if shared is not None:
+            return await _call(shared)
+        client = ProviderClient(api_key="stub", base_url=stub.base_url)
+        try:
+            return await _call(client)
+        finally:
+            await client.aclose()
+
+    latencies: List[float] = []
+    first_burst: List[float] = []
+    for burst in range(bursts):
+        results = await asyncio.gather(*(call() for _ in range(concurrency)))
+        latencies.extend(results)
+        if burst == 0:
+            first_burst = results
+
+    if shared is not None:
+        await shared.aclose()
+    await stub.stop()
+
+    return {
+        "mode": mode,
+        "calls": len(latencies),
+        "connections_opened": stub.connections - opened_before,
+        "prewarmed_connections": opened_before,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "first_burst_max": round(max(first_burst), 3),
+        },
+    }
+
+
+async def run_benchmark(
+    modes: Sequence[str] = DEFAULT_MODES,
+    concurrency: int = 4,
+    bursts: int = 10,
+    connect_delay_ms: float = 50.0,
+) -> Dict[str, Any]:
+    """Run the pool benchmark for each client mode."""
+    results = []
+    for mode in modes:
+        results.append(await run_mode(
+            mode, concurrency, bursts, connect_delay_ms / 1000
+        ))
+    return {
+        "benchmark": "provider_pool",
+        "concurrency": concurrency,
+        "bursts": bursts,
+        "connect_delay_ms": connect_delay_ms,
+        "results": results,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=list(DEFAULT_MODES))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--bursts", type=int, default=10)
+    parser.add_argument("--connect-delay-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(
+        modes=args.modes,
+        concurrency=args.concurrency,
+        bursts=args.bursts,
+        connect_delay_ms=args.connect_delay_ms,
+    ))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Retrieval Benchmark
+
+Measures latency percentiles, memory and recall@k for every retriever
+exported from src/retrieve/ across synthetic corpora of increasing size.
+
+Run with: python -m benchmarks.retrieval --output retrieval_report.json
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+import src.retrieve
+from src.retrieve.filters import ExcerptFilter, FilterIndex
+from src.schemas.documents import ExcerptBlock
+
+from .corpus import SyntheticCorpus, generate_corpus
+
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_K = (1, 5, 10)
+
+
+def discover_retrievers() -> Dict[str, Callable[[Dict[str, List[ExcerptBlock]]], Any]]:
+    """
+    Find every retriever class exported by src.retrieve.
+
+    A retriever is any exported class with a `retrieve` method that is
+    constructed from excerpts_by_type (wrappers such as RetrievalExecutor
+    are skipped). Each is built with default settings.
+    """
+    retrievers = {}
+    for name in src.retrieve.__all__:
+        obj = getattr(src.retrieve, name)
+        if not (inspect.isclass(obj) and callable(getattr(obj, "retrieve", None))):
+            continue
+        params = list(inspect.signature(obj).parameters)
+        if params and params[0] == "excerpts_by_type":
+            retrievers[name] = obj
+    return retrievers
+
+
+def _percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _flatten(retrieved: Dict[str, List[ExcerptBlock]]) -> List[str]:
+    """Flatten a retrieve() result into ranked excerpt IDs."""
+    return [e.excerpt_id for excerpts in retrieved.values() for e in excerpts]
+
+
+def recall_at_k(
+    retrieved_ids: List[str],
+    relevant_ids: Sequence[str],
+    k: int,
+) -> float:
+    """Fraction of relevant excerpts present in the top-k retrieved IDs."""
+    if not relevant_ids:
+        return 0.0
+    hits = set(retrieved_ids[:k]) & set(relevant_ids)
+    return len(hits) / len(relevant_ids)
+
+
+def benchmark_retriever(
+    factory: Callable[[Dict[str, List[ExcerptBlock]]], Any],
+    corpus: SyntheticCorpus,
+    repeats: int = 5,
+    ks: Sequence[int] = DEFAULT_K,
+) -> Dict[str, Any]:
+    """
+    Benchmark one retriever against one corpus.
+
+    Args:
+        factory: Callable that builds the retriever from excerpts_by_type
+        corpus: Synthetic corpus with labelled questions
+        repeats: How many times each question is timed
+        ks: Cut-offs for recall@k
+
+    Returns:
+        Dict with build time, latency percentiles, memory and recall
+    """
+    # Build cost (time and memory) measured separately
+    tracemalloc.start()
+    build_start = time.perf_counter()
+    retriever = factory(corpus.excerpts)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Latency without tracemalloc overhead
+    latencies = []
+    recalls = {k: [] for k in ks}
+    for q in corpus.questions:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            retrieved = retriever.retrieve(q.question)
+            latencies.append((time.perf_counter() - start) * 1000)
+        ranked = _flatten(retrieved)
+        for k in ks:
+            recalls[k].append(recall_at_k(ranked, q.relevant_ids, k))
+
+    # Per-query allocation peak
+    tracemalloc.start()
+    for q in corpus.questions:
+        retriever.retrieve(q.question)
+    _, query_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "build_ms": round(build_ms, 3),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 4),
+            "p95": round(_percentile(latencies, 95), 4),
+            "p99": round(_percentile(latencies, 99), 4),
+            "mean": round(statistics.fmean(latencies), 4),
+            "samples": len(latencies),
+        },
+        "memory_bytes": {
+            "build_peak": build_peak,
+            "query_peak": query_peak,
+        },
+        "recall": {
+            f"@{k}": round(statistics.fmean(v), 4) if v else 0.0
+            for k, v in recalls.items()
+        },
+    }
+
+
+def benchmark_filter_index(
+    corpus: SyntheticCorpus,
+    repeats: int = 5,
+) -> Dict[str, Any]:
+    """
+    Benchmark the metadata FilterIndex on its own.
+
+    Times the index build and records its peak and retained memory,
+    then times resolving each question's customer + date-range filter
+    (which also builds that customer's lazy bitmap on first use).
+
+    Returns:
+        Dict with build time, filter latency percentiles and memory
+    """
+    excerpts = [e for group in corpus.excerpts.values() for e in group]
+
+    tracemalloc.start()
+    build_start = time.perf_counter()
+    index = FilterIndex(excerpts)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    retained, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    filters = [
+        ExcerptFilter(customers=[q.customer], date_from="2026-01-08", date_to="2026-01-21")
+        for q in corpus.questions
+    ]
+    latencies = []
+    for excerpt_filter in filters:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            index.mask(excerpt_filter)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "build_ms": round(build_ms, 3),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 4),
+            "p95": round(_percentile(latencies, 95), 4),
+            "p99": round(_percentile(latencies, 99), 4),
+            "mean": round(statistics.fmean(latencies), 4),
+            "samples": len(latencies),
+        } if latencies else {},
+        "memory_bytes": {
+            "build_peak": build_peak,
+            "retained": retained,
+        },
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    n_questions: int = 20,
+    repeats: int = 5,
+    seed: int = 0,
+    retrievers: Dict[str, Callable] = None,
+) -> Dict[str, Any]:
+    """
+    Run every retriever across every corpus size.
+
+    Returns:
+        Report dict with one result entry per (retriever, corpus size),
+        plus a "FilterIndex" entry per size for the metadata index
+    """
+    retrievers = retrievers or discover_retrievers()
+    results = []
+
+    for size in sizes:
+        corpus = generate_corpus(size, n_questions=n_questions, seed=seed)
+        for name, factory in retrievers.items():
+            entry = benchmark_retriever(factory, corpus, repeats=repeats)
+            entry.update({
+                "retriever": name,
+                "corpus_size": corpus.size,
+                "questions": len(corpus.questions),
+            })
+            results.append(entry)
+        entry = benchmark_filter_index(corpus, repeats=repeats)
+        entry.update({
+            "retriever": "FilterIndex",
+            "corpus_size": corpus.size,
+            "questions": len(corpus.questions),
+        })
+        results.append(entry)
+        del corpus
+
+    return {
+        "benchmark": "retrieval",
+        "generated_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+        help="Corpus sizes (total excerpts) to benchmark",
+    )
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=str, default="-",
+        help="Path for the JSON report ('-' for stdout)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        sizes=args.sizes,
+        n_questions=args.questions,
+        repeats=args.repeats,
+        seed=args.seed,
+    )
+    payload = json.dumps(report, indent=2)
+
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,31 @@
 """
 ProofGate Agents Package
 
-Agent definitions using OpenAI Agents SDK.
+Agent definitions using OpenAI Agents SDK, and the shared provider
+client they call through.
 """
 
 from .definitions import (
+    DEFAULT_MODEL,
+    FAST_MODEL,
     create_policy_agent,
     create_risk_agent,
     create_evidence_agent,
     create_judge_agent,
+    create_packed_agent,
     get_prompt_versions,
 )
+from .client import DEFAULT_PREWARM_CONNECTIONS, ProviderClient
 
 __all__ = [
+    "DEFAULT_MODEL",
+    "FAST_MODEL",
     "create_policy_agent",
     "create_risk_agent",
     "create_evidence_agent",
     "create_judge_agent",
+    "create_packed_agent",
     "get_prompt_versions",
+    "DEFAULT_PREWARM_CONNECTIONS",
+    "ProviderClient",
 ]
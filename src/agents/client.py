@@ -0,0 +1,235 @@
+"""
+Provider Client
+
+One AsyncOpenAI client shared by every agent call, over an httpx
+connection pool with explicit limits, keep-alive and optional HTTP/2.
+Without it each call path gets the SDK's default client, and a burst of
+parallel agent calls pays for new TCP and TLS handshakes that a warm
+pool would skip. Connections can be opened ahead of the first judgment
+(prewarm), and pool use is exported as metrics.
+"""
+
+import asyncio
+import os
+from typing import Any, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from src.metrics import metrics
+
+
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_KEEPALIVE = 32
+DEFAULT_KEEPALIVE_EXPIRY_S = 60.0
+DEFAULT_PREWARM_CONNECTIONS = 4
+
+# Startup does not wait longer than this for prewarming
+DEFAULT_PREWARM_TIMEOUT_S = 5.0
+
+# Whole-call timeout; agent calls are bounded by their deadlines anyway
+DEFAULT_TIMEOUT_S = 60.0
+
+POOL_CONNECTIONS = metrics.gauge(
+    "provider_pool_connections",
+    "Open provider connections, by state (active or idle)",
+)
+POOL_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "provider_pool_requests_in_flight",
+    "Provider HTTP requests awaiting a response",
+)
+POOL_REQUESTS = metrics.counter(
+    "provider_pool_requests_total",
+    "Provider HTTP requests sent through the shared pool",
+)
+POOL_CONNECTIONS_OPENED = metrics.counter(
+    "provider_pool_connections_opened_total",
+    "Provider connections opened (requests minus these were reused)",
+)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that reports back when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport that reports its connection pool as metrics.
+
+    New connections are counted as they are opened, through httpcore's
+    public `trace` request extension, so ones that open and close
+    between scrapes still count. A request counts as in flight, and its
+    connection as active, until its response body is closed and the
+    connection returns to the pool.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.opened = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        POOL_REQUESTS.inc()
+        self._trace(request)
+        self._publish()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        self._publish()
+        response.stream = _ReleasingStream(response.stream, self._release)
+        return response
+
+    @property
+    def connections(self) -> int:
+        """Connections currently held by the pool (0 if it can't be inspected)."""
+        return len(self._pool_connections() or ())
+
+    def _pool_connections(self) -> Optional[List[Any]]:
+        """
+        The httpcore pool's connections, or None if unavailable.
+
+        httpx keeps its pool in a private attribute; if a release moves
+        it, the connection gauges go quiet rather than break requests.
+        """
+        pool = getattr(self, "_pool", None)
+        return getattr(pool, "connections", None)
+
+    def _trace(self, request: httpx.Request) -> None:
+        """Count connections opened for this request, keeping any caller trace."""
+        previous = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                self.opened += 1
+                POOL_CONNECTIONS_OPENED.inc()
+            if previous is not None:
+                result = previous(event_name, info)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._publish()
+
+    def _publish(self) -> None:
+        POOL_REQUESTS_IN_FLIGHT.set(self.in_flight)
+        connections = self._pool_connections()
+        if connections is None:
+            return
+        active = idle = 0
+        for connection in connections:
+            if connection.is_idle():
+                idle += 1
+            else:
+                active += 1
+        POOL_CONNECTIONS.set(active, state="active")
+        POOL_CONNECTIONS.set(idle, state="idle")
+
+
+class ProviderClient:
+    """
+    The shared provider client and the pool under it.
+
+    `openai` is passed to the Agents SDK (see ProofGateOrchestrator's
+    `openai_client`). Its own retries are off: transient errors are
+    retried by the orchestrator's RetryPolicy, which also feeds the
+    circuit breakers.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry_s: float = DEFAULT_KEEPALIVE_EXPIRY_S,
+        http2: bool = False,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+    ):
+        self.transport = PooledTransport(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry_s,
+            ),
+            http2=http2,
+        )
+        self.http_client = httpx.AsyncClient(
+            transport=self.transport, timeout=timeout_s
+        )
+        self.openai = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self.http_client,
+            max_retries=0,
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["ProviderClient"]:
+        """
+        Client configured from PROVIDER_* env vars; None without an
+        OPENAI_API_KEY (the SDK default client is used then).
+        """
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        return cls(
+            api_key=api_key,
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            max_connections=int(os.getenv("PROVIDER_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive=int(os.getenv("PROVIDER_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+            keepalive_expiry_s=float(
+                os.getenv("PROVIDER_KEEPALIVE_EXPIRY_S", DEFAULT_KEEPALIVE_EXPIRY_S)
+            ),
+            http2=os.getenv("PROVIDER_HTTP2", "false").lower() == "true",
+        )
+
+    async def prewarm(
+        self,
+        connections: int = DEFAULT_PREWARM_CONNECTIONS,
+        timeout_s: float = DEFAULT_PREWARM_TIMEOUT_S,
+    ) -> int:
+        """
+        Open up to `connections` pooled connections before real traffic.
+
+        Sends that many concurrent HEAD requests to the API base URL;
+        any response (even 404) leaves a kept-alive connection behind.
+        Failures and timeouts are ignored: a cold pool is only slower.
+        Over HTTP/2 the requests share one connection.
+
+        Returns:
+            Connections held by the pool afterwards
+        """
+        url = str(self.openai.base_url)
+        try:
+            async with asyncio.timeout(timeout_s):
+                await asyncio.gather(
+                    *(self.http_client.head(url) for _ in range(connections)),
+                    return_exceptions=True,
+                )
+        except TimeoutError:
+            pass
+        return self.transport.connections
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self.http_client.aclose()
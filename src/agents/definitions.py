@@ -6,7 +6,7 @@ Create agents using OpenAI Agents SDK with structured outputs.
 
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from agents import Agent
 
@@ -15,6 +15,9 @@ from src.schemas.agents import (
     RiskAgentOutput,
     EvidenceAgentOutput,
     FinalVerdict,
+    PackedPolicyAgentOutput,
+    PackedRiskAgentOutput,
+    PackedEvidenceAgentOutput,
 )
 
 
@@ -24,6 +27,16 @@ PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
 # Default model
 DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 
+# Model tried first in cascade mode, before escalating to DEFAULT_MODEL
+FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+
+# Packed (multi-question) output type for each single-question one
+PACKED_OUTPUT_TYPES = {
+    PolicyAgentOutput: PackedPolicyAgentOutput,
+    RiskAgentOutput: PackedRiskAgentOutput,
+    EvidenceAgentOutput: PackedEvidenceAgentOutput,
+}
+
 
 def _load_prompt(filename: str) -> str:
     """Load a prompt file from the prompts directory."""
@@ -41,7 +54,7 @@ def create_policy_agent(model: str = None) -> Agent:
     """
     return Agent(
         name="PolicyAgent",
-        instructions=_load_prompt("policy_agent_v1.txt"),
+        instructions=_load_prompt("policy_agent_v2.txt"),
         output_type=PolicyAgentOutput,
         model=model or DEFAULT_MODEL,
     )
@@ -83,21 +96,43 @@ def create_judge_agent(model: str = None) -> Agent:
     """
     return Agent(
         name="JudgeAgent",
-        instructions=_load_prompt("judge_agent_v1.txt"),
+        instructions=_load_prompt("judge_agent_v2.txt"),
         output_type=FinalVerdict,
         model=model or DEFAULT_MODEL,
     )
 
 
-def get_prompt_versions() -> Dict[str, str]:
+def create_packed_agent(agent: Agent) -> Agent:
+    """
+    Create the packed variant of a parallel agent.
+    
+    Same instructions and model, plus the packing addendum; answers
+    several questions over one excerpt set in a single call.
+    """
+    return Agent(
+        name=f"{agent.name}Packed",
+        instructions=agent.instructions + "\n\n" + _load_prompt("packing_v1.txt"),
+        output_type=PACKED_OUTPUT_TYPES[agent.output_type],
+        model=agent.model,
+    )
+
+
+def get_prompt_versions(models: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Get version info for all prompts.
     
     Used for trace hashing and reproducibility.
+    
+    Args:
+        models: Model per agent, appended to its version as `v1@model`
+            for agents whose model is not implied (e.g. cascade mode)
     """
-    return {
-        "policy": "v1",
+    versions = {
+        "policy": "v2",
         "risk": "v1",
         "evidence": "v1",
-        "judge": "v1",
+        "judge": "v2",
     }
+    for name, model in (models or {}).items():
+        versions[name] = f"{versions[name]}@{model}"
+    return versions
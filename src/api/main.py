@@ -5,18 +5,61 @@ RESTful API for the multi-agent judgment system.
 """
 
 import os
+import re
+import json
+import math
+import asyncio
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
+from src.agents import DEFAULT_PREWARM_CONNECTIONS, ProviderClient
+from src.metrics import metrics
 from src.orchestrator import ProofGateOrchestrator
+from src.resilience import (
+    DEFAULT_DEADLINE_S,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_HEDGE_RATE,
+    DEFAULT_RESET_TIMEOUT_S,
+    DEFAULT_RETRY_ATTEMPTS,
+    CircuitBreakers,
+    Deadline,
+    DeadlineExceeded,
+    HedgePolicy,
+    RateLimiter,
+    RetryPolicy,
+    StageBudgets,
+)
+from src.scheduling import (
+    DEFAULT_INITIAL_LIMIT,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_LIMIT,
+    DEFAULT_MAX_QUEUE_WAIT_S,
+    DEFAULT_TENANT,
+    PRIORITIES,
+    AdaptiveConcurrencyLimiter,
+    Admission,
+    AdmissionController,
+    AdmissionRejected,
+)
+from src.jobs import (
+    DEFAULT_LEASE_S,
+    DEFAULT_RETRY_BASE_S,
+    DEFAULT_RETRY_MAX_S,
+    DEFAULT_WORKERS,
+    Job,
+    JobQueue,
+    JobWorkerPool,
+)
 from src.ingest import load_all_documents
-from src.retrieve import SimpleRetriever
+from src.retrieve import SimpleRetriever, ExcerptFilter, RetrievalExecutor
 from src.schemas.documents import RunTrace
 
 # Load environment variables
@@ -34,6 +77,23 @@ class JudgeRequest(BaseModel):
         default=False,
         description="Whether to include the acceptance email in evidence"
     )
+    filters: Optional[ExcerptFilter] = Field(
+        default=None,
+        description="Optional metadata filters applied before retrieval"
+    )
+
+
+class RejudgeRequest(BaseModel):
+    """Request to re-judge a stored run after an evidence change."""
+    run_id: str = Field(description="Run to re-judge")
+    add_excerpt_ids: List[str] = Field(
+        default_factory=list,
+        description="Excerpt IDs to add to the run's excerpts"
+    )
+    remove_excerpt_ids: List[str] = Field(
+        default_factory=list,
+        description="Excerpt IDs to remove from the run's excerpts"
+    )
 
 
 class JudgeResponse(BaseModel):
@@ -62,51 +122,207 @@ class TraceListResponse(BaseModel):
 # Global state
 _orchestrator: Optional[ProofGateOrchestrator] = None
 _retriever: Optional[SimpleRetriever] = None
-_all_excerpts: dict = {}
+_retrieval_executor: Optional[RetrievalExecutor] = None
+_admission: Optional[AdmissionController] = None
+_job_queue: Optional[JobQueue] = None
+_job_pool: Optional[JobWorkerPool] = None
+_provider_client: Optional[ProviderClient] = None
+
+# Acceptance email excerpt toggled by include_acceptance_email
+ACCEPTANCE_EXCERPT_ID = 'EVI-003'
+
+# Relative request deadline a client may set (capped by REQUEST_DEADLINE_S)
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# Request priority for admission queueing: interactive (default) or batch
+PRIORITY_HEADER = "X-Request-Priority"
+
+# Tenant whose fair share of judgment and provider-call slots a request uses
+TENANT_HEADER = "X-Tenant-Id"
+TENANT_PATTERN = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+
+# Time budgets shared by retrieval (here) and the orchestrator's stages
+STAGE_BUDGETS = StageBudgets()
+
+# How often run_judgment checks whether the client is still connected
+DISCONNECT_POLL_S = 0.25
+
+# Non-standard status (nginx convention) for runs the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+JUDGMENTS_ABORTED = metrics.counter(
+    "judgments_aborted_total",
+    "Judgment runs aborted before completion, by reason",
+)
+
+
+def _deadline_limit_s() -> float:
+    """Configured hard limit for a whole request, in seconds."""
+    return float(os.getenv("REQUEST_DEADLINE_S", DEFAULT_DEADLINE_S))
+
+
+def _tenant_weights() -> Dict[str, float]:
+    """Fair-share weights by tenant from TENANT_WEIGHTS_JSON; others weigh 1."""
+    return {
+        tenant: float(weight)
+        for tenant, weight in json.loads(os.getenv("TENANT_WEIGHTS_JSON", "{}")).items()
+    }
+
+
+def _concurrency_limiter() -> Optional[AdaptiveConcurrencyLimiter]:
+    """Adaptive provider-call limit from env; None when disabled."""
+    if os.getenv("ADAPTIVE_CONCURRENCY", "true").lower() != "true":
+        return None
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=int(os.getenv("ADAPTIVE_CONCURRENCY_INITIAL", DEFAULT_INITIAL_LIMIT)),
+        max_limit=int(os.getenv("ADAPTIVE_CONCURRENCY_MAX", DEFAULT_MAX_LIMIT)),
+        tenant_weights=_tenant_weights(),
+    )
+
+
+def _hedge_policy() -> Optional[HedgePolicy]:
+    """Agent-call hedging from env; opt-in because hedges cost tokens."""
+    if os.getenv("HEDGE_REQUESTS", "false").lower() != "true":
+        return None
+    return HedgePolicy(
+        max_hedge_rate=float(os.getenv("HEDGE_MAX_RATE", DEFAULT_MAX_HEDGE_RATE)),
+    )
+
+
+def _get_provider_client() -> Optional[ProviderClient]:
+    """Get or create the pooled provider client (None without an API key)."""
+    global _provider_client
+    if _provider_client is None:
+        _provider_client = ProviderClient.from_env()
+    return _provider_client
 
 
 async def _get_orchestrator() -> ProofGateOrchestrator:
     """Get or create the orchestrator instance."""
     global _orchestrator
     if _orchestrator is None:
+        provider_client = _get_provider_client()
         _orchestrator = ProofGateOrchestrator(
             data_dir=Path("./data"),
             deterministic_mode=True,
+            judge_mode=os.getenv("JUDGE_MODE", "rules"),
+            short_circuit=os.getenv("SHORT_CIRCUIT", "false").lower() == "true",
+            cascade=os.getenv("CASCADE_MODE", "false").lower() == "true",
+            deadline_s=_deadline_limit_s(),
+            stage_budgets=STAGE_BUDGETS,
+            rate_limiter=RateLimiter.from_env(),
+            concurrency_limiter=_concurrency_limiter(),
+            hedge_policy=_hedge_policy(),
+            retry_policy=RetryPolicy(
+                max_attempts=int(os.getenv("PROVIDER_MAX_ATTEMPTS", DEFAULT_RETRY_ATTEMPTS)),
+            ),
+            circuit_breakers=CircuitBreakers(
+                failure_threshold=int(
+                    os.getenv("CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)
+                ),
+                reset_timeout_s=float(
+                    os.getenv("CIRCUIT_RESET_TIMEOUT_S", DEFAULT_RESET_TIMEOUT_S)
+                ),
+            ),
+            openai_client=provider_client.openai if provider_client else None,
         )
         await _orchestrator.init()
     return _orchestrator
 
 
-def _get_retriever(include_acceptance: bool = False) -> SimpleRetriever:
-    """Get or create the retriever instance."""
-    global _retriever, _all_excerpts
-    
-    data_dir = Path("./data")
-    data = load_all_documents(data_dir)
-    
-    excerpts_by_type = data['excerpts'].copy()
-    
-    # Filter out acceptance email if not included
+def _get_admission_controller() -> AdmissionController:
+    """Get or create the admission controller shared by judgment endpoints."""
+    global _admission
+    if _admission is None:
+        max_queue = os.getenv("ADMISSION_MAX_QUEUE")
+        _admission = AdmissionController(
+            max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)),
+            max_queue_wait_s=float(
+                os.getenv("ADMISSION_MAX_QUEUE_WAIT_S", DEFAULT_MAX_QUEUE_WAIT_S)
+            ),
+            max_queue=int(max_queue) if max_queue else None,
+            tenant_weights=_tenant_weights(),
+        )
+    return _admission
+
+
+async def _get_job_queue() -> JobQueue:
+    """Get or create the job queue (a table in traces.db)."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            Path("./data") / "traces.db",
+            retry_base_s=float(os.getenv("JOB_RETRY_BASE_S", DEFAULT_RETRY_BASE_S)),
+            retry_max_s=float(os.getenv("JOB_RETRY_MAX_S", DEFAULT_RETRY_MAX_S)),
+        )
+        await _job_queue.init_db()
+    return _job_queue
+
+
+def _get_retriever() -> SimpleRetriever:
+    """Get or create the retriever instance (corpus loaded once)."""
+    global _retriever
+    if _retriever is None:
+        data = load_all_documents(Path("./data"))
+        _retriever = SimpleRetriever(data['excerpts'], evidence_limit=3)
+    return _retriever
+
+
+def _get_retrieval_executor() -> RetrievalExecutor:
+    """Get or create the async retrieval executor."""
+    global _retrieval_executor
+    if _retrieval_executor is None:
+        _retrieval_executor = RetrievalExecutor(
+            _get_retriever(),
+            mode=os.getenv("RETRIEVAL_MODE", "auto"),
+            max_workers=int(os.getenv("RETRIEVAL_WORKERS", 4)),
+        )
+    return _retrieval_executor
+
+
+def _build_filter(
+    include_acceptance: bool = False,
+    filters: Optional[ExcerptFilter] = None,
+) -> ExcerptFilter:
+    """Combine request filters with the acceptance-email toggle."""
+    excerpt_filter = filters.model_copy(deep=True) if filters else ExcerptFilter()
     if not include_acceptance:
-        excerpts_by_type['evidence'] = [
-            e for e in excerpts_by_type['evidence']
-            if e.excerpt_id != 'EVI-003'  # Acceptance email
-        ]
-    
-    # When acceptance email is included, increase evidence limit to include all 3
-    evidence_limit = 3 if include_acceptance else 2
-    return SimpleRetriever(excerpts_by_type, evidence_limit=evidence_limit)
+        excerpt_filter.exclude_ids = (
+            (excerpt_filter.exclude_ids or []) + [ACCEPTANCE_EXCERPT_ID]
+        )
+    return excerpt_filter
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
-    global _orchestrator
+    global _orchestrator, _retrieval_executor, _job_pool, _provider_client
+    provider_client = _get_provider_client()
+    if provider_client is not None:
+        # Connections are ready before the first judgment's agent burst
+        await provider_client.prewarm(int(
+            os.getenv("PROVIDER_PREWARM_CONNECTIONS", DEFAULT_PREWARM_CONNECTIONS)
+        ))
     _orchestrator = await _get_orchestrator()
+    _get_retrieval_executor()
+    _job_pool = JobWorkerPool(
+        await _get_job_queue(),
+        _run_job,
+        workers=int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS)),
+        lease_s=float(os.getenv("JOB_LEASE_S", DEFAULT_LEASE_S)),
+    )
+    _job_pool.start()
     yield
     # Shutdown
-    pass
+    await _job_pool.stop()
+    _job_pool = None
+    if _retrieval_executor is not None:
+        _retrieval_executor.shutdown()
+        _retrieval_executor = None
+    if _provider_client is not None:
+        await _provider_client.aclose()
+        _provider_client = None
 
 
 def create_app() -> FastAPI:
@@ -146,8 +362,94 @@ async def health_check():
     )
 
 
+def _request_deadline(http_request: Request) -> Deadline:
+    """
+    Deadline for this request: the configured limit, tightened by the
+    client's X-Request-Deadline-Ms header if present.
+    """
+    timeout_s = _deadline_limit_s()
+    header = http_request.headers.get(DEADLINE_HEADER)
+    if header is not None:
+        try:
+            timeout_s = min(timeout_s, int(header) / 1000)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{DEADLINE_HEADER} must be an integer number of milliseconds"
+            )
+    return Deadline.after(timeout_s)
+
+
+def _request_priority(http_request: Request) -> str:
+    """Admission priority from the X-Request-Priority header."""
+    priority = http_request.headers.get(PRIORITY_HEADER, "interactive").lower()
+    if priority not in PRIORITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{PRIORITY_HEADER} must be one of: {', '.join(PRIORITIES)}"
+        )
+    return priority
+
+
+def _request_tenant(http_request: Request) -> str:
+    """Tenant from the X-Tenant-Id header (DEFAULT_TENANT if absent)."""
+    tenant = http_request.headers.get(TENANT_HEADER, DEFAULT_TENANT)
+    if not TENANT_PATTERN.fullmatch(tenant):
+        raise HTTPException(
+            status_code=400,
+            detail=f"{TENANT_HEADER} must be 1-64 letters, digits, '_', '.' or '-'"
+        )
+    return tenant
+
+
+async def _admit(http_request: Request) -> Admission:
+    """
+    Wait for a judgment slot in the request's priority and tenant queue.
+    
+    Raises:
+        HTTPException: 429 with Retry-After when the request is shed
+    """
+    try:
+        return await _get_admission_controller().acquire(
+            _request_priority(http_request), _request_tenant(http_request)
+        )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after_s))},
+        )
+
+
+async def _retrieve_for(
+    request: JudgeRequest,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    Retrieve excerpts for a judge request (off the event loop if heavy).
+    
+    Raises:
+        DeadlineExceeded: if retrieval does not finish within `deadline`
+    """
+    excerpt_filter = _build_filter(
+        include_acceptance=request.include_acceptance_email,
+        filters=request.filters,
+    )
+    executor = _get_retrieval_executor()
+    if deadline is None:
+        return await executor.retrieve(request.question, excerpt_filter)
+    async with deadline.enforce("retrieval"):
+        return await executor.retrieve(request.question, excerpt_filter)
+
+
+async def _until_disconnected(http_request: Request) -> None:
+    """Return once the client has gone away."""
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_S)
+
+
 @app.post("/api/judge", response_model=JudgeResponse)
-async def run_judgment(request: JudgeRequest):
+async def run_judgment(request: JudgeRequest, http_request: Request):
     """
     Run the multi-agent judgment pipeline.
     
@@ -155,22 +457,69 @@ async def run_judgment(request: JudgeRequest):
     1. Retrieves relevant excerpts
     2. Runs Policy, Risk, Evidence agents in parallel
     3. Validates citations (no hallucinations)
-    4. Runs Judge agent for deterministic resolution
+    4. Resolves the verdict with deterministic rules
     5. Returns structured verdict with trace
+    
+    If the client disconnects mid-run, the run (and every in-flight
+    agent call) is cancelled. Each stage runs under the request
+    deadline; running out of time fails closed with DEADLINE_EXCEEDED.
+    
+    At most ADMISSION_MAX_CONCURRENT judgments run at once; the rest
+    queue by X-Request-Priority and are shed with 429 and Retry-After
+    when the wait would exceed ADMISSION_MAX_QUEUE_WAIT_S. Within a
+    priority, judgment and provider-call slots are shared fairly
+    between X-Tenant-Id tenants.
     """
     orchestrator = await _get_orchestrator()
+    deadline = _request_deadline(http_request)
+    admission = await _admit(http_request)
+    try:
+        return await _judge(request, http_request, orchestrator, deadline)
+    finally:
+        admission.release()
+
+
+async def _judge(
+    request: JudgeRequest,
+    http_request: Request,
+    orchestrator: ProofGateOrchestrator,
+    deadline: Deadline,
+) -> JudgeResponse:
+    """Retrieve and run one admitted judgment (see run_judgment)."""
+    try:
+        excerpts = await _retrieve_for(
+            request, deadline.child(STAGE_BUDGETS.retrieval)
+        )
+    except DeadlineExceeded as e:
+        return JudgeResponse(
+            **orchestrator.deadline_exceeded_result(request.question, e)
+        )
     
-    # Get retriever with or without acceptance email
-    retriever = _get_retriever(
-        include_acceptance=request.include_acceptance_email
-    )
+    # Run judgment pipeline, racing it against client disconnect
+    run_task = asyncio.create_task(orchestrator.run(
+        request.question, excerpts, deadline=deadline,
+        tenant=_request_tenant(http_request),
+    ))
+    watcher = asyncio.create_task(_until_disconnected(http_request))
+    try:
+        await asyncio.wait(
+            {run_task, watcher}, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        watcher.cancel()
+        if not run_task.done():
+            run_task.cancel()
+            await asyncio.gather(run_task, return_exceptions=True)
     
-    # Retrieve excerpts
-    excerpts = retriever.retrieve(request.question)
+    if run_task.cancelled():
+        JUDGMENTS_ABORTED.inc(reason="client_disconnect")
+        raise HTTPException(
+            status_code=CLIENT_CLOSED_REQUEST,
+            detail="Client disconnected; judgment cancelled"
+        )
     
-    # Run judgment pipeline
     try:
-        result = await orchestrator.run(request.question, excerpts)
+        result = run_task.result()
         return JudgeResponse(**result)
     except Exception as e:
         raise HTTPException(
@@ -179,6 +528,179 @@ async def run_judgment(request: JudgeRequest):
         )
 
 
+@app.post("/api/rejudge", response_model=JudgeResponse)
+async def rejudge(request: RejudgeRequest, http_request: Request):
+    """
+    Re-judge a stored run with excerpts added or removed.
+    
+    Only agents whose view of the excerpts changed are rerun; the rest
+    reuse the stored outputs. Toggling the acceptance email (EVI-003)
+    reruns the Evidence and Risk Agents; Policy is reused.
+    """
+    orchestrator = await _get_orchestrator()
+    previous = await orchestrator.trace_store.get_result(request.run_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    try:
+        added = _get_retriever().get_by_ids(request.add_excerpt_ids)
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=str(e.args[0]))
+    
+    deadline = _request_deadline(http_request)
+    admission = await _admit(http_request)
+    try:
+        result = await orchestrator.rejudge(
+            previous, added, request.remove_excerpt_ids, deadline=deadline,
+            tenant=_request_tenant(http_request),
+        )
+        return JudgeResponse(**result)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Judgment pipeline error: {str(e)}"
+        )
+    finally:
+        admission.release()
+
+
+async def _run_job(job: Job) -> dict:
+    """
+    Job handler: run a queued judgment.
+    
+    Jobs queue for admission as batch work, behind interactive
+    requests and fairly across the tenants that enqueued them; being
+    shed just means waiting and asking again. The request deadline
+    starts once admitted.
+    """
+    payload = dict(job.payload)
+    tenant = payload.pop("tenant", DEFAULT_TENANT)
+    request = JudgeRequest.model_validate(payload)
+    orchestrator = await _get_orchestrator()
+    admission_controller = _get_admission_controller()
+    while True:
+        try:
+            admission = await admission_controller.acquire("batch", tenant)
+            break
+        except AdmissionRejected as e:
+            await asyncio.sleep(e.retry_after_s)
+    
+    try:
+        deadline = Deadline.after(_deadline_limit_s())
+        try:
+            excerpts = await _retrieve_for(
+                request, deadline.child(STAGE_BUDGETS.retrieval)
+            )
+        except DeadlineExceeded as e:
+            result = orchestrator.deadline_exceeded_result(request.question, e)
+        else:
+            result = await orchestrator.run(
+                request.question, excerpts, deadline=deadline, tenant=tenant
+            )
+        return JudgeResponse(**result).model_dump()
+    finally:
+        admission.release()
+
+
+@app.post("/api/jobs", response_model=Job, status_code=202)
+async def enqueue_job(request: JudgeRequest, http_request: Request):
+    """
+    Queue a judgment to run in the background.
+    
+    Returns the job at once; poll GET /api/jobs/{job_id} for its status
+    and, once succeeded, its result. Jobs are stored in traces.db and
+    survive restarts; a job whose worker dies is retried when its
+    lease lapses.
+    """
+    queue = await _get_job_queue()
+    job = await queue.enqueue({
+        **request.model_dump(), 'tenant': _request_tenant(http_request),
+    })
+    if _job_pool is not None:
+        _job_pool.notify()
+    return job
+
+
+@app.get("/api/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """Get a job's status and, once finished, its result or error."""
+    queue = await _get_job_queue()
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/judge/stream")
+async def stream_judgment(request: JudgeRequest, http_request: Request):
+    """
+    Run the judgment pipeline, streaming results as server-sent events.
+    
+    Emits, in order:
+    - `agent`: one per Policy/Risk/Evidence agent as soon as it
+      completes, with its validated output and latency
+    - `verdict`: the final verdict
+    - `trace`: run_id, trace and excerpts used
+    - `error`: only if the pipeline itself raised
+    """
+    orchestrator = await _get_orchestrator()
+    deadline = _request_deadline(http_request)
+    # Admitted before the response starts, so shedding is a real 429
+    admission = await _admit(http_request)
+    tenant = _request_tenant(http_request)
+    
+    async def events():
+        try:
+            async for chunk in _stream_events(request, orchestrator, deadline, tenant):
+                yield chunk
+        finally:
+            admission.release()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Frees the slot even if the body is never iterated
+        background=BackgroundTask(admission.release),
+    )
+
+
+async def _stream_events(
+    request: JudgeRequest,
+    orchestrator: ProofGateOrchestrator,
+    deadline: Deadline,
+    tenant: str,
+):
+    """SSE chunks for one admitted streaming judgment."""
+    try:
+        excerpts = await _retrieve_for(
+            request, deadline.child(STAGE_BUDGETS.retrieval)
+        )
+    except DeadlineExceeded as e:
+        result = orchestrator.deadline_exceeded_result(request.question, e)
+        yield _sse("verdict", result['verdict'])
+        yield _sse("trace", {
+            'run_id': result['run_id'],
+            'trace': result['trace'],
+            'excerpts_used': [],
+            'error': result['error'],
+        })
+        return
+    
+    try:
+        async for event, data in orchestrator.run_stream(
+            request.question, excerpts, deadline=deadline, tenant=tenant
+        ):
+            yield _sse(event, data)
+    except Exception as e:
+        yield _sse("error", {"detail": f"Judgment pipeline error: {str(e)}"})
+
+
 @app.post("/api/evidence/attach")
 async def attach_evidence(file: UploadFile = File(...)):
     """
@@ -228,10 +750,11 @@ async def get_trace(run_id: str):
 @app.get("/api/excerpts")
 async def list_excerpts(include_acceptance: bool = False):
     """List available excerpts."""
-    retriever = _get_retriever(include_acceptance=include_acceptance)
+    retriever = _get_retriever()
+    selected = retriever.select(_build_filter(include_acceptance=include_acceptance))
     
     excerpts = {}
-    for doc_type, excerpt_list in retriever.excerpts_by_type.items():
+    for doc_type, excerpt_list in selected.items():
         excerpts[doc_type] = [
             {
                 "excerpt_id": e.excerpt_id,
@@ -245,6 +768,12 @@ async def list_excerpts(include_acceptance: bool = False):
     return {"excerpts": excerpts}
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Snapshot of process-wide counters and gauges."""
+    return {"metrics": metrics.snapshot()}
+
+
 @app.get("/api/demo/scenarios")
 async def get_demo_scenarios():
     """Get the demo scenarios for testing."""
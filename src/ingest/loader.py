@@ -8,7 +8,7 @@ Documents must have pre-defined [CITE=XXX-###] markers.
 import re
 import hashlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from src.schemas.documents import Document, ExcerptBlock
 
@@ -19,6 +19,14 @@ CITE_PATTERN = re.compile(
     re.DOTALL
 )
 
+# Metadata extraction for retrieval filters
+CUSTOMER_PATTERN = re.compile(r'\bCustomer\s+([A-Z][A-Z0-9]*)\b')
+DATE_PATTERN = re.compile(r'\b(\d{4}-\d{2}-\d{2})\b')
+STATUS_PATTERN = re.compile(
+    r'^\W*(?:\w+\s)?Status:\W*(\w+)',
+    re.MULTILINE | re.IGNORECASE
+)
+
 
 def load_document(
     path: Path,
@@ -55,6 +63,32 @@ def _extract_title(content: str) -> Optional[str]:
     return None
 
 
+def _extract_metadata(doc: Document, text: str) -> Dict[str, str]:
+    """
+    Derive filterable attributes for an excerpt.
+    
+    - customer: first "Customer X" in the document header, else the excerpt
+    - date: first ISO date (YYYY-MM-DD) in the excerpt
+    - status: first "Status: ..." / "Payment Status: ..." line (lowercased)
+    """
+    metadata = {}
+    
+    header = doc.content.split('[CITE=', 1)[0]
+    customer = CUSTOMER_PATTERN.search(header) or CUSTOMER_PATTERN.search(text)
+    if customer:
+        metadata['customer'] = customer.group(1)
+    
+    date = DATE_PATTERN.search(text)
+    if date:
+        metadata['date'] = date.group(1)
+    
+    status = STATUS_PATTERN.search(text)
+    if status:
+        metadata['status'] = status.group(1).lower()
+    
+    return metadata
+
+
 def parse_excerpts_from_document(doc: Document) -> List[ExcerptBlock]:
     """
     Parse a document into excerpt blocks using [CITE=XXX-###] markers.
@@ -78,7 +112,8 @@ def parse_excerpts_from_document(doc: Document) -> List[ExcerptBlock]:
             excerpt_id=excerpt_id,
             doc_id=doc.doc_id,
             doc_type=doc.doc_type,
-            text=text
+            text=text,
+            metadata=_extract_metadata(doc, text),
         ))
     
     return excerpts
@@ -0,0 +1,35 @@
+"""
+ProofGate Jobs Package
+
+Durable job queue (in traces.db) and the async worker pool that
+drains it, so long judgments survive restarts and don't hold HTTP
+connections open.
+"""
+
+from .queue import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_BASE_S,
+    DEFAULT_RETRY_MAX_S,
+    Job,
+    JobQueue,
+    JobStatus,
+)
+from .worker import (
+    DEFAULT_LEASE_S,
+    DEFAULT_WORKERS,
+    JobHandler,
+    JobWorkerPool,
+)
+
+__all__ = [
+    "DEFAULT_MAX_ATTEMPTS",
+    "DEFAULT_RETRY_BASE_S",
+    "DEFAULT_RETRY_MAX_S",
+    "Job",
+    "JobQueue",
+    "JobStatus",
+    "DEFAULT_LEASE_S",
+    "DEFAULT_WORKERS",
+    "JobHandler",
+    "JobWorkerPool",
+]
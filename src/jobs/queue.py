@@ -0,0 +1,284 @@
+"""
+Job Queue
+
+Durable SQLite-backed queue of judgment jobs, stored in a `jobs` table
+beside `traces` in traces.db. Workers claim jobs under a lease and
+extend it with heartbeats; a job whose lease runs out (its worker died
+or hung) becomes claimable again until it runs out of attempts. A job
+whose handler failed is requeued with exponential backoff, so a failing
+dependency is not retried in a tight loop.
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional
+
+import aiosqlite
+from pydantic import BaseModel, Field
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Delay before a failed job is claimable again: base * 2^(attempts - 1),
+# capped at the max
+DEFAULT_RETRY_BASE_S = 5.0
+DEFAULT_RETRY_MAX_S = 300.0
+
+
+class Job(BaseModel):
+    """A queued judgment and its outcome."""
+    job_id: str = Field(description="Unique job identifier")
+    status: JobStatus = Field(description="Where the job is in its lifecycle")
+    payload: Dict[str, Any] = Field(description="The judgment request")
+    attempts: int = Field(default=0, description="Times the job has been claimed")
+    max_attempts: int = Field(
+        default=DEFAULT_MAX_ATTEMPTS,
+        description="Claims allowed before the job fails for good"
+    )
+    result: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Judgment result, once succeeded"
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Last error (kept across retries)"
+    )
+    lease_owner: Optional[str] = Field(
+        default=None,
+        description="Worker holding the job while running"
+    )
+    lease_expires_at: Optional[float] = Field(
+        default=None,
+        description="Epoch seconds at which the lease lapses"
+    )
+    available_at: Optional[float] = Field(
+        default=None,
+        description="Epoch seconds before which a requeued job is not claimed"
+    )
+    created_at: str = Field(description="ISO timestamp of enqueueing")
+    updated_at: str = Field(description="ISO timestamp of the last change")
+
+
+class JobQueue:
+    """
+    Durable job queue on SQLite.
+
+    Every state change is a single conditional UPDATE, so concurrent
+    workers (in one process or several) never claim the same job, and
+    a worker that lost its lease cannot overwrite the new owner's work.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = None,
+        retry_base_s: float = DEFAULT_RETRY_BASE_S,
+        retry_max_s: float = DEFAULT_RETRY_MAX_S,
+    ):
+        """
+        Initialize job queue.
+
+        Args:
+            db_path: Path to SQLite database (defaults to ./data/traces.db)
+            retry_base_s: Backoff before the first retry of a failed job;
+                doubles with each further attempt
+            retry_max_s: Cap on the retry backoff
+        """
+        self.db_path = db_path or Path("./data/traces.db")
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    async def init_db(self):
+        """Create the jobs table if it doesn't exist."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    result_json TEXT,
+                    error TEXT,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    available_at REAL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            # Tables created before retry backoff lack the column
+            async with db.execute("PRAGMA table_info(jobs)") as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            if "available_at" not in columns:
+                await db.execute("ALTER TABLE jobs ADD COLUMN available_at REAL")
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_status
+                ON jobs(status, created_at)
+            """)
+            await db.commit()
+
+    @staticmethod
+    def _row_to_job(row: aiosqlite.Row) -> Job:
+        return Job(
+            job_id=row['job_id'],
+            status=row['status'],
+            payload=json.loads(row['payload_json']),
+            attempts=row['attempts'],
+            max_attempts=row['max_attempts'],
+            result=json.loads(row['result_json']) if row['result_json'] else None,
+            error=row['error'],
+            lease_owner=row['lease_owner'],
+            lease_expires_at=row['lease_expires_at'],
+            available_at=row['available_at'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+        )
+
+    async def enqueue(
+        self,
+        payload: Dict[str, Any],
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> Job:
+        """Add a job to the back of the queue."""
+        now = datetime.now(tz=None).isoformat()
+        job = Job(
+            job_id=str(uuid.uuid4())[:8],
+            status="queued",
+            payload=payload,
+            max_attempts=max_attempts,
+            created_at=now,
+            updated_at=now,
+        )
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT INTO jobs
+                (job_id, status, payload_json, attempts, max_attempts,
+                 created_at, updated_at)
+                VALUES (?, ?, ?, 0, ?, ?, ?)
+            """, (
+                job.job_id,
+                job.status,
+                json.dumps(payload),
+                max_attempts,
+                now,
+                now,
+            ))
+            await db.commit()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    return self._row_to_job(row)
+        return None
+
+    async def claim(self, worker_id: str, lease_s: float) -> Optional[Job]:
+        """
+        Claim the oldest claimable job under a lease.
+
+        Claimable means queued and due (past its retry backoff), or
+        running with a lapsed lease. Lapsed jobs with no attempts left
+        are failed instead.
+
+        Returns:
+            The claimed job (attempts already incremented), or None
+        """
+        now = time.time()
+        stamp = datetime.now(tz=None).isoformat()
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            await db.execute("""
+                UPDATE jobs
+                SET status = 'failed', lease_owner = NULL,
+                    lease_expires_at = NULL, updated_at = ?,
+                    error = COALESCE(error, 'Lease expired on final attempt')
+                WHERE status = 'running' AND lease_expires_at < ?
+                  AND attempts >= max_attempts
+            """, (stamp, now))
+            async with db.execute("""
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1,
+                    lease_owner = ?, lease_expires_at = ?, updated_at = ?
+                WHERE job_id = (
+                    SELECT job_id FROM jobs
+                    WHERE (status = 'queued' AND COALESCE(available_at, 0) <= ?)
+                       OR (status = 'running' AND lease_expires_at < ?)
+                    ORDER BY created_at
+                    LIMIT 1
+                )
+                RETURNING *
+            """, (worker_id, now + lease_s, stamp, now, now)) as cursor:
+                row = await cursor.fetchone()
+            await db.commit()
+        return self._row_to_job(row) if row else None
+
+    async def _update_owned(
+        self,
+        job_id: str,
+        worker_id: str,
+        assignments: str,
+        params: tuple,
+    ) -> bool:
+        """Apply an update only while worker_id still holds the lease."""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                params + (datetime.now(tz=None).isoformat(), job_id, worker_id),
+            )
+            await db.commit()
+            return cursor.rowcount == 1
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_s: float) -> bool:
+        """
+        Extend a lease.
+
+        Returns:
+            False if the worker no longer holds the job
+        """
+        return await self._update_owned(
+            job_id, worker_id, "lease_expires_at = ?", (time.time() + lease_s,)
+        )
+
+    async def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        result: Dict[str, Any],
+    ) -> bool:
+        """Record a job's result; False if the lease was lost."""
+        return await self._update_owned(
+            job_id, worker_id,
+            "status = 'succeeded', result_json = ?, error = NULL, "
+            "lease_owner = NULL, lease_expires_at = NULL",
+            (json.dumps(result),),
+        )
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt: requeue while attempts remain, else
+        fail the job. A requeued job is not claimable until its backoff
+        (retry_base_s * 2^(attempts - 1), capped at retry_max_s) passes.
+        False if the lease was lost.
+        """
+        return await self._update_owned(
+            job_id, worker_id,
+            "status = CASE WHEN attempts < max_attempts "
+            "THEN 'queued' ELSE 'failed' END, "
+            "available_at = ? + MIN(?, ? * (1 << MAX(attempts - 1, 0))), "
+            "error = ?, lease_owner = NULL, lease_expires_at = NULL",
+            (time.time(), self.retry_max_s, self.retry_base_s, error),
+        )
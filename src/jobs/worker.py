@@ -0,0 +1,161 @@
+"""
+Job Workers
+
+A pool of async workers that drain the job queue. Each worker claims
+one job at a time under a lease and heartbeats while its handler runs;
+if a heartbeat finds the lease gone (it lapsed and another worker took
+the job), the handler is cancelled so the job is never finished twice.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List
+
+from src.metrics import metrics
+
+from .queue import Job, JobQueue
+
+
+JobHandler = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+DEFAULT_WORKERS = 4
+DEFAULT_LEASE_S = 60.0
+
+# Heartbeats per lease period; a few missed beats don't lose the job
+HEARTBEATS_PER_LEASE = 3
+
+# How long an idle worker sleeps before polling again (unless notified)
+DEFAULT_POLL_S = 1.0
+
+JOBS_PROCESSED = metrics.counter(
+    "jobs_processed_total",
+    "Job attempts finished by workers, by outcome",
+)
+JOBS_RUNNING = metrics.gauge(
+    "jobs_running",
+    "Jobs currently being processed by this process's workers",
+)
+
+
+class JobWorkerPool:
+    """
+    Fixed-size pool of workers running a handler over claimed jobs.
+
+    Throughput scales with the worker count up to whatever limits the
+    handler itself is subject to (e.g. admission control).
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: JobHandler,
+        workers: int = DEFAULT_WORKERS,
+        lease_s: float = DEFAULT_LEASE_S,
+        poll_s: float = DEFAULT_POLL_S,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.lease_s = lease_s
+        self.poll_s = poll_s
+        self.pool_id = str(uuid.uuid4())[:8]
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the workers (idempotent)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(f"{self.pool_id}-{i}"))
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. Jobs they were running keep their lease and
+        are picked up again once it lapses.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers, e.g. right after enqueueing."""
+        self._wakeup.set()
+
+    async def _idle(self) -> None:
+        """Sleep until notified or the poll interval passes."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_s)
+        except TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _work(self, worker_id: str) -> None:
+        """Claim and process jobs until cancelled."""
+        while True:
+            try:
+                job = await self.queue.claim(worker_id, self.lease_s)
+            except Exception:
+                # e.g. database busy; back off and try again
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            await self.process(job, worker_id)
+
+    async def process(self, job: Job, worker_id: str) -> str:
+        """
+        Run the handler on a claimed job and record the outcome.
+
+        Returns:
+            The outcome: succeeded, retried, failed or lease_lost
+        """
+        JOBS_RUNNING.inc()
+        run = asyncio.create_task(self.handler(job))
+        beat = asyncio.create_task(self._heartbeat(job, worker_id, run))
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            lease_lost = beat.done() and not beat.cancelled() and not beat.result()
+            if not lease_lost:
+                raise
+            outcome = "lease_lost"
+        except Exception as e:
+            if not await self.queue.fail(job.job_id, worker_id, str(e)):
+                outcome = "lease_lost"
+            elif job.attempts < job.max_attempts:
+                outcome = "retried"
+            else:
+                outcome = "failed"
+        else:
+            completed = await self.queue.complete(job.job_id, worker_id, result)
+            outcome = "succeeded" if completed else "lease_lost"
+        finally:
+            beat.cancel()
+            if not run.done():
+                run.cancel()
+            await asyncio.gather(run, beat, return_exceptions=True)
+            JOBS_RUNNING.dec()
+        JOBS_PROCESSED.inc(outcome=outcome)
+        return outcome
+
+    async def _heartbeat(self, job: Job, worker_id: str, run: asyncio.Task) -> bool:
+        """
+        Extend the lease while the handler runs.
+
+        Returns:
+            False (after cancelling the handler) once the lease is lost
+        """
+        while True:
+            await asyncio.sleep(self.lease_s / HEARTBEATS_PER_LEASE)
+            try:
+                held = await self.queue.heartbeat(job.job_id, worker_id, self.lease_s)
+            except Exception:
+                # Transient failure: the lease may still be ours; retry next beat
+                continue
+            if not held:
+                run.cancel()
+                return False
@@ -0,0 +1,26 @@
+"""
+ProofGate Judge Package
+
+Deterministic rule engine that resolves agent outputs into a verdict,
+the compact payload the LLM Judge receives instead, and the cascade
+rule for escalating fast-model outputs.
+"""
+
+from .rules import (
+    RULES_VERSION,
+    resolve_verdict,
+    resolve_partial,
+    aggregate_citations,
+)
+from .payload import build_judge_payload, canonical_json
+from .escalation import escalation_reasons
+
+__all__ = [
+    "RULES_VERSION",
+    "resolve_verdict",
+    "resolve_partial",
+    "aggregate_citations",
+    "build_judge_payload",
+    "canonical_json",
+    "escalation_reasons",
+]
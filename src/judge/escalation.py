@@ -0,0 +1,115 @@
+"""
+Cascade Escalation
+
+Decides which fast-model agent outputs are trusted as-is and which are
+re-run on the strong model. An output is escalated when it failed
+citation validation, or when it is in doubt (its stance is borderline,
+or the agents disagree) and it is pivotal: flipping its stance would
+change the verdict RULE_1 to RULE_5 resolve. An output the verdict does
+not depend on, such as Policy's once Evidence is MISSING, is kept
+however doubtful, since the strong model's answer could not matter.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from .rules import resolve_partial
+
+
+# Stance leaning per agent; anything not listed is borderline. Policy
+# and Risk YES_CONDITIONAL resolve exactly like YES under the rules.
+PERMISSIVE_STANCES = {
+    "policy": ("YES", "YES_CONDITIONAL"),
+    "risk": ("YES", "YES_CONDITIONAL"),
+    "evidence": ("SUFFICIENT",),
+}
+RESTRICTIVE_STANCES = {
+    "policy": ("NO",),
+    "risk": ("NO",),
+    "evidence": ("MISSING",),
+}
+
+
+def leaning(agent_name: str, output: Any) -> str:
+    """Whether an output pushes toward approval: permissive, restrictive or borderline."""
+    if agent_name == "risk" and output.hard_stops:
+        return "restrictive"
+    if output.stance in PERMISSIVE_STANCES[agent_name]:
+        return "permissive"
+    if output.stance in RESTRICTIVE_STANCES[agent_name]:
+        return "restrictive"
+    return "borderline"
+
+
+def _flips(agent_name: str, output: Any) -> List[Any]:
+    """The output with its stance flipped: to the other side, or to both sides if borderline."""
+    side = leaning(agent_name, output)
+    flips = []
+    if side != "permissive":
+        flips.append(output.model_copy(update={
+            "stance": PERMISSIVE_STANCES[agent_name][0],
+            **({"hard_stops": []} if agent_name == "risk" else {}),
+        }))
+    if side != "restrictive":
+        flips.append(output.model_copy(
+            update={"stance": RESTRICTIVE_STANCES[agent_name][0]}
+        ))
+    return flips
+
+
+def _verdict(outputs: Dict[str, Optional[Any]]) -> Optional[str]:
+    """The verdict the rules resolve from these outputs, or None if undetermined."""
+    resolved = resolve_partial(
+        policy=outputs.get("policy"),
+        risk=outputs.get("risk"),
+        evidence=outputs.get("evidence"),
+    )
+    return resolved.verdict if resolved is not None else None
+
+
+def is_pivotal(agent_name: str, outputs: Dict[str, Optional[Any]]) -> bool:
+    """True if flipping this agent's stance changes the resolved verdict."""
+    verdict = _verdict(outputs)
+    return any(
+        _verdict({**outputs, agent_name: flipped}) != verdict
+        for flipped in _flips(agent_name, outputs[agent_name])
+    )
+
+
+def escalation_reasons(
+    outputs: Dict[str, Optional[Any]],
+    candidates: Iterable[str],
+) -> Dict[str, str]:
+    """
+    Which candidate outputs need the strong model, and why.
+
+    Pivotality is judged with the rule engine; the LLM Judge applies
+    the same rules, so it serves for both judge modes.
+
+    Args:
+        outputs: Agent name to output; None if it failed citation
+            validation. Agents without an entry (skipped) are ignored.
+        candidates: Agents whose output came from the fast model
+
+    Returns:
+        Agent name to reason: invalid_citations, borderline or disagreement
+    """
+    leanings = {
+        name: leaning(name, output)
+        for name, output in outputs.items()
+        if output is not None
+    }
+    conflict = (
+        "permissive" in leanings.values()
+        and "restrictive" in leanings.values()
+    )
+    reasons = {}
+    for name in candidates:
+        if name not in outputs:
+            continue
+        if outputs[name] is None:
+            reasons[name] = "invalid_citations"
+        elif leanings[name] == "borderline" and is_pivotal(name, outputs):
+            reasons[name] = "borderline"
+        elif conflict and is_pivotal(name, outputs):
+            reasons[name] = "disagreement"
+    return reasons
@@ -0,0 +1,82 @@
+"""
+Judge Payload
+
+Compact canonical JSON rendering of the agent outputs for the LLM
+Judge (prompts/judge_agent_v2.txt). Carries only the fields RULE_1 to
+RULE_5 read; rationales are truncated, and dropped when the payload
+would exceed its size cap.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from src.schemas.agents import (
+    PolicyAgentOutput,
+    RiskAgentOutput,
+    EvidenceAgentOutput,
+)
+
+
+# Per-rationale character limit; RULE_4 quotes the Risk rationale, so
+# a short prefix is kept rather than dropping rationales outright
+RATIONALE_CHARS = 240
+
+# Payload size above which rationales are omitted entirely
+MAX_PAYLOAD_CHARS = 4_000
+
+# Fields each rule-relevant output contributes, besides the rationale
+PAYLOAD_FIELDS = {
+    "policy": ("stance", "conditions", "citations"),
+    "risk": ("stance", "risk_flags", "hard_stops", "citations"),
+    "evidence": ("stance", "missing_evidence", "citations"),
+}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, marking the cut."""
+    if len(text) <= limit:
+        return text
+    return text[:max(limit - 3, 0)].rstrip() + "..."
+
+
+def canonical_json(payload: Dict[str, Any]) -> str:
+    """Serialize with sorted keys and no whitespace, so equal payloads hash equally."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def build_judge_payload(
+    question: str,
+    policy: PolicyAgentOutput,
+    risk: RiskAgentOutput,
+    evidence: EvidenceAgentOutput,
+    rationale_chars: int = RATIONALE_CHARS,
+    max_chars: Optional[int] = MAX_PAYLOAD_CHARS,
+) -> str:
+    """
+    Render the Judge input as canonical JSON.
+
+    Args:
+        question: The question being judged
+        policy: Policy Agent output
+        risk: Risk Agent output
+        evidence: Evidence Agent output
+        rationale_chars: Per-rationale character limit (0 omits them)
+        max_chars: Omit rationales if the payload is longer; None for no cap
+
+    Returns:
+        Compact JSON string, byte-identical for identical inputs
+    """
+    outputs = {"policy": policy, "risk": risk, "evidence": evidence}
+    payload: Dict[str, Any] = {"question": question}
+    for name, output in outputs.items():
+        payload[name] = {f: getattr(output, f) for f in PAYLOAD_FIELDS[name]}
+    compact = canonical_json(payload)
+    if rationale_chars <= 0:
+        return compact
+
+    for name, output in outputs.items():
+        payload[name]["rationale"] = _truncate(output.rationale, rationale_chars)
+    full = canonical_json(payload)
+    if max_chars is not None and len(full) > max_chars:
+        return compact
+    return full
@@ -0,0 +1,158 @@
+"""
+Deterministic Judge Rules
+
+Pure-Python implementation of RULE_1 to RULE_5 from
+prompts/judge_agent_v1.txt. Produces the same FinalVerdict shape as
+the Judge Agent, without an LLM round-trip.
+"""
+
+from typing import List, Optional
+
+from src.schemas.agents import (
+    PolicyAgentOutput,
+    RiskAgentOutput,
+    EvidenceAgentOutput,
+    FinalVerdict,
+)
+
+
+# Recorded as the judge "prompt version" so cache keys distinguish
+# rule-engine verdicts from LLM Judge verdicts
+RULES_VERSION = "rules-v1"
+
+# Fixed confidences, chosen inside the ranges the Judge prompt specifies
+CONFIDENCE = {
+    "RULE_1": 0.9,
+    "RULE_2_MISSING": 0.3,
+    "RULE_2_PARTIAL": 0.4,
+    "RULE_3": 0.8,
+    "RULE_4": 0.6,
+    "RULE_5": 0.85,
+}
+
+
+def _dedupe(items: List[str]) -> List[str]:
+    """Drop duplicates, keeping first-seen order."""
+    return list(dict.fromkeys(items))
+
+
+def aggregate_citations(
+    policy: Optional[PolicyAgentOutput],
+    risk: Optional[RiskAgentOutput],
+    evidence: Optional[EvidenceAgentOutput],
+) -> List[str]:
+    """Union of agent citations in policy, risk, evidence order."""
+    outputs = (policy, risk, evidence)
+    return _dedupe([c for o in outputs if o is not None for c in o.citations])
+
+
+def resolve_partial(
+    policy: Optional[PolicyAgentOutput] = None,
+    risk: Optional[RiskAgentOutput] = None,
+    evidence: Optional[EvidenceAgentOutput] = None,
+) -> Optional[FinalVerdict]:
+    """
+    Resolve a verdict from the agent outputs available so far.
+
+    Rules are applied in order, so a verdict is determined as soon as
+    every output an earlier rule reads is known:
+    - risk alone decides RULE_1 (hard stops)
+    - risk without hard stops plus evidence decides RULE_2
+    - anything later needs all three outputs
+
+    Citations are aggregated from the outputs given.
+
+    Returns:
+        FinalVerdict, or None if a missing output could still change it
+    """
+    if risk is None:
+        return None
+
+    citations = aggregate_citations(policy, risk, evidence)
+
+    if risk.hard_stops:
+        return FinalVerdict(
+            verdict="REJECT",
+            confidence=CONFIDENCE["RULE_1"],
+            violations=list(risk.hard_stops),
+            conditions_to_allow=[],
+            citations=citations,
+            rule_applied="RULE_1: Hard-stop violation detected",
+        )
+
+    if evidence is None:
+        return None
+
+    if evidence.stance in ("MISSING", "PARTIAL"):
+        return FinalVerdict(
+            verdict="INSUFFICIENT_EVIDENCE",
+            confidence=CONFIDENCE[f"RULE_2_{evidence.stance}"],
+            violations=[],
+            conditions_to_allow=list(evidence.missing_evidence),
+            citations=citations,
+            rule_applied=f"RULE_2: Evidence Agent stance is {evidence.stance}",
+        )
+
+    if policy is None:
+        return None
+
+    if policy.stance == "NO":
+        return FinalVerdict(
+            verdict="REJECT",
+            confidence=CONFIDENCE["RULE_3"],
+            violations=list(policy.conditions),
+            conditions_to_allow=[],
+            citations=citations,
+            rule_applied="RULE_3: Policy explicitly prohibits action",
+        )
+
+    if risk.stance == "NO":
+        # Flags are concrete, checkable risks: evidence can clear them.
+        # A bare NO with nothing to check cannot be mitigated.
+        if risk.risk_flags:
+            return FinalVerdict(
+                verdict="INSUFFICIENT_EVIDENCE",
+                confidence=CONFIDENCE["RULE_4"],
+                violations=[],
+                conditions_to_allow=list(risk.risk_flags),
+                citations=citations,
+                rule_applied="RULE_4: Risk Agent blocks approval",
+            )
+        return FinalVerdict(
+            verdict="REJECT",
+            confidence=CONFIDENCE["RULE_4"],
+            violations=[risk.rationale],
+            conditions_to_allow=[],
+            citations=citations,
+            rule_applied="RULE_4: Risk Agent blocks approval",
+        )
+
+    return FinalVerdict(
+        verdict="APPROVE",
+        confidence=CONFIDENCE["RULE_5"],
+        violations=[],
+        conditions_to_allow=_dedupe(policy.conditions + risk.risk_flags),
+        citations=citations,
+        rule_applied="RULE_5: All agents pass, approval granted",
+    )
+
+
+def resolve_verdict(
+    policy: PolicyAgentOutput,
+    risk: RiskAgentOutput,
+    evidence: EvidenceAgentOutput,
+) -> FinalVerdict:
+    """
+    Apply the deterministic resolution rules in order.
+
+    RULE_1: Risk hard_stops present → REJECT
+    RULE_2: Evidence MISSING or PARTIAL → INSUFFICIENT_EVIDENCE
+    RULE_3: Policy NO → REJECT
+    RULE_4: Risk NO (no hard stops) → INSUFFICIENT_EVIDENCE if the risk
+            flags name something evidence could mitigate, else REJECT
+    RULE_5: Otherwise → APPROVE
+
+    Returns:
+        FinalVerdict with citations aggregated from all three agents
+    """
+    return resolve_partial(policy, risk, evidence)
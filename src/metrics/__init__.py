@@ -0,0 +1,15 @@
+"""
+ProofGate Metrics Package
+
+Process-wide counters, gauges and histograms exported via /api/metrics.
+"""
+
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, metrics
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "metrics",
+]
@@ -0,0 +1,201 @@
+"""
+Metrics Registry
+
+In-process counters, gauges and histograms for operational visibility.
+Values are kept per label set and exported as a JSON snapshot by
+/api/metrics.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Canonical, hashable form of a label set."""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Metric:
+    """Base class: a named family of values keyed by label set."""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+    
+    def value(self, **labels) -> float:
+        """Current value for a label set (0 if never recorded)."""
+        return self._values.get(_label_key(labels), 0.0)
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        """All recorded label sets with their values."""
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            {'labels': dict(key), 'value': value}
+            for key, value in sorted(items)
+        ]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable view of this metric."""
+        return {
+            'type': self.kind,
+            'description': self.description,
+            'samples': self.samples(),
+        }
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the counter for a label set."""
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels) -> None:
+        """Set the gauge for a label set."""
+        with self._lock:
+            self._values[_label_key(labels)] = value
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increase the gauge for a label set."""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Decrease the gauge for a label set."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+    
+    A sample's value is a dict with `count`, `sum` and `buckets`, which
+    maps each upper bound (as a string, plus "+Inf") to the number of
+    observations at or below it.
+    """
+    
+    kind = "histogram"
+    
+    # Upper bounds in seconds, suited to latencies and queue waits
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+    ):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+    
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation for a label set."""
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {'count': 0, 'sum': 0.0, 'counts': [0] * len(self.buckets)}
+                self._values[key] = state
+            state['count'] += 1
+            state['sum'] += value
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state['counts'][index] += 1
+    
+    def _render(self, state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if state is None:
+            state = {'count': 0, 'sum': 0.0, 'counts': [0] * len(self.buckets)}
+        buckets, running = {}, 0
+        for bound, count in zip(self.buckets, state['counts']):
+            running += count
+            buckets[str(bound)] = running
+        buckets["+Inf"] = state['count']
+        return {'count': state['count'], 'sum': state['sum'], 'buckets': buckets}
+    
+    def value(self, **labels) -> Dict[str, Any]:
+        """Count, sum and cumulative buckets for a label set."""
+        with self._lock:
+            return self._render(self._values.get(_label_key(labels)))
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        """All recorded label sets with their distributions."""
+        with self._lock:
+            items = [(key, self._render(state)) for key, state in self._values.items()]
+        return [
+            {'labels': dict(key), 'value': value}
+            for key, value in sorted(items, key=lambda item: item[0])
+        ]
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics.
+    
+    Lookups are get-or-create, so modules can declare the metrics they
+    update at import time without coordinating registration order.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name: str, description: str, **options) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **options)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise TypeError(
+                    f"Metric '{name}' already registered as {metric.kind}"
+                )
+            return metric
+    
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, description)
+    
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, description)
+    
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        """Get or create a histogram (buckets apply on creation only)."""
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serializable view of every metric, by name."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics}
+
+
+# Process-wide registry exported by the API
+metrics = MetricsRegistry()
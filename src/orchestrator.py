@@ -6,13 +6,21 @@ and deterministic verdict resolution.
 """
 
 import asyncio
+import copy
 import uuid
 import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal,
+    Optional, Tuple,
+)
 
-from agents import Runner
+from agents import OpenAIProvider, RunConfig, Runner
+from openai import AsyncOpenAI
 
 from src.schemas.agents import (
     PolicyAgentOutput,
@@ -22,43 +30,309 @@ from src.schemas.agents import (
 )
 from src.schemas.documents import ExcerptBlock, RunTrace
 from src.agents import (
+    FAST_MODEL,
     create_policy_agent,
     create_risk_agent,
     create_evidence_agent,
     create_judge_agent,
+    create_packed_agent,
     get_prompt_versions,
 )
 from src.guards import validate_citations, CitationValidationError
+from src.judge import (
+    RULES_VERSION,
+    build_judge_payload,
+    canonical_json,
+    escalation_reasons,
+    resolve_verdict,
+    resolve_partial,
+)
+from src.metrics import metrics
+from src.resilience import (
+    DEFAULT_DEADLINE_S,
+    Deadline,
+    DeadlineExceeded,
+    CircuitBreakers,
+    CircuitOpen,
+    HedgePolicy,
+    RateLimiter,
+    RetryPolicy,
+    StageBudgets,
+    deadline_passed,
+    is_transient,
+)
+from src.scheduling import (
+    AdaptiveConcurrencyLimiter,
+    AgentGraph,
+    AgentNode,
+    GraphScheduler,
+    NodeTiming,
+    critical_path,
+    current_tenant,
+    tenant_scope,
+)
+from src.tokens import estimate_tokens
 from src.trace import TraceStore
 
 
+# Async callback receiving (event_name, payload) as the pipeline progresses
+EventCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# rule_applied for runs that fail closed because a time budget ran out
+DEADLINE_RULE = "DEADLINE_EXCEEDED"
+
+# rule_applied for runs that fail fast because a model's breaker is open
+CIRCUIT_OPEN_RULE = "CIRCUIT_OPEN"
+
+AGENT_CALLS_CANCELLED = metrics.counter(
+    "agent_calls_cancelled_total",
+    "In-flight agent calls cancelled, by reason",
+)
+JUDGMENTS_COALESCED = metrics.counter(
+    "judgments_coalesced_total",
+    "Runs that joined an identical in-flight run instead of executing",
+)
+PACKED_FALLBACKS = metrics.counter(
+    "packed_answer_fallbacks_total",
+    "Packed-call answers missing or invalid, re-run as single calls, by agent",
+)
+CASCADE_ESCALATIONS = metrics.counter(
+    "cascade_escalations_total",
+    "Fast-model agent outputs re-run on the strong model, by agent and reason",
+)
+PROVIDER_RETRIES = metrics.counter(
+    "provider_retries_total",
+    "Provider calls retried after a transient error, by model",
+)
+
+# Accepted values of the judge_mode argument
+JUDGE_MODES = ("rules", "llm")
+
+# Questions per packed agent call in run_batch
+DEFAULT_PACK_SIZE = 8
+
+# Output tokens reserved per call before its real usage is known
+EXPECTED_OUTPUT_TOKENS = 500
+
+
+# Per-agent token accounting recorded in RunTrace.agent_usage
+USAGE_FIELDS = ("input_tokens", "cached_tokens", "output_tokens")
+
+
+def _usage_of(result: Any) -> Dict[str, int]:
+    """
+    Token usage the provider reported for one Runner.run call.
+    
+    Providers that omit a field (or a usage block) count as zero.
+    """
+    usage = getattr(getattr(result, "context_wrapper", None), "usage", None)
+    details = getattr(usage, "input_tokens_details", None)
+    counts = {
+        "input_tokens": getattr(usage, "input_tokens", 0),
+        "cached_tokens": getattr(details, "cached_tokens", 0),
+        "output_tokens": getattr(usage, "output_tokens", 0),
+    }
+    return {k: v if isinstance(v, int) else 0 for k, v in counts.items()}
+
+
+def _add_usage(usage: Optional[Dict[str, int]], result: Any) -> None:
+    """Add one call's usage to a running per-agent total, if kept."""
+    if usage is None:
+        return
+    for key, count in _usage_of(result).items():
+        usage[key] = usage.get(key, 0) + count
+
+
+class _AgentContext(str):
+    """
+    A rendered agent context carrying its estimated token count.
+    
+    The excerpts' share is summed from their memoized token counts when
+    the context is built; only the text around them is estimated here.
+    Appending (a correction retry) keeps the count up to date.
+    """
+    
+    estimated_tokens: int
+    
+    def __new__(cls, text: str, excerpt_tokens: int = 0, excerpt_chars: int = 0):
+        context = super().__new__(cls, text)
+        context.estimated_tokens = excerpt_tokens + estimate_tokens(
+            text[:max(len(text) - excerpt_chars, 0)]
+        )
+        return context
+    
+    def __add__(self, other: str) -> "_AgentContext":
+        context = str.__new__(_AgentContext, str.__add__(self, other))
+        context.estimated_tokens = self.estimated_tokens + estimate_tokens(other)
+        return context
+
+
+def _context_tokens(context: str) -> int:
+    """Estimated tokens of a context, from its carried count if rendered here."""
+    estimated = getattr(context, "estimated_tokens", None)
+    return estimated if estimated is not None else estimate_tokens(context)
+
+
+class _NoRetryProvider(OpenAIProvider):
+    """
+    OpenAIProvider whose client never retries on its own.
+
+    Transient errors are retried by the orchestrator's RetryPolicy, which
+    also feeds the circuit breakers; retries inside the client would
+    multiply attempts and hide failures from both. The SDK default
+    client is still built lazily (AsyncOpenAI() raises without an API
+    key), just with its retries turned off.
+    """
+
+    def _get_client(self) -> AsyncOpenAI:
+        client = super()._get_client()
+        if client.max_retries != 0:
+            client = self._client = client.with_options(max_retries=0)
+        return client
+
+
+@dataclass
+class _RunState:
+    """Per-run bookkeeping threaded through agent calls."""
+    on_event: Optional[EventCallback] = None
+    deadline: Optional[Deadline] = None
+    prompt_versions: Dict[str, str] = field(default_factory=dict)
+    reuse: Dict[str, Any] = field(default_factory=dict)
+    rejudged_from: Optional[str] = None
+    batch_id: Optional[str] = None
+    agent_latency_ms: Dict[str, int] = field(default_factory=dict)
+    agent_usage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    skipped_agents: List[str] = field(default_factory=list)
+    agent_cache_hits: List[str] = field(default_factory=list)
+    hedge_wins: List[str] = field(default_factory=list)
+    agent_models: Dict[str, str] = field(default_factory=dict)
+    escalations: Dict[str, str] = field(default_factory=dict)
+    node_timings: Dict[str, NodeTiming] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    
+    async def emit(self, event: str, data: Dict[str, Any]) -> None:
+        """Forward an event to the callback, if any."""
+        if self.on_event is not None:
+            await self.on_event(event, data)
+
+
+@dataclass
+class _Flight:
+    """An in-flight pipeline execution shared by identical runs."""
+    run_id: str
+    task: asyncio.Task
+    waiters: int = 0
+
+
 class ProofGateOrchestrator:
     """
     Multi-agent orchestrator for financial compliance judgments.
     
     This is where multi-agent becomes necessary, not theatre:
     - Policy, Risk, Evidence run in PARALLEL (conflicting objectives)
-    - Judge resolves conflicts with DETERMINISTIC rules
+    - Judge resolves conflicts with DETERMINISTIC rules (in-process by
+      default; the LLM Judge Agent is available as judge_mode="llm")
     - Guards enforce ZERO hallucinations
     """
     
+    # (doc_type, section header) in context order: the static corpus
+    # (policy, contract) first and the volatile evidence last, so that
+    # consecutive requests share a byte-identical prompt prefix that
+    # provider-side prompt caching can reuse
+    CONTEXT_SECTIONS = (
+        ('policy', "## POLICY_EXCERPTS"),
+        ('contract', "## CONTRACT_EXCERPTS"),
+        ('evidence', "## EVIDENCE_EXCERPTS"),
+    )
+    
+    # Doc types each agent reads (its retrieval view), matching the
+    # inputs its prompt declares. Policy judges the rules and the
+    # contract only, so an evidence change never reruns it; Risk also
+    # weighs prior incidents, which live in the evidence pack.
+    AGENT_VIEWS = {
+        'policy': ('policy', 'contract'),
+        'risk': ('policy', 'contract', 'evidence'),
+        'evidence': ('policy', 'contract', 'evidence'),
+    }
+    
     def __init__(
         self,
         data_dir: Path = None,
         deterministic_mode: bool = True,
         max_retries: int = 1,
+        judge_mode: Literal["rules", "llm"] = "rules",
+        short_circuit: bool = False,
+        deadline_s: float = DEFAULT_DEADLINE_S,
+        stage_budgets: Optional[StageBudgets] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        cascade: bool = False,
+        fast_model: str = FAST_MODEL,
+        agent_nodes: Optional[List[AgentNode]] = None,
+        openai_client: Optional[AsyncOpenAI] = None,
     ):
         """
         Initialize orchestrator.
         
         Args:
             data_dir: Path to data directory
-            deterministic_mode: If True, cache and replay identical inputs
+            deterministic_mode: If True, cache and replay identical inputs,
+                and reuse each agent's output while its own input is unchanged
             max_retries: Max retries on citation validation failure
+            judge_mode: "rules" resolves verdicts in-process with the
+                deterministic rule engine; "llm" calls the Judge Agent
+            short_circuit: If True (rules mode only), issue the verdict as
+                soon as completed agents determine it and cancel the rest
+            deadline_s: Default request deadline when run() is given none
+            stage_budgets: Per-stage time budgets (DESIGN.md hard limits)
+            rate_limiter: Shared per-model limiter every LLM call waits on
+                before dispatch; None for no client-side limiting
+            concurrency_limiter: Adaptive cap on concurrent provider calls;
+                None for no cap
+            hedge_policy: Hedge agent calls slower than their rolling p95;
+                None disables hedging
+            retry_policy: Backoff for transient provider errors
+            circuit_breakers: Per-model breakers (share one instance to
+                share provider health across orchestrators)
+            cascade: If True, run agents on fast_model first and re-run
+                on the default model only outputs in doubt
+            fast_model: Model for the first cascade pass
+            agent_nodes: Extra agents for the agent graph (e.g. a tax or
+                related-party check). They run as soon as their
+                dependencies finish; their outputs are traced but the
+                verdict is resolved from policy, risk and evidence alone.
+            openai_client: Client every agent call goes through (see
+                ProviderClient); None for the SDK's default client. Either
+                way its own retries are turned off.
+        
+        Raises:
+            ValueError: If judge_mode is not one of JUDGE_MODES
         """
+        if judge_mode not in JUDGE_MODES:
+            raise ValueError(
+                f"Unknown judge_mode: {judge_mode!r} (expected one of {JUDGE_MODES})"
+            )
         self.data_dir = data_dir or Path("./data")
         self.deterministic_mode = deterministic_mode
         self.max_retries = max_retries
+        self.judge_mode = judge_mode
+        self.short_circuit = short_circuit and judge_mode == "rules"
+        self.deadline_s = deadline_s
+        self.stage_budgets = stage_budgets or StageBudgets()
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.hedge_policy = hedge_policy
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = circuit_breakers or CircuitBreakers()
+        
+        # Agents keep plain model names (cache, rate-limit and breaker
+        # keys); the client is supplied when each call resolves them
+        self.run_config = RunConfig(
+            model_provider=_NoRetryProvider(openai_client=openai_client)
+        )
         
         # Create agents
         self.policy_agent = create_policy_agent()
@@ -66,37 +340,130 @@ class ProofGateOrchestrator:
         self.evidence_agent = create_evidence_agent()
         self.judge_agent = create_judge_agent()
         
+        # Cascade first-pass agents
+        self.cascade = cascade
+        self.fast_agents = {
+            'policy': create_policy_agent(fast_model),
+            'risk': create_risk_agent(fast_model),
+            'evidence': create_evidence_agent(fast_model),
+        } if cascade else {}
+        
+        # Packed (multi-question) variants for run_batch, built once
+        self.packed_agents = {
+            name: create_packed_agent(agent)
+            for name, agent in self._parallel_agents().items()
+        }
+        
+        # Agent graph: the core agents, then any extra nodes
+        self.agent_graph = AgentGraph([
+            *(
+                AgentNode(name, agent, self.AGENT_VIEWS[name])
+                for name, agent in self._parallel_agents().items()
+            ),
+            *(agent_nodes or []),
+        ])
+        
         # Trace store
         self.trace_store = TraceStore(self.data_dir / "traces.db")
+        
+        # Single-flight map: input_hash -> execution identical runs join
+        self._in_flight: Dict[str, _Flight] = {}
     
     async def init(self):
         """Initialize async components."""
         await self.trace_store.init_db()
     
+    def _get_prompt_versions(self) -> Dict[str, str]:
+        """
+        Prompt versions for this run, with the judge mode reflected. In
+        cascade mode each agent's version names its fast and strong
+        models (`v1@gpt-4o-mini>gpt-4o`).
+        """
+        models = {
+            name: f"{self.fast_agents[name].model}>{agent.model}"
+            for name, agent in self._parallel_agents().items()
+        } if self.cascade else None
+        prompt_versions = get_prompt_versions(models)
+        for name, node in self.agent_graph.nodes.items():
+            prompt_versions.setdefault(name, node.version)
+        if self.judge_mode == "rules":
+            prompt_versions['judge'] = RULES_VERSION
+        return prompt_versions
+    
     def _build_context(
         self,
         question: str,
-        excerpts: Dict[str, List[ExcerptBlock]]
-    ) -> str:
-        """Build context string for agents."""
-        context_parts = [
-            f"## QUESTION\n{question}",
-            "",
-            "## POLICY_EXCERPTS",
-        ]
-        
-        for excerpt in excerpts.get('policy', []):
-            context_parts.append(f"{excerpt.cite_token}\n{excerpt.text}\n")
+        excerpts: Dict[str, List[ExcerptBlock]],
+        doc_types: Optional[Tuple[str, ...]] = None,
+        upstream: Optional[Dict[str, Any]] = None,
+    ) -> _AgentContext:
+        """
+        Build context string for agents.
         
-        context_parts.append("\n## CONTRACT_EXCERPTS")
-        for excerpt in excerpts.get('contract', []):
-            context_parts.append(f"{excerpt.cite_token}\n{excerpt.text}\n")
+        Layout is prefix-cache friendly: excerpt sections in
+        CONTEXT_SECTIONS order, each sorted by excerpt ID so the same
+        excerpts always render identically whatever order retrieval
+        returned them in, and the question last. Joins each excerpt's
+        memoized prompt block; nothing is re-rendered per request, and
+        the token estimate sums the blocks' memoized counts.
         
-        context_parts.append("\n## EVIDENCE_EXCERPTS")
-        for excerpt in excerpts.get('evidence', []):
-            context_parts.append(f"{excerpt.cite_token}\n{excerpt.text}\n")
+        Args:
+            question: The question to evaluate
+            excerpts: Dict of excerpts by type
+            doc_types: Sections to include (an agent's view); all if None
+            upstream: Outputs of the agents this one depends on, rendered
+                as canonical JSON before the question
+        """
+        sections, tokens, chars = self._excerpt_sections(excerpts, doc_types)
+        if upstream:
+            payload = {
+                name: output.model_dump(mode="json") if output is not None else None
+                for name, output in upstream.items()
+            }
+            sections.append(f"## UPSTREAM_OUTPUTS\n{canonical_json(payload)}")
+        sections.append(f"## QUESTION\n{question}")
+        return _AgentContext("\n\n".join(sections), tokens, chars)
+    
+    def _build_packed_context(
+        self,
+        questions: List[str],
+        excerpts: Dict[str, List[ExcerptBlock]],
+        doc_types: Optional[Tuple[str, ...]] = None,
+    ) -> _AgentContext:
+        """
+        Build the context for a packed call answering several questions.
         
-        return "\n".join(context_parts)
+        Same excerpt sections as _build_context, then the questions
+        numbered by the index packed answers must refer to.
+        """
+        sections, tokens, chars = self._excerpt_sections(excerpts, doc_types)
+        numbered = "\n".join(f"[{i}] {q}" for i, q in enumerate(questions))
+        sections.append(f"## QUESTIONS\n{numbered}")
+        return _AgentContext("\n\n".join(sections), tokens, chars)
+    
+    def _excerpt_sections(
+        self,
+        excerpts: Dict[str, List[ExcerptBlock]],
+        doc_types: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[List[str], int, int]:
+        """
+        Rendered excerpt sections, in context order, for a view, with
+        the blocks' summed memoized token counts and total length.
+        """
+        sections = []
+        tokens = chars = 0
+        for doc_type, header in self.CONTEXT_SECTIONS:
+            if doc_types is not None and doc_type not in doc_types:
+                continue
+            ordered = sorted(excerpts.get(doc_type, []), key=lambda e: e.excerpt_id)
+            blocks = [e.prompt_block for e in ordered]
+            tokens += sum(e.token_count for e in ordered)
+            chars += sum(len(block) for block in blocks)
+            if blocks:
+                sections.append(f"{header}\n" + "\n\n".join(blocks) + "\n")
+            else:
+                sections.append(header)
+        return sections, tokens, chars
     
     def _build_judge_context(
         self,
@@ -105,30 +472,167 @@ class ProofGateOrchestrator:
         risk_output: RiskAgentOutput,
         evidence_output: EvidenceAgentOutput,
     ) -> str:
-        """Build context for Judge agent with all agent outputs."""
-        return f"""## QUESTION
-{question}
-
-## POLICY_AGENT_OUTPUT
-Stance: {policy_output.stance}
-Conditions: {policy_output.conditions}
-Rationale: {policy_output.rationale}
-Citations: {policy_output.citations}
-
-## RISK_AGENT_OUTPUT
-Stance: {risk_output.stance}
-Risk Flags: {risk_output.risk_flags}
-Hard Stops: {risk_output.hard_stops}
-Rationale: {risk_output.rationale}
-Citations: {risk_output.citations}
-
-## EVIDENCE_AGENT_OUTPUT
-Stance: {evidence_output.stance}
-Available Evidence: {evidence_output.available_evidence}
-Missing Evidence: {evidence_output.missing_evidence}
-Rationale: {evidence_output.rationale}
-Citations: {evidence_output.citations}
-"""
+        """
+        Build context for Judge agent with all agent outputs.
+        
+        Canonical compact JSON of the fields the rules read, so equal
+        agent outputs always yield the same judge input (and cache key).
+        """
+        return build_judge_payload(
+            question, policy_output, risk_output, evidence_output
+        )
+    
+    async def _call_model(self, agent, context: str):
+        """
+        One logical provider call, resilient to transient errors.
+        
+        The model's circuit breaker is checked before each try, so calls
+        fail fast with CircuitOpen while the provider is down. Transient
+        errors (timeouts, 429, 5xx) are retried after a jittered
+        exponential backoff and reported to the breaker; other errors
+        propagate at once. A call the stage deadline cuts off counts as
+        a failure too, since the client timeout is longer than any stage
+        budget and a hanging provider would otherwise never open the
+        breaker; calls cancelled for other reasons (short circuit, a
+        hedge winning) are abandoned.
+        """
+        breaker = self.circuit_breakers.for_model(str(agent.model))
+        attempt = 0
+        while True:
+            probe = breaker.acquire()
+            try:
+                result = await self._call_paced(agent, context)
+            except Exception as e:
+                if not is_transient(e):
+                    breaker.on_abandon(probe)
+                    raise
+                breaker.on_failure(probe)
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                PROVIDER_RETRIES.inc(model=str(agent.model))
+                await asyncio.sleep(self.retry_policy.backoff_s(attempt, e))
+                attempt += 1
+                continue
+            except asyncio.CancelledError:
+                if deadline_passed():
+                    breaker.on_failure(probe)
+                else:
+                    breaker.on_abandon(probe)
+                raise
+            except BaseException:
+                breaker.on_abandon(probe)
+                raise
+            breaker.on_success(probe)
+            return result
+    
+    async def _call_paced(self, agent, context: str):
+        """
+        One Runner.run call, paced by the rate limiter.
+        
+        Reserves a request and an estimated token count (instructions,
+        context and EXPECTED_OUTPUT_TOKENS) for the agent's model, then
+        settles the reservation with the usage the provider reports.
+        Contexts built here carry their estimate, summed from the
+        excerpts' memoized token counts.
+        """
+        if self.rate_limiter is None:
+            return await self._dispatch(agent, context)
+        estimated = (
+            estimate_tokens(agent.instructions)
+            + _context_tokens(context)
+            + EXPECTED_OUTPUT_TOKENS
+        )
+        reservation = await self.rate_limiter.acquire(str(agent.model), estimated)
+        result = await self._dispatch(agent, context)
+        usage = _usage_of(result)
+        reservation.settle(usage["input_tokens"] + usage["output_tokens"])
+        return result
+    
+    async def _dispatch(self, agent, context: str):
+        """Runner.run under the adaptive concurrency limit, if any."""
+        if self.concurrency_limiter is None:
+            return await self._run_sdk(agent, context)
+        async with self.concurrency_limiter.slot(current_tenant.get()):
+            return await self._run_sdk(agent, context)
+    
+    async def _run_sdk(self, agent, context: str):
+        """Runner.run through the orchestrator's no-retry provider."""
+        return await Runner.run(agent, input=context, run_config=self.run_config)
+    
+    async def _call_hedged(
+        self,
+        agent,
+        context: str,
+        allowed_citations: set,
+        agent_name: str,
+        usage: Optional[Dict[str, int]] = None,
+    ):
+        """
+        One agent attempt, hedged when a hedge policy is set.
+        
+        If the call has not returned by the agent's rolling p95 latency
+        (and the hedge budget allows), a duplicate is issued. The first
+        response with valid citations wins and the other call is
+        cancelled; if neither is valid, the first response is returned
+        for the retry logic to handle. Usage of every completed call is
+        added to `usage`.
+        
+        Returns:
+            (result, True if the hedge's response won)
+        """
+        policy = self.hedge_policy
+        if policy is None:
+            result = await self._call_model(agent, context)
+            _add_usage(usage, result)
+            return result, False
+        
+        policy.on_call()
+        delay = policy.delay_s(agent_name)
+        calls = {
+            asyncio.create_task(self._call_model(agent, context)): time.perf_counter(),
+        }
+        primary = next(iter(calls))
+        fallback = None
+        error = None
+        try:
+            pending = set(calls)
+            if delay is not None:
+                done, pending = await asyncio.wait(pending, timeout=delay)
+                if not done and policy.try_hedge(agent_name):
+                    hedge = asyncio.create_task(self._call_model(agent, context))
+                    calls[hedge] = time.perf_counter()
+                    pending.add(hedge)
+                pending |= done
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for call in done:
+                    if call.exception() is not None:
+                        error = error or call.exception()
+                        continue
+                    result = call.result()
+                    policy.record(agent_name, time.perf_counter() - calls[call])
+                    _add_usage(usage, result)
+                    is_valid, _ = validate_citations(result.final_output, allowed_citations)
+                    if is_valid:
+                        hedge_won = call is not primary
+                        if hedge_won:
+                            policy.record_win(agent_name)
+                        return result, hedge_won
+                    fallback = fallback or result
+            if fallback is not None:
+                return fallback, False
+            raise error
+        finally:
+            if len(calls) > 1 and not primary.done():
+                # The hedged primary ran at least this long
+                policy.record_censored(
+                    agent_name, time.perf_counter() - calls[primary], delay
+                )
+            for call in calls:
+                call.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
     
     async def _run_agent_with_retry(
         self,
@@ -136,10 +640,38 @@ Citations: {evidence_output.citations}
         context: str,
         allowed_citations: set,
         agent_name: str,
+        deadline: Optional[Deadline] = None,
+        usage: Optional[Dict[str, int]] = None,
+        hedge_wins: Optional[List[str]] = None,
     ):
-        """Run an agent with citation validation and retry."""
+        """
+        Run an agent with citation validation and retry.
+        
+        With a deadline, the first attempt gets the `agents` budget and
+        retries get whatever the deadline has left; a retry expected to
+        take longer than the previous attempt's time is not started.
+        Provider token usage of every attempt (and hedge) is added to
+        `usage`; attempts won by a hedge are noted in `hedge_wins`.
+        """
+        last_attempt_s = 0.0
         for attempt in range(self.max_retries + 1):
-            result = await Runner.run(agent, input=context)
+            if deadline is None:
+                limit = nullcontext()
+            elif attempt == 0:
+                limit = deadline.child(self.stage_budgets.agents).enforce("agents")
+            elif deadline.fits(last_attempt_s):
+                limit = deadline.enforce("retries")
+            else:
+                raise DeadlineExceeded("retries")
+            
+            started = time.perf_counter()
+            async with limit:
+                result, hedge_won = await self._call_hedged(
+                    agent, context, allowed_citations, agent_name, usage
+                )
+            last_attempt_s = time.perf_counter() - started
+            if hedge_won and hedge_wins is not None:
+                hedge_wins.append(agent_name)
             output = result.final_output
             
             # Validate citations
@@ -159,10 +691,288 @@ Citations: {evidence_output.citations}
         
         return output
     
+    async def _run_agent_or_none(
+        self,
+        agent,
+        context: str,
+        allowed_citations: set,
+        agent_name: str,
+        state: _RunState,
+    ):
+        """_run_agent_timed, but None if the output's citations stay invalid."""
+        try:
+            return await self._run_agent_timed(
+                agent, context, allowed_citations, agent_name, state
+            )
+        except CitationValidationError:
+            return None
+    
+    async def _run_cascade(
+        self,
+        question: str,
+        excerpts: Dict[str, List[ExcerptBlock]],
+        state: _RunState,
+    ) -> Dict[str, Any]:
+        """
+        Run the agents in cascade mode.
+        
+        Every agent runs on the fast model first. Outputs in doubt (see
+        escalation_reasons) are re-run on the strong model; that repeats
+        while escalated answers put other fast outputs in doubt. Each
+        escalation is recorded with its reason in state.escalations.
+        Only the core agents are escalated; graph nodes that depend on
+        an escalated output are run again on the new output.
+        
+        Returns:
+            Dict mapping agent name to validated output
+        """
+        outputs = await self._run_agents(
+            question, excerpts, state, agents=self.fast_agents, fast_round=True
+        )
+        fast = set(self.fast_agents) - set(state.reuse)
+        while True:
+            reasons = escalation_reasons(self._core_outputs(outputs), fast)
+            if not reasons:
+                return outputs
+            for name, reason in reasons.items():
+                CASCADE_ESCALATIONS.inc(agent=name, reason=reason)
+            state.escalations.update(reasons)
+            fast -= set(reasons)
+            stale = set(reasons) | self.agent_graph.downstream(reasons)
+            known = {
+                name: output for name, output in outputs.items()
+                if name not in stale
+            }
+            outputs = await self._run_agents(question, excerpts, state, known=known)
+    
+    async def _run_agent_timed(
+        self,
+        agent,
+        context: str,
+        allowed_citations: set,
+        agent_name: str,
+        state: _RunState,
+    ):
+        """Run an agent, record its latency and emit an `agent` event."""
+        start = time.perf_counter()
+        hits = state.agent_cache_hits.count(agent_name)
+        output = await self._run_agent_cached(
+            agent, context, allowed_citations, agent_name, state
+        )
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        # Summed over cascade passes
+        state.agent_latency_ms[agent_name] = (
+            state.agent_latency_ms.get(agent_name, 0) + latency_ms
+        )
+        state.agent_models[agent_name] = str(agent.model)
+        await state.emit("agent", {
+            'agent': agent_name,
+            'model': str(agent.model),
+            'output': output.model_dump(),
+            'latency_ms': latency_ms,
+            'cached': state.agent_cache_hits.count(agent_name) > hits,
+        })
+        return output
+    
+    async def _run_agent_cached(
+        self,
+        agent,
+        context: str,
+        allowed_citations: set,
+        agent_name: str,
+        state: _RunState,
+    ):
+        """
+        Run an agent through the per-agent output cache.
+        
+        The cache key covers the agent, its prompt version, its model
+        and a hash of the exact context it would receive, so an output
+        is reused only when the call would be identical. Cached outputs
+        are re-validated against the current citation whitelist; only
+        validated outputs are stored.
+        """
+        usage = state.agent_usage.setdefault(
+            agent_name, dict.fromkeys(USAGE_FIELDS, 0)
+        )
+        if not self.deterministic_mode:
+            return await self._run_agent_with_retry(
+                agent, context, allowed_citations, agent_name,
+                state.deadline, usage, state.hedge_wins,
+            )
+        
+        prompt_version = state.prompt_versions.get(agent_name, "")
+        model = str(agent.model)
+        context_hash = TraceStore.compute_context_hash(context)
+        cache_key = TraceStore.compute_agent_cache_key(
+            agent_name, prompt_version, model, context_hash
+        )
+        
+        cached = await self.trace_store.get_agent_output(cache_key)
+        if cached is not None:
+            output = agent.output_type.model_validate(cached)
+            is_valid, _ = validate_citations(output, allowed_citations)
+            if is_valid:
+                state.agent_cache_hits.append(agent_name)
+                return output
+        
+        output = await self._run_agent_with_retry(
+            agent, context, allowed_citations, agent_name,
+            state.deadline, usage, state.hedge_wins,
+        )
+        await self.trace_store.store_agent_output(
+            cache_key, agent_name, prompt_version, model, context_hash, output
+        )
+        return output
+    
+    async def _run_judge_cached(self, context: str, state: _RunState) -> FinalVerdict:
+        """
+        Run the LLM Judge through the per-agent output cache.
+        
+        The judge payload is canonical, so runs whose agents produced
+        the same outputs (e.g. a re-judgment whose new evidence did not
+        change any stance) share one judge call.
+        """
+        usage = state.agent_usage.setdefault(
+            "judge", dict.fromkeys(USAGE_FIELDS, 0)
+        )
+        cache_key = None
+        if self.deterministic_mode:
+            prompt_version = state.prompt_versions.get("judge", "")
+            model = str(self.judge_agent.model)
+            context_hash = TraceStore.compute_context_hash(context)
+            cache_key = TraceStore.compute_agent_cache_key(
+                "judge", prompt_version, model, context_hash
+            )
+            cached = await self.trace_store.get_agent_output(cache_key)
+            if cached is not None:
+                state.agent_cache_hits.append("judge")
+                return FinalVerdict.model_validate(cached)
+        
+        result = await self._call_model(self.judge_agent, context)
+        for key, count in _usage_of(result).items():
+            usage[key] += count
+        verdict = result.final_output
+        if cache_key is not None:
+            await self.trace_store.store_agent_output(
+                cache_key, "judge", prompt_version, model, context_hash, verdict
+            )
+        return verdict
+    
+    def _parallel_agents(self) -> Dict[str, Any]:
+        """The parallel agents by name, in context order."""
+        return {
+            'policy': self.policy_agent,
+            'risk': self.risk_agent,
+            'evidence': self.evidence_agent,
+        }
+    
+    def _view_excerpt_ids(
+        self,
+        agent_name: str,
+        excerpts: Dict[str, List[ExcerptBlock]],
+    ) -> List[str]:
+        """IDs of the excerpts inside an agent's view, in context order."""
+        return [
+            e.excerpt_id
+            for doc_type in self.agent_graph.nodes[agent_name].view
+            for e in excerpts.get(doc_type, [])
+        ]
+    
+    async def _run_agents(
+        self,
+        question: str,
+        excerpts: Dict[str, List[ExcerptBlock]],
+        state: _RunState,
+        agents: Optional[Dict[str, Any]] = None,
+        known: Optional[Dict[str, Any]] = None,
+        fast_round: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run the agent graph.
+        
+        Every node starts as soon as the nodes it depends on have
+        finished, so the core agents run in parallel and extra nodes
+        follow their inputs. Each agent sees only its view of the
+        excerpts (plus its dependencies' outputs) and may cite only
+        those excerpts. Nodes with an output in state.reuse or `known`
+        are not called. `agents` overrides the agent used per name.
+        
+        fast_round is the first cascade pass: an overridden agent's
+        output failing citation validation is returned as None instead
+        of failing the run, and there is no short-circuit, since
+        escalation needs every output.
+        
+        The first agent to fail cancels the others, so no call keeps
+        running (and billing) once the run is going to fail closed.
+        Cancelling the run itself cancels every agent the same way.
+        With short_circuit, the core outputs are checked against the
+        rules as each agent completes; once they determine the verdict,
+        the agents still running or waiting are recorded as skipped.
+        Node timings (ms since the run started) go to state.node_timings.
+        
+        Returns:
+            Dict mapping agent name to validated output, in graph order
+        
+        Raises:
+            The first agent error (e.g. CitationValidationError)
+        """
+        overrides = agents or {}
+        graph = self.agent_graph.with_agents(overrides) if overrides else self.agent_graph
+        
+        async def run_node(node: AgentNode, upstream: Dict[str, Any]):
+            context = self._build_context(question, excerpts, node.view, upstream)
+            allowed_citations = set(self._view_excerpt_ids(node.name, excerpts))
+            tolerant = fast_round and node.name in overrides
+            run_agent = self._run_agent_or_none if tolerant else self._run_agent_timed
+            return await run_agent(
+                node.agent, context, allowed_citations, node.name, state
+            )
+        
+        def decided(outputs: Dict[str, Any]) -> bool:
+            return resolve_partial(**self._core_outputs(outputs)) is not None
+        
+        scheduler = GraphScheduler(graph, run_node, origin=state.started)
+        should_stop = decided if self.short_circuit and not fast_round else None
+        reason = "short_circuit"
+        try:
+            graph_run = await scheduler.run(
+                done={**state.reuse, **(known or {})}, should_stop=should_stop
+            )
+        except DeadlineExceeded:
+            reason = "deadline"
+            raise
+        except asyncio.CancelledError:
+            reason = "run_cancelled"
+            raise
+        except Exception:
+            reason = "agent_error"
+            raise
+        finally:
+            if scheduler.cancelled:
+                AGENT_CALLS_CANCELLED.inc(len(scheduler.cancelled), reason=reason)
+        
+        if should_stop is not None:
+            state.skipped_agents = graph_run.skipped
+        state.node_timings.update(graph_run.timings)
+        return graph_run.outputs
+    
+    def _core_outputs(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """The outputs the verdict rules read (policy, risk, evidence)."""
+        return {
+            name: outputs[name] for name in self._parallel_agents()
+            if name in outputs
+        }
+    
     async def run(
         self,
         question: str,
         excerpts: Dict[str, List[ExcerptBlock]],
+        on_event: Optional[EventCallback] = None,
+        deadline: Optional[Deadline] = None,
+        reuse: Optional[Dict[str, Any]] = None,
+        rejudged_from: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Run the full ProofGate judgment pipeline.
@@ -170,51 +980,385 @@ Citations: {evidence_output.citations}
         Args:
             question: The question to evaluate
             excerpts: Dict of excerpts by type
+            on_event: Optional async callback, called with ("agent", ...)
+                as soon as each parallel agent's output has been validated
+            deadline: Request deadline (defaults to deadline_s from now);
+                running out of time fails closed with DEADLINE_EXCEEDED
+            reuse: Validated outputs, by agent name, to use instead of
+                calling those agents (see rejudge())
+            rejudged_from: run_id this run re-judges, recorded in the trace
+            batch_id: Batch whose packed calls supplied `reuse` (see
+                run_batch), recorded in the trace
+            tenant: Tenant the run's provider calls queue as for fair
+                scheduling; defaults to the caller's current tenant
+        
+        In deterministic mode, a run identical to one already executing
+        (same input_hash) waits for that execution instead of calling
+        the agents again, and its trace is marked coalesced.
         
         Returns:
             Dict with verdict, agent_outputs, trace
         """
-        start_time = time.time()
-        run_id = str(uuid.uuid4())[:8]
-        
-        # Flatten excerpts and get allowed citations
-        all_excerpts = [
-            e for excerpt_list in excerpts.values() 
-            for e in excerpt_list
-        ]
-        excerpt_ids = [e.excerpt_id for e in all_excerpts]
-        allowed_citations = {e.excerpt_id for e in all_excerpts}
-        prompt_versions = get_prompt_versions()
-        
-        # Compute input hash for caching
-        input_hash = TraceStore.compute_input_hash(
-            question, excerpt_ids, prompt_versions
-        )
-        
-        # Check cache if deterministic mode
-        if self.deterministic_mode:
+        with tenant_scope(tenant):
+            start_time = time.time()
+            run_id = str(uuid.uuid4())[:8]
+            deadline = deadline or Deadline.after(self.deadline_s)
+            budgets = self.stage_budgets
+            excerpt_ids = [e.excerpt_id for e in self._flatten(excerpts)]
+            prompt_versions = self._get_prompt_versions()
+            state = _RunState(
+                on_event=on_event,
+                deadline=deadline.child(budgets.agents + budgets.retries),
+                prompt_versions=prompt_versions,
+                reuse=dict(reuse or {}),
+                rejudged_from=rejudged_from,
+                batch_id=batch_id,
+            )
+            
+            # Compute input hash for caching
+            input_hash = TraceStore.compute_input_hash(
+                question, excerpt_ids, prompt_versions
+            )
+            
+            execute = partial(
+                self._execute, run_id, question, excerpts, input_hash,
+                prompt_versions, state, deadline, start_time,
+            )
+            if not self.deterministic_mode:
+                return await execute()
+            
+            # Check cache
             cached = await self.trace_store.get_cached_result(input_hash)
             if cached:
                 # Return cached result with replayed flag
                 cached['trace']['replayed'] = True
                 return cached
+            
+            # Identical run already executing: share its result
+            flight = self._in_flight.get(input_hash)
+            if flight is not None and not flight.task.done():
+                return await self._join_flight(
+                    flight, run_id, question, excerpt_ids, prompt_versions, deadline
+                )
+            
+            flight = _Flight(run_id=run_id, task=asyncio.create_task(execute()))
+            self._in_flight[input_hash] = flight
+            flight.task.add_done_callback(
+                lambda _: self._end_flight(input_hash, flight)
+            )
+            return await self._await_flight(flight)
+    
+    async def run_batch(
+        self,
+        questions: List[str],
+        excerpts: Dict[str, List[ExcerptBlock]],
+        pack_size: int = DEFAULT_PACK_SIZE,
+        tenant: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Judge many questions over the same excerpts with packed calls.
+        
+        Questions are taken pack_size at a time. Each parallel agent
+        answers a whole pack in one call, and every answer is validated
+        on its own against that agent's citation whitelist. Each
+        question then goes through run() with its valid packed answers
+        as `reuse`; agents whose answer was missing or invalid are
+        called for that question alone, with the usual retry.
+        
+        In deterministic mode, questions with a stored result are left
+        out of the packs and replayed.
+        
+        Args:
+            questions: Questions to judge
+            excerpts: Dict of excerpts by type, shared by every question
+            pack_size: Questions per packed agent call
+            tenant: Tenant for fair scheduling (see run())
+        
+        Returns:
+            One run() result per question, in order
+        """
+        with tenant_scope(tenant):
+            batch_id = str(uuid.uuid4())[:8]
+            prompt_versions = self._get_prompt_versions()
+            excerpt_ids = [e.excerpt_id for e in self._flatten(excerpts)]
+            
+            pending = []
+            for i, question in enumerate(questions):
+                input_hash = TraceStore.compute_input_hash(
+                    question, excerpt_ids, prompt_versions
+                )
+                if self.deterministic_mode and await self.trace_store.get_cached_result(input_hash):
+                    continue
+                pending.append(i)
+            
+            reuse: Dict[int, Dict[str, Any]] = {}
+            for start in range(0, len(pending), pack_size):
+                pack = pending[start:start + pack_size]
+                if len(pack) < 2:
+                    continue
+                answers = await self._run_packed([questions[i] for i in pack], excerpts)
+                for j, i in enumerate(pack):
+                    reuse[i] = {
+                        name: by_index[j]
+                        for name, by_index in answers.items()
+                        if j in by_index
+                    }
+                    for name in answers.keys() - reuse[i].keys():
+                        PACKED_FALLBACKS.inc(agent=name)
+            
+            results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+            
+            async def judge(i: int) -> None:
+                results[i] = await self.run(
+                    questions[i], excerpts,
+                    reuse=reuse.get(i),
+                    batch_id=batch_id if i in reuse else None,
+                )
+            
+            for start in range(0, len(questions), pack_size):
+                async with asyncio.TaskGroup() as group:
+                    for i in range(start, min(start + pack_size, len(questions))):
+                        group.create_task(judge(i))
+            return results
+    
+    async def _run_packed(
+        self,
+        questions: List[str],
+        excerpts: Dict[str, List[ExcerptBlock]],
+    ) -> Dict[str, Dict[int, Any]]:
+        """
+        One packed call per parallel agent.
+        
+        Returns:
+            Validated answers by agent name, then question index
+        """
+        names = list(self._parallel_agents())
+        answers = await asyncio.gather(*(
+            self._run_packed_agent(name, questions, excerpts) for name in names
+        ))
+        return dict(zip(names, answers))
+    
+    async def _run_packed_agent(
+        self,
+        agent_name: str,
+        questions: List[str],
+        excerpts: Dict[str, List[ExcerptBlock]],
+    ) -> Dict[int, Any]:
+        """
+        Answer several questions with one call to an agent.
+        
+        An answer is kept only if its question index is in range and
+        unique and its citations pass validation; a failed call keeps
+        none. Questions without a kept answer fall back to single calls.
+        
+        Returns:
+            Validated single-question outputs by question index
+        """
+        agent = self._parallel_agents()[agent_name]
+        context = self._build_packed_context(
+            questions, excerpts, self.agent_graph.nodes[agent_name].view
+        )
+        allowed_citations = set(self._view_excerpt_ids(agent_name, excerpts))
+        deadline = Deadline.after(self.deadline_s).child(self.stage_budgets.agents)
+        try:
+            async with deadline.enforce("agents"):
+                result = await self._call_model(
+                    self.packed_agents[agent_name], context
+                )
+            packed = result.final_output.answers
+        except Exception:
+            return {}
+        
+        indices = [answer.question_index for answer in packed]
+        answers = {}
+        for answer in packed:
+            index = answer.question_index
+            if not 0 <= index < len(questions) or indices.count(index) > 1:
+                continue
+            output = agent.output_type.model_validate(
+                answer.model_dump(exclude={"question_index"})
+            )
+            is_valid, _ = validate_citations(output, allowed_citations)
+            if is_valid:
+                answers[index] = output
+        return answers
+    
+    async def rejudge(
+        self,
+        previous: Dict[str, Any],
+        added: List[ExcerptBlock],
+        removed_ids: List[str],
+        deadline: Optional[Deadline] = None,
+        tenant: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-judge a stored run after an evidence change.
+        
+        Applies the delta to the previous run's excerpts, then reruns
+        only the agents whose view changed (or whose prompt version
+        moved on) and the graph nodes depending on them; every other
+        agent's stored output is reused and the verdict is resolved again.
+        
+        Args:
+            previous: Stored result of the run being re-judged
+            added: Excerpts to add
+            removed_ids: Excerpt IDs to remove
+            deadline: Request deadline
+            tenant: Tenant for fair scheduling (see run())
+        
+        Returns:
+            Result dict for the new run (trace.rejudged_from is set)
+        """
+        question = previous['trace']['question']
+        before = {}
+        for data in previous.get('excerpts_used', []):
+            excerpt = ExcerptBlock.model_validate(data)
+            before.setdefault(excerpt.doc_type, []).append(excerpt)
+        
+        removed = set(removed_ids)
+        after = {
+            doc_type: [e for e in excerpt_list if e.excerpt_id not in removed]
+            for doc_type, excerpt_list in before.items()
+        }
+        for excerpt in added:
+            current = after.setdefault(excerpt.doc_type, [])
+            if excerpt.excerpt_id not in {e.excerpt_id for e in current}:
+                current.append(excerpt)
+        
+        nodes = self.agent_graph.nodes
+        prompt_versions = self._get_prompt_versions()
+        previous_versions = previous['trace'].get('prompt_versions', {})
+        stored_outputs = {
+            name: stored for name, stored in previous.get('agent_outputs', {}).items()
+            if name in nodes
+        }
+        changed = {
+            name for name in nodes
+            if name not in stored_outputs
+            or self._view_excerpt_ids(name, before) != self._view_excerpt_ids(name, after)
+            or previous_versions.get(name) != prompt_versions.get(name)
+        }
+        changed |= self.agent_graph.downstream(changed)
+        reuse = {
+            name: nodes[name].output_type.model_validate(stored)
+            for name, stored in stored_outputs.items()
+            if name not in changed
+        }
+        
+        return await self.run(
+            question, after, deadline=deadline,
+            reuse=reuse, rejudged_from=previous['run_id'], tenant=tenant,
+        )
+    
+    def _end_flight(self, input_hash: str, flight: _Flight) -> None:
+        """Drop a finished execution from the single-flight map."""
+        if self._in_flight.get(input_hash) is flight:
+            del self._in_flight[input_hash]
+    
+    @staticmethod
+    def _flatten(excerpts: Dict[str, List[ExcerptBlock]]) -> List[ExcerptBlock]:
+        """Excerpts of every doc type, in context order."""
+        return [
+            e for excerpt_list in excerpts.values()
+            for e in excerpt_list
+        ]
+    
+    async def _await_flight(self, flight: _Flight) -> Dict[str, Any]:
+        """
+        Wait for a shared execution.
+        
+        Each waiter is shielded from the others: one caller cancelling
+        (e.g. client disconnect) only cancels the execution once no
+        caller is left waiting for it.
+        """
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+    
+    async def _join_flight(
+        self,
+        flight: _Flight,
+        run_id: str,
+        question: str,
+        excerpt_ids: List[str],
+        prompt_versions: Dict[str, str],
+        deadline: Deadline,
+    ) -> Dict[str, Any]:
+        """
+        Join an identical in-flight run.
         
-        # Build context for parallel agents
-        context = self._build_context(question, excerpts)
+        The joiner gets a copy of the leader's result under its own
+        run_id, with the trace marked coalesced, and the copy is stored
+        as the joiner's trace so its run_id can be fetched and re-judged.
+        """
+        JUDGMENTS_COALESCED.inc()
+        try:
+            async with deadline.enforce("coalesced"):
+                leader_result = await self._await_flight(flight)
+        except DeadlineExceeded as e:
+            return self._fail_closed_result(
+                run_id, question, excerpt_ids, prompt_versions,
+                str(e), rule_applied=DEADLINE_RULE,
+            )
+        
+        result = copy.deepcopy(leader_result)
+        result['run_id'] = run_id
+        result['trace'].update(
+            run_id=run_id,
+            replayed=False,
+            coalesced=True,
+            coalesced_from=flight.run_id,
+            tenant=current_tenant.get(),
+        )
+        
+        # Like the leader's, an unrecorded verdict is not auditable
+        try:
+            async with deadline.child(self.stage_budgets.trace_write).enforce("trace_write"):
+                await self.trace_store.store_trace(
+                    RunTrace.model_validate(result['trace']), result
+                )
+        except DeadlineExceeded as e:
+            return self._fail_closed_result(
+                run_id, question, excerpt_ids, prompt_versions,
+                str(e), rule_applied=DEADLINE_RULE,
+            )
+        return result
+    
+    async def _execute(
+        self,
+        run_id: str,
+        question: str,
+        excerpts: Dict[str, List[ExcerptBlock]],
+        input_hash: str,
+        prompt_versions: Dict[str, str],
+        state: _RunState,
+        deadline: Deadline,
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """Run agents, resolve the verdict and store the trace."""
+        budgets = self.stage_budgets
+        all_excerpts = self._flatten(excerpts)
+        excerpt_ids = [e.excerpt_id for e in all_excerpts]
         
         # PARALLEL EXECUTION - The multi-agent magic
-        # Three agents with conflicting objectives, running simultaneously
+        # Three agents with conflicting objectives, running simultaneously,
+        # and any extra graph nodes as soon as their inputs are ready
         try:
-            policy_result, risk_result, evidence_result = await asyncio.gather(
-                self._run_agent_with_retry(
-                    self.policy_agent, context, allowed_citations, "policy"
-                ),
-                self._run_agent_with_retry(
-                    self.risk_agent, context, allowed_citations, "risk"
-                ),
-                self._run_agent_with_retry(
-                    self.evidence_agent, context, allowed_citations, "evidence"
-                ),
+            run_agents = self._run_cascade if self.cascade else self._run_agents
+            agent_results = await run_agents(question, excerpts, state)
+        except DeadlineExceeded as e:
+            return self._fail_closed_result(
+                run_id, question, excerpt_ids, prompt_versions,
+                str(e), rule_applied=DEADLINE_RULE,
+            )
+        except CircuitOpen as e:
+            return self._fail_closed_result(
+                run_id, question, excerpt_ids, prompt_versions,
+                str(e), rule_applied=CIRCUIT_OPEN_RULE,
             )
         except CitationValidationError as e:
             # Fail closed on citation validation error
@@ -230,31 +1374,47 @@ Citations: {evidence_output.citations}
             )
         
         # JUDGE RESOLUTION - Deterministic rules
-        judge_context = self._build_judge_context(
-            question, policy_result, risk_result, evidence_result
-        )
-        
-        try:
-            judge_response = await Runner.run(
-                self.judge_agent, input=judge_context
-            )
-            verdict = judge_response.final_output
-        except Exception as e:
-            return self._fail_closed_result(
-                run_id, question, excerpt_ids, prompt_versions,
-                f"Judge execution error: {str(e)}"
+        core_results = self._core_outputs(agent_results)
+        if state.skipped_agents:
+            verdict = resolve_partial(**core_results)
+        elif self.judge_mode == "rules":
+            verdict = resolve_verdict(**core_results)
+        else:
+            policy_result = agent_results['policy']
+            risk_result = agent_results['risk']
+            evidence_result = agent_results['evidence']
+            judge_context = self._build_judge_context(
+                question, policy_result, risk_result, evidence_result
             )
+            
+            try:
+                async with deadline.child(budgets.judge).enforce("judge"):
+                    verdict = await self._run_judge_cached(judge_context, state)
+            except DeadlineExceeded as e:
+                return self._fail_closed_result(
+                    run_id, question, excerpt_ids, prompt_versions,
+                    str(e), rule_applied=DEADLINE_RULE,
+                )
+            except CircuitOpen as e:
+                return self._fail_closed_result(
+                    run_id, question, excerpt_ids, prompt_versions,
+                    str(e), rule_applied=CIRCUIT_OPEN_RULE,
+                )
+            except Exception as e:
+                return self._fail_closed_result(
+                    run_id, question, excerpt_ids, prompt_versions,
+                    f"Judge execution error: {str(e)}"
+                )
         
         # Calculate latency
         latency_ms = int((time.time() - start_time) * 1000)
         
         # Build agent output hashes
         agent_output_hashes = {
-            'policy': TraceStore.compute_output_hash(policy_result),
-            'risk': TraceStore.compute_output_hash(risk_result),
-            'evidence': TraceStore.compute_output_hash(evidence_result),
-            'judge': TraceStore.compute_output_hash(verdict),
+            name: TraceStore.compute_output_hash(output)
+            for name, output in agent_results.items()
         }
+        agent_output_hashes['judge'] = TraceStore.compute_output_hash(verdict)
         
         # Build trace
         trace = RunTrace(
@@ -268,6 +1428,22 @@ Citations: {evidence_output.citations}
             replayed=False,
             timestamp=datetime.utcnow().isoformat(),
             latency_ms=latency_ms,
+            agent_latency_ms=state.agent_latency_ms,
+            agent_usage=state.agent_usage,
+            skipped_agents=state.skipped_agents,
+            agent_cache_hits=sorted(state.agent_cache_hits),
+            hedge_wins=sorted(state.hedge_wins),
+            agent_models=state.agent_models,
+            escalations=state.escalations,
+            node_timings={
+                name: timing.model_dump()
+                for name, timing in state.node_timings.items()
+            },
+            critical_path=critical_path(self.agent_graph, state.node_timings),
+            reused_agents=sorted(state.reuse),
+            rejudged_from=state.rejudged_from,
+            batch_id=state.batch_id,
+            tenant=current_tenant.get(),
         )
         
         # Build result
@@ -275,19 +1451,100 @@ Citations: {evidence_output.citations}
             'run_id': run_id,
             'verdict': verdict.model_dump(),
             'agent_outputs': {
-                'policy': policy_result.model_dump(),
-                'risk': risk_result.model_dump(),
-                'evidence': evidence_result.model_dump(),
+                name: output.model_dump()
+                for name, output in agent_results.items()
             },
             'trace': trace.model_dump(),
             'excerpts_used': [e.model_dump() for e in all_excerpts],
         }
         
-        # Store trace
-        await self.trace_store.store_trace(trace, result)
+        # Store trace; an unrecorded verdict is not auditable, so fail closed
+        try:
+            async with deadline.child(budgets.trace_write).enforce("trace_write"):
+                await self.trace_store.store_trace(trace, result)
+        except DeadlineExceeded as e:
+            return self._fail_closed_result(
+                run_id, question, excerpt_ids, prompt_versions,
+                str(e), rule_applied=DEADLINE_RULE,
+            )
         
         return result
     
+    async def run_stream(
+        self,
+        question: str,
+        excerpts: Dict[str, List[ExcerptBlock]],
+        deadline: Optional[Deadline] = None,
+        tenant: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the pipeline, yielding events as results become available.
+        
+        Yields (event, payload) tuples in this order:
+        - "agent": once per parallel agent, as soon as it completes
+          (replayed results yield all agents at once)
+        - "verdict": the final verdict
+        - "trace": run_id, trace, excerpts_used and any error
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def on_event(event: str, data: Dict[str, Any]) -> None:
+            await queue.put((event, data))
+        
+        async def produce() -> Dict[str, Any]:
+            try:
+                return await self.run(
+                    question, excerpts, on_event=on_event, deadline=deadline,
+                    tenant=tenant,
+                )
+            finally:
+                await queue.put(None)
+        
+        task = asyncio.create_task(produce())
+        streamed = set()
+        try:
+            while (item := await queue.get()) is not None:
+                if item[0] == "agent":
+                    streamed.add(item[1]['agent'])
+                yield item
+            result = await task
+        finally:
+            if not task.done():
+                task.cancel()
+        
+        # Replayed results never ran the agents: emit their stored outputs
+        latencies = result['trace'].get('agent_latency_ms', {})
+        for agent_name, output in result['agent_outputs'].items():
+            if agent_name not in streamed:
+                yield "agent", {
+                    'agent': agent_name,
+                    'output': output,
+                    'latency_ms': latencies.get(agent_name),
+                    'replayed': result['trace'].get('replayed', False),
+                }
+        
+        yield "verdict", result['verdict']
+        yield "trace", {
+            'run_id': result['run_id'],
+            'trace': result['trace'],
+            'excerpts_used': result.get('excerpts_used', []),
+            'error': result.get('error'),
+        }
+    
+    def deadline_exceeded_result(
+        self,
+        question: str,
+        error: DeadlineExceeded,
+    ) -> Dict[str, Any]:
+        """
+        Fail-closed result for a deadline missed before run() started
+        (e.g. during retrieval).
+        """
+        return self._fail_closed_result(
+            str(uuid.uuid4())[:8], question, [], self._get_prompt_versions(),
+            str(error), rule_applied=DEADLINE_RULE,
+        )
+    
     def _fail_closed_result(
         self,
         run_id: str,
@@ -295,6 +1552,7 @@ Citations: {evidence_output.citations}
         excerpt_ids: List[str],
         prompt_versions: Dict[str, str],
         error_message: str,
+        rule_applied: str = "FAIL_CLOSED_ON_ERROR",
     ) -> Dict[str, Any]:
         """Return fail-closed result on error."""
         verdict = FinalVerdict(
@@ -303,7 +1561,7 @@ Citations: {evidence_output.citations}
             violations=[],
             conditions_to_allow=[f"SYSTEM_ERROR: {error_message}"],
             citations=[],
-            rule_applied="FAIL_CLOSED_ON_ERROR",
+            rule_applied=rule_applied,
         )
         
         trace = RunTrace(
@@ -318,6 +1576,7 @@ Citations: {evidence_output.citations}
             final_output_hash=TraceStore.compute_output_hash(verdict),
             replayed=False,
             timestamp=datetime.utcnow().isoformat(),
+            tenant=current_tenant.get(),
         )
         
         return {
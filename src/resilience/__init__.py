@@ -0,0 +1,53 @@
+"""
+ProofGate Resilience Package
+
+Deadlines and time budgets that keep slow dependencies from holding
+requests open, rate limiting that keeps provider calls under their
+limits, hedging that cuts their latency tail, and retries and circuit
+breakers for transient provider failures.
+"""
+
+from .breaker import (
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RESET_TIMEOUT_S,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpen,
+)
+from .deadline import (
+    DEFAULT_DEADLINE_S,
+    Deadline,
+    DeadlineExceeded,
+    StageBudgets,
+    deadline_passed,
+)
+from .hedging import DEFAULT_MAX_HEDGE_RATE, HedgePolicy
+from .rate_limit import (
+    RateLimiter,
+    RateLimits,
+    Reservation,
+    TokenBucket,
+)
+from .retry import DEFAULT_RETRY_ATTEMPTS, RetryPolicy, is_transient
+
+__all__ = [
+    "DEFAULT_DEADLINE_S",
+    "Deadline",
+    "DeadlineExceeded",
+    "StageBudgets",
+    "deadline_passed",
+    "DEFAULT_MAX_HEDGE_RATE",
+    "HedgePolicy",
+    "RateLimiter",
+    "RateLimits",
+    "Reservation",
+    "TokenBucket",
+    "DEFAULT_RETRY_ATTEMPTS",
+    "RetryPolicy",
+    "is_transient",
+    "DEFAULT_FAILURE_THRESHOLD",
+    "DEFAULT_RESET_TIMEOUT_S",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "CircuitOpen",
+]
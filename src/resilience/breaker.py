@@ -0,0 +1,143 @@
+"""
+Circuit Breakers
+
+Per-model circuit breakers around provider calls. After repeated
+transient failures a model's breaker opens, and calls to that model fail
+at once instead of each waiting out its own timeout. Once the reset
+timeout passes, a single probe call is let through (half-open); its
+success closes the breaker and its failure opens it again.
+"""
+
+import time
+from typing import Dict, Literal
+
+from src.metrics import metrics
+
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_S = 30.0
+
+# Gauge encoding of the breaker state
+STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+CIRCUIT_STATE = metrics.gauge(
+    "circuit_breaker_state",
+    "Breaker state by model: 0 closed, 1 half-open, 2 open",
+)
+CIRCUIT_REJECTED = metrics.counter(
+    "circuit_breaker_rejected_total",
+    "Provider calls failed fast by an open breaker, by model",
+)
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a model whose breaker is open."""
+
+    def __init__(self, model: str, retry_after_s: float):
+        self.model = model
+        self.retry_after_s = retry_after_s
+        super().__init__(
+            f"Circuit open for {model}; retry after {retry_after_s:.0f}s"
+        )
+
+
+class CircuitBreaker:
+    """
+    Breaker for one model.
+
+    Opens after `failure_threshold` consecutive transient failures.
+    Only one probe runs while half-open; other calls are rejected until
+    it reports back.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout_s: float = DEFAULT_RESET_TIMEOUT_S,
+    ):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state: CircuitState = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._publish()
+
+    def acquire(self) -> bool:
+        """
+        Permit one call.
+
+        Returns:
+            True if the call is the half-open probe
+
+        Raises:
+            CircuitOpen: if the call must fail fast
+        """
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout_s - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+            self.state = "half_open"
+            self._publish()
+        if self.state == "half_open":
+            if self._probing:
+                self._reject(self.reset_timeout_s)
+            self._probing = True
+            return True
+        return False
+
+    def on_success(self, probe: bool) -> None:
+        """The call reached the provider and got an answer."""
+        self.failures = 0
+        if probe or self.state == "half_open":
+            self._probing = False
+            self.state = "closed"
+            self._publish()
+
+    def on_failure(self, probe: bool) -> None:
+        """The call failed with a transient provider error."""
+        self.failures += 1
+        if probe or self.failures >= self.failure_threshold:
+            self._probing = False
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._publish()
+
+    def on_abandon(self, probe: bool) -> None:
+        """The call ended without telling us about the provider (cancelled)."""
+        if probe:
+            self._probing = False
+
+    def _reject(self, retry_after_s: float) -> None:
+        CIRCUIT_REJECTED.inc(model=self.model)
+        raise CircuitOpen(self.model, retry_after_s)
+
+    def _publish(self) -> None:
+        CIRCUIT_STATE.set(STATE_VALUES[self.state], model=self.model)
+
+
+class CircuitBreakers:
+    """One breaker per model, created on first use."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout_s: float = DEFAULT_RESET_TIMEOUT_S,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_model(self, model: str) -> CircuitBreaker:
+        """The breaker for a model."""
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                model, self.failure_threshold, self.reset_timeout_s
+            )
+            self._breakers[model] = breaker
+        return breaker
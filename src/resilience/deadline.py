@@ -0,0 +1,119 @@
+"""
+Request Deadlines
+
+A request carries one absolute deadline; each pipeline stage runs under
+the tighter of that deadline and its own budget, so a slow provider
+cannot hold a request open past the hard limit.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+# DESIGN.md hard limit for the whole pipeline
+DEFAULT_DEADLINE_S = 45.0
+
+# Timeouts of the deadlines enforced around the running code (inherited
+# by tasks it starts), so a cancelled call can tell whether a deadline
+# cut it off
+_enforcing: ContextVar[Tuple[asyncio.Timeout, ...]] = ContextVar(
+    "enforcing_deadlines", default=()
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage runs out of time."""
+    
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Deadline exceeded during {stage}")
+
+
+class StageBudgets(BaseModel):
+    """
+    Per-stage time budgets in seconds (DESIGN.md hard limits).
+    
+    Each stage also stops at the request deadline, whichever is sooner.
+    """
+    retrieval: float = Field(default=0.2, description="Excerpt retrieval")
+    agents: float = Field(
+        default=15.0,
+        description="First attempt of the parallel Policy/Risk/Evidence calls"
+    )
+    retries: float = Field(
+        default=10.0,
+        description="Extra time for citation-correction retries"
+    )
+    judge: float = Field(default=10.0, description="LLM Judge call")
+    trace_write: float = Field(default=2.0, description="Trace store write")
+
+
+class Deadline:
+    """
+    Absolute point in (monotonic) time by which work must finish.
+    
+    Deadlines nest: child() never extends past its parent, so a stage
+    budget can only tighten the request deadline.
+    """
+    
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+    
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Deadline `seconds` from now."""
+        return cls(time.monotonic() + seconds)
+    
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def child(self, budget_s: Optional[float]) -> "Deadline":
+        """Deadline for a sub-stage: `budget_s` from now, capped by self."""
+        if budget_s is None:
+            return self
+        return Deadline(min(self.expires_at, time.monotonic() + budget_s))
+    
+    def fits(self, duration_s: float) -> bool:
+        """Whether work expected to take `duration_s` can finish in time."""
+        return duration_s <= self.remaining()
+    
+    @asynccontextmanager
+    async def enforce(self, stage: str) -> AsyncIterator[None]:
+        """
+        Cancel the enclosed block when the deadline passes.
+        
+        Raises:
+            DeadlineExceeded: if time runs out before or during the block
+        """
+        if self.expired:
+            raise DeadlineExceeded(stage)
+        timeout = asyncio.timeout(self.remaining())
+        token = _enforcing.set(_enforcing.get() + (timeout,))
+        try:
+            async with timeout:
+                yield
+        except TimeoutError:
+            if timeout.expired():
+                raise DeadlineExceeded(stage) from None
+            raise
+        finally:
+            _enforcing.reset(token)
+
+
+def deadline_passed() -> bool:
+    """
+    Whether a deadline enforced around the running code has fired, i.e.
+    whether a CancelledError seen here is that deadline cutting it off
+    rather than the caller giving up on it.
+    """
+    return any(timeout.expired() for timeout in _enforcing.get())
@@ -0,0 +1,116 @@
+"""
+Request Hedging
+
+A run waits for the slowest of its parallel agent calls, so one slow
+provider response sets the end-to-end tail. A hedged call that has not
+returned by its agent's rolling p95 latency gets a duplicate; the first
+acceptable response wins and the other is cancelled. Hedges are paid
+for from a budget earned per call, which caps the extra cost.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.metrics import metrics
+
+
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_MAX_HEDGE_RATE = 0.1
+
+# Latency samples kept per agent
+DEFAULT_WINDOW = 200
+
+# Samples needed before an agent is hedged at all
+DEFAULT_MIN_SAMPLES = 20
+
+# Unspent hedge budget carried over, so a quiet spell cannot fund a
+# hedge on every call of the next burst
+DEFAULT_BURST = 5
+
+HEDGES_ISSUED = metrics.counter(
+    "hedges_issued_total",
+    "Duplicate agent calls issued after the hedge delay, by agent",
+)
+HEDGES_SKIPPED = metrics.counter(
+    "hedges_skipped_total",
+    "Hedges not issued because the hedge budget was spent, by agent",
+)
+HEDGE_WINS = metrics.counter(
+    "hedge_wins_total",
+    "Hedged calls answered first by the duplicate, by agent",
+)
+
+
+class HedgePolicy:
+    """
+    When to hedge an agent call, and whether the budget allows it.
+
+    Every call earns `max_hedge_rate` of a hedge (up to `burst`), and a
+    hedge spends one, so over time at most that fraction of calls is
+    duplicated.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        max_hedge_rate: float = DEFAULT_MAX_HEDGE_RATE,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        burst: float = DEFAULT_BURST,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= max_hedge_rate <= 1:
+            raise ValueError("max_hedge_rate must be between 0 and 1")
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.burst = burst
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = 0.0
+
+    def record(self, agent_name: str, latency_s: float) -> None:
+        """Add a completed call's latency to the agent's window."""
+        samples = self._latencies.get(agent_name)
+        if samples is None:
+            samples = self._latencies[agent_name] = deque(maxlen=self.window)
+        samples.append(latency_s)
+
+    def record_censored(self, agent_name: str, elapsed_s: float, floor_s: float) -> None:
+        """
+        Add a call cancelled before it finished, such as a primary beaten
+        by its hedge. Its latency is at least its elapsed time and the
+        hedge delay it outlived; dropping it would leave only the fast
+        samples and drag the percentile (and so the delay) down.
+        """
+        self.record(agent_name, max(elapsed_s, floor_s))
+
+    def delay_s(self, agent_name: str) -> Optional[float]:
+        """
+        How long a call may run before it is hedged: the agent's rolling
+        percentile latency, or None until enough samples exist.
+        """
+        samples = self._latencies.get(agent_name)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+
+    def on_call(self) -> None:
+        """Earn hedge budget for one call."""
+        self._budget = min(self.burst, self._budget + self.max_hedge_rate)
+
+    def try_hedge(self, agent_name: str) -> bool:
+        """Spend budget on a hedge; False (and counted) if there is none."""
+        if self._budget < 1:
+            HEDGES_SKIPPED.inc(agent=agent_name)
+            return False
+        self._budget -= 1
+        HEDGES_ISSUED.inc(agent=agent_name)
+        return True
+
+    def record_win(self, agent_name: str) -> None:
+        """Count a call answered first by its hedge."""
+        HEDGE_WINS.inc(agent=agent_name)
@@ -0,0 +1,164 @@
+"""
+Provider Rate Limiting
+
+Token-bucket limiter for LLM calls, with a requests-per-minute and a
+tokens-per-minute bucket per model. Calls wait for capacity before
+dispatch instead of being rejected by the provider with a 429. Token
+cost is not known until the call returns, so a call reserves an
+estimate up front and the difference is settled from actual usage.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from src.metrics import metrics
+
+
+RATE_LIMIT_WAIT_SECONDS = metrics.histogram(
+    "rate_limit_wait_seconds",
+    "Time LLM calls waited for rate-limit capacity, by model",
+)
+
+
+class RateLimits(BaseModel):
+    """Provider limits for one model; None leaves that dimension unlimited."""
+    rpm: Optional[float] = Field(default=None, description="Requests per minute")
+    tpm: Optional[float] = Field(default=None, description="Tokens per minute")
+
+
+class TokenBucket:
+    """
+    Bucket refilled continuously at `per_minute / 60` per second, up to
+    `per_minute` (one minute's burst).
+
+    Waiters are served in arrival order. The balance may go negative
+    when a reservation is settled above its estimate; later callers
+    then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until `amount` is available, then take it."""
+        # A request larger than the bucket could never fit; let it
+        # through on a full bucket and carry the rest as debt
+        needed = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < needed:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Return (positive) or charge (negative) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class Reservation:
+    """Capacity taken for one call, settled once its usage is known."""
+
+    def __init__(self, tokens: Optional[TokenBucket], estimated_tokens: int):
+        self._tokens = tokens
+        self.estimated_tokens = estimated_tokens
+        self._settled = False
+
+    def settle(self, actual_tokens: Optional[int]) -> None:
+        """
+        Replace the estimate with actual usage. Unknown usage (None or
+        0) keeps the estimate. Idempotent.
+        """
+        if self._settled:
+            return
+        self._settled = True
+        if self._tokens is not None and actual_tokens:
+            self._tokens.adjust(self.estimated_tokens - actual_tokens)
+
+
+class ModelLimiter:
+    """Request and token buckets for one model."""
+
+    def __init__(self, model: str, limits: RateLimits):
+        self.model = model
+        self.requests = TokenBucket(limits.rpm) if limits.rpm else None
+        self.tokens = TokenBucket(limits.tpm) if limits.tpm else None
+
+    async def acquire(self, estimated_tokens: int) -> Reservation:
+        """Wait for one request slot and `estimated_tokens` tokens."""
+        started = time.monotonic()
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(estimated_tokens)
+        RATE_LIMIT_WAIT_SECONDS.observe(time.monotonic() - started, model=self.model)
+        return Reservation(self.tokens, estimated_tokens)
+
+
+class RateLimiter:
+    """
+    Process-wide limiter: one ModelLimiter per model, created on first
+    use from that model's limits (or the defaults).
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimits] = None,
+        per_model: Optional[Dict[str, RateLimits]] = None,
+    ):
+        self.default = default or RateLimits()
+        self.per_model = dict(per_model or {})
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Limits from RATE_LIMIT_RPM / RATE_LIMIT_TPM (applied to every
+        model) and RATE_LIMITS_JSON, e.g. '{"gpt-4o": {"rpm": 500}}'.
+        """
+        rpm = os.getenv("RATE_LIMIT_RPM")
+        tpm = os.getenv("RATE_LIMIT_TPM")
+        default = RateLimits(
+            rpm=float(rpm) if rpm else None,
+            tpm=float(tpm) if tpm else None,
+        )
+        try:
+            overrides = json.loads(os.getenv("RATE_LIMITS_JSON") or "{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"RATE_LIMITS_JSON is not valid JSON: {e}")
+        per_model = {
+            model: RateLimits.model_validate(limits)
+            for model, limits in overrides.items()
+        }
+        return cls(default=default, per_model=per_model)
+
+    def for_model(self, model: str) -> ModelLimiter:
+        """The limiter for a model."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limits = self.per_model.get(model, self.default)
+            limiter = ModelLimiter(model, limits)
+            self._limiters[model] = limiter
+        return limiter
+
+    async def acquire(self, model: str, estimated_tokens: int) -> Reservation:
+        """Wait for capacity for one call to `model`."""
+        return await self.for_model(model).acquire(estimated_tokens)
+
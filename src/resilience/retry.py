@@ -0,0 +1,71 @@
+"""
+Provider Retries
+
+Retry policy for transient provider errors: timeouts, connection
+failures, 429s and 5xx responses. Retries back off exponentially with
+full jitter, so clients that failed together do not retry together.
+Anything else (bad requests, validation errors) is not retried.
+"""
+
+import random
+from typing import Optional
+
+import openai
+
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_BASE_DELAY_S = 0.5
+DEFAULT_MAX_DELAY_S = 8.0
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for provider errors that may succeed if retried."""
+    if isinstance(error, openai.APIConnectionError):
+        # Includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after_s(error: BaseException) -> Optional[float]:
+    """The provider's Retry-After hint, in seconds, if it sent one."""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient provider errors."""
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        base_delay_s: float = DEFAULT_BASE_DELAY_S,
+        max_delay_s: float = DEFAULT_MAX_DELAY_S,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether a call that failed on `attempt` (0-based) is retried."""
+        return attempt + 1 < self.max_attempts and is_transient(error)
+
+    def backoff_s(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Delay before retrying after `attempt` (0-based): uniform in
+        [0, min(max_delay, base * 2^attempt)], but no shorter than the
+        provider's Retry-After.
+        """
+        ceiling = min(self.max_delay_s, self.base_delay_s * 2 ** attempt)
+        delay = random.uniform(0, ceiling)
+        retry_after = _retry_after_s(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay_s))
+        return delay
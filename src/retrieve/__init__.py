@@ -5,5 +5,12 @@ Simple retrieval of excerpts for hackathon demo.
 """
 
 from .simple import SimpleRetriever
+from .filters import ExcerptFilter, FilterIndex
+from .executor import RetrievalExecutor
 
-__all__ = ["SimpleRetriever"]
+__all__ = [
+    "SimpleRetriever",
+    "ExcerptFilter",
+    "FilterIndex",
+    "RetrievalExecutor",
+]
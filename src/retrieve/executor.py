@@ -0,0 +1,117 @@
+"""
+Retrieval Executor
+
+Async interface over synchronous retrievers so scoring never blocks
+the event loop. Cheap retrievers run inline; CPU-heavy ones run in a
+bounded thread pool, or a process pool for GIL-bound pure-Python work.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Literal, Optional
+
+from src.schemas.documents import ExcerptBlock
+from src.retrieve.filters import ExcerptFilter
+
+
+ExecutionMode = Literal["auto", "inline", "thread", "process"]
+
+# Retriever held by each process-pool worker (set by _init_worker)
+_worker_retriever: Any = None
+
+
+def _init_worker(retriever: Any) -> None:
+    """Process-pool initializer: pickle the retriever once per worker."""
+    global _worker_retriever
+    _worker_retriever = retriever
+
+
+def _retrieve_in_worker(
+    question: str,
+    excerpt_filter: Optional[ExcerptFilter],
+) -> Dict[str, List[ExcerptBlock]]:
+    """Run retrieval against the worker-local retriever."""
+    return _worker_retriever.retrieve(question, excerpt_filter)
+
+
+class RetrievalExecutor:
+    """
+    Runs a retriever's `retrieve()` off the event loop.
+
+    Retrievers advertise their cost via a `cpu_bound` attribute. In
+    "auto" mode, retrievers that are not cpu_bound (e.g. SimpleRetriever,
+    which only slices lists and ANDs bitmaps) take the inline fast path;
+    everything else goes to a bounded thread pool.
+    """
+
+    def __init__(
+        self,
+        retriever: Any,
+        mode: ExecutionMode = "auto",
+        max_workers: int = 4,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            retriever: Any object with retrieve(question, excerpt_filter)
+            mode: "auto", "inline", "thread" or "process"
+            max_workers: Pool size; also caps in-flight offloaded queries
+        """
+        self.retriever = retriever
+        self.max_workers = max_workers
+
+        if mode == "auto":
+            mode = "thread" if getattr(retriever, "cpu_bound", False) else "inline"
+        self.mode = mode
+
+        self._pool: Optional[Executor] = None
+        if mode == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="retrieval",
+            )
+        elif mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(retriever,),
+            )
+
+        # Bound queued work on the loop side instead of the pool's
+        # unbounded internal queue
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def retrieve(
+        self,
+        question: str,
+        excerpt_filter: Optional[ExcerptFilter] = None,
+    ) -> Dict[str, List[ExcerptBlock]]:
+        """
+        Retrieve excerpts without blocking the event loop.
+
+        Args:
+            question: The user's question
+            excerpt_filter: Optional metadata filter
+
+        Returns:
+            Dict mapping doc_type to list of excerpts
+        """
+        if self._pool is None:
+            return self.retriever.retrieve(question, excerpt_filter)
+
+        if self.mode == "process":
+            call = partial(_retrieve_in_worker, question, excerpt_filter)
+        else:
+            call = partial(self.retriever.retrieve, question, excerpt_filter)
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, call)
+
+    def shutdown(self) -> None:
+        """Release pool workers."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
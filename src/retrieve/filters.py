@@ -0,0 +1,244 @@
+"""
+Retrieval Filters
+
+Declarative excerpt filters backed by precomputed bitmaps.
+Each attribute value maps to a bitmap (a Python int) over excerpt
+positions; a filter is resolved by AND/OR-ing bitmaps before any
+scoring, so filtering never copies excerpt lists.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from src.schemas.documents import ExcerptBlock
+
+
+class ExcerptFilter(BaseModel):
+    """
+    Filter DSL for retrieval.
+
+    Fields are AND-ed together; values within a list field are OR-ed.
+    Unset fields do not constrain the result.
+
+    Example:
+        ExcerptFilter(customers=["K"], exclude_ids=["EVI-003"])
+    """
+    customers: Optional[List[str]] = Field(
+        default=None,
+        description="Keep excerpts whose metadata.customer is one of these"
+    )
+    doc_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Keep excerpts from these documents"
+    )
+    doc_types: Optional[List[str]] = Field(
+        default=None,
+        description="Keep excerpts of these doc types"
+    )
+    statuses: Optional[List[str]] = Field(
+        default=None,
+        description="Keep excerpts whose metadata.status is one of these"
+    )
+    date_from: Optional[str] = Field(
+        default=None,
+        description="Inclusive lower bound on metadata.date (YYYY-MM-DD)"
+    )
+    date_to: Optional[str] = Field(
+        default=None,
+        description="Inclusive upper bound on metadata.date (YYYY-MM-DD)"
+    )
+    exclude_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Excerpt IDs to drop"
+    )
+
+    def is_empty(self) -> bool:
+        """True if the filter does not constrain anything."""
+        return not self.model_dump(exclude_none=True)
+
+
+class FilterIndex:
+    """
+    Per-attribute bitmap index over an ordered list of excerpts.
+
+    Bit i of every bitmap refers to excerpts[i]. Built once per corpus;
+    resolving a filter is a handful of integer AND/OR operations.
+
+    Low-cardinality attributes (doc type, status) are materialised up
+    front. High-cardinality ones (document, customer) are materialised
+    on first use and kept in a bounded LRU, and excerpt IDs resolve
+    through a position map. Date ranges use prefix bitmaps over the
+    date-sorted positions at up to MAX_DATE_CHECKPOINTS boundaries, so
+    a range is prefix[hi] & ~prefix[lo] (plus a short edge when dates
+    outnumber checkpoints). Index size stays linear in the corpus
+    rather than one full-width bitmap per value.
+    """
+
+    # Attribute name -> how to read it from an excerpt
+    ATTRIBUTES = {
+        'doc_id': lambda e: e.doc_id,
+        'doc_type': lambda e: e.doc_type,
+        'customer': lambda e: e.metadata.get('customer'),
+        'status': lambda e: e.metadata.get('status'),
+    }
+
+    # Attributes whose bitmaps are built eagerly at index time; the
+    # rest grow with the corpus and are built on first use
+    EAGER = ('doc_type', 'status')
+
+    # Lazily built bitmaps kept per attribute (least recently used go)
+    MAX_CACHED_BITMAPS = 256
+
+    # Prefix bitmaps kept for date ranges; one per distinct date up to this
+    MAX_DATE_CHECKPOINTS = 128
+
+    def __init__(self, excerpts: Sequence[ExcerptBlock]):
+        """
+        Index every attribute value.
+
+        Args:
+            excerpts: Excerpts in a fixed order (bit positions)
+        """
+        self.size = len(excerpts)
+        self.all = (1 << self.size) - 1
+        self.positions: Dict[str, Dict[str, List[int]]] = {
+            attr: {} for attr in self.ATTRIBUTES
+        }
+        self.id_positions: Dict[str, int] = {}
+        self.bitmaps: Dict[str, Dict[str, int]] = {
+            attr: {} if attr in self.EAGER else OrderedDict()
+            for attr in self.ATTRIBUTES
+        }
+
+        dated: List[Tuple[str, int]] = []
+        for i, excerpt in enumerate(excerpts):
+            self.id_positions[excerpt.excerpt_id] = i
+            for attr, getter in self.ATTRIBUTES.items():
+                value = getter(excerpt)
+                if value is not None:
+                    self.positions[attr].setdefault(value, []).append(i)
+            date = excerpt.metadata.get('date')
+            if date:
+                dated.append((date, i))
+
+        for attr in self.EAGER:
+            for value in self.positions[attr]:
+                self._bitmap(attr, value)
+
+        # Date ranges: dated positions sorted by date, so any [lo, hi]
+        # range is one contiguous slice found by bisection, and prefix
+        # bitmaps at checkpoint indices into that order. Checkpoints sit
+        # on every date boundary while there are few enough distinct
+        # dates, so ranges need no edge; otherwise they are evenly spaced.
+        dated.sort()
+        self.dates: List[str] = [date for date, _ in dated]
+        self.date_positions: List[int] = [i for _, i in dated]
+        boundaries = [
+            j for j in range(len(self.dates))
+            if j == 0 or self.dates[j] != self.dates[j - 1]
+        ] + [len(self.dates)]
+        if len(boundaries) > self.MAX_DATE_CHECKPOINTS:
+            step = -(-len(self.dates) // (self.MAX_DATE_CHECKPOINTS - 1))
+            boundaries = list(range(0, len(self.dates), step)) + [len(self.dates)]
+        self.date_checkpoints: List[int] = boundaries
+        self.date_prefix: List[int] = [0]
+        for start, end in zip(boundaries, boundaries[1:]):
+            self.date_prefix.append(
+                self.date_prefix[-1] | self._from_positions(self.date_positions[start:end])
+            )
+
+    def _from_positions(self, positions: Sequence[int]) -> int:
+        """Build a bitmap from bit positions in O(size / 8)."""
+        buf = bytearray((self.size + 7) // 8)
+        for p in positions:
+            buf[p >> 3] |= 1 << (p & 7)
+        return int.from_bytes(buf, 'little')
+
+    def _bitmap(self, attr: str, value: str) -> int:
+        """Bitmap for one attribute value (memoized; lazy ones in an LRU)."""
+        bitmaps = self.bitmaps[attr]
+        bitmap = bitmaps.get(value)
+        if bitmap is not None:
+            if attr not in self.EAGER:
+                bitmaps.move_to_end(value)
+            return bitmap
+        positions = self.positions[attr].get(value)
+        bitmap = self._from_positions(positions) if positions else 0
+        bitmaps[value] = bitmap
+        if attr not in self.EAGER and len(bitmaps) > self.MAX_CACHED_BITMAPS:
+            bitmaps.popitem(last=False)
+        return bitmap
+
+    def _any_of(self, attr: str, values: Sequence[str]) -> int:
+        """OR of the bitmaps for the given attribute values."""
+        mask = 0
+        for value in values:
+            mask |= self._bitmap(attr, value)
+        return mask
+
+    def _ids(self, excerpt_ids: Sequence[str]) -> int:
+        """Bitmap of the given excerpt IDs."""
+        mask = 0
+        for excerpt_id in excerpt_ids:
+            position = self.id_positions.get(excerpt_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def _date_range(self, date_from: Optional[str], date_to: Optional[str]) -> int:
+        """Bitmap of dated excerpts within [date_from, date_to]."""
+        lo = bisect_left(self.dates, date_from) if date_from else 0
+        hi = bisect_right(self.dates, date_to) if date_to else len(self.dates)
+        if hi <= lo:
+            return 0
+        return self._date_prefix(hi) & ~self._date_prefix(lo)
+
+    def _date_prefix(self, index: int) -> int:
+        """Bitmap of the first `index` date-sorted positions."""
+        k = bisect_right(self.date_checkpoints, index) - 1
+        mask = self.date_prefix[k]
+        start = self.date_checkpoints[k]
+        if start < index:
+            mask |= self._from_positions(self.date_positions[start:index])
+        return mask
+
+    def mask(self, excerpt_filter: Optional[ExcerptFilter]) -> int:
+        """
+        Resolve a filter to a bitmap of matching excerpt positions.
+
+        Args:
+            excerpt_filter: Filter to apply (None matches everything)
+
+        Returns:
+            Integer bitmap; bit i set means excerpts[i] matches
+        """
+        mask = self.all
+        if excerpt_filter is None:
+            return mask
+
+        f = excerpt_filter
+        if f.customers is not None:
+            mask &= self._any_of('customer', f.customers)
+        if f.doc_ids is not None:
+            mask &= self._any_of('doc_id', f.doc_ids)
+        if f.doc_types is not None:
+            mask &= self._any_of('doc_type', f.doc_types)
+        if f.statuses is not None:
+            mask &= self._any_of('status', f.statuses)
+        if f.date_from is not None or f.date_to is not None:
+            mask &= self._date_range(f.date_from, f.date_to)
+        if f.exclude_ids:
+            mask &= ~self._ids(f.exclude_ids)
+
+        return mask
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield set bit positions of a bitmap, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -5,9 +5,10 @@ For hackathon: returns first N excerpts of each type.
 No ML, no embeddings, zero latency.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from src.schemas.documents import ExcerptBlock
+from src.retrieve.filters import ExcerptFilter, FilterIndex, iter_bits
 
 
 class SimpleRetriever:
@@ -17,6 +18,9 @@ class SimpleRetriever:
     For hackathon demo - graduate to embeddings in production.
     """
     
+    # Slicing and bitmap ANDs only: safe to run inline on the event loop
+    cpu_bound = False
+    
     def __init__(
         self,
         excerpts_by_type: Dict[str, List[ExcerptBlock]],
@@ -39,8 +43,25 @@ class SimpleRetriever:
             'contract': contract_limit,
             'evidence': evidence_limit,
         }
+        
+        # Bitmap index over all excerpts, built once per corpus
+        self._positions = [
+            excerpt
+            for excerpts in excerpts_by_type.values()
+            for excerpt in excerpts
+        ]
+        self.filter_index = FilterIndex(self._positions)
+        self._type_masks = {}
+        offset = 0
+        for doc_type, excerpts in excerpts_by_type.items():
+            self._type_masks[doc_type] = ((1 << len(excerpts)) - 1) << offset
+            offset += len(excerpts)
     
-    def retrieve(self, question: str) -> Dict[str, List[ExcerptBlock]]:
+    def retrieve(
+        self,
+        question: str,
+        excerpt_filter: Optional[ExcerptFilter] = None,
+    ) -> Dict[str, List[ExcerptBlock]]:
         """
         Retrieve relevant excerpts for a question.
         
@@ -49,21 +70,69 @@ class SimpleRetriever:
         
         Args:
             question: The user's question (currently unused)
+            excerpt_filter: Optional filter applied before selection
         
         Returns:
             Dict mapping doc_type to list of excerpts
         """
+        if excerpt_filter is None or excerpt_filter.is_empty():
+            result = {}
+            for doc_type, excerpts in self.excerpts_by_type.items():
+                limit = self.limits.get(doc_type, 2)
+                result[doc_type] = excerpts[:limit]
+            return result
+        
+        return self.select(excerpt_filter, limited=True)
+    
+    def select(
+        self,
+        excerpt_filter: Optional[ExcerptFilter] = None,
+        limited: bool = False,
+    ) -> Dict[str, List[ExcerptBlock]]:
+        """
+        Return excerpts matching a filter, grouped by doc type.
+        
+        Args:
+            excerpt_filter: Filter to apply (None matches everything)
+            limited: If True, apply the per-type retrieval limits
+        
+        Returns:
+            Dict mapping doc_type to matching excerpts, in corpus order
+        """
+        mask = self.filter_index.mask(excerpt_filter)
         result = {}
         
-        for doc_type, excerpts in self.excerpts_by_type.items():
-            limit = self.limits.get(doc_type, 2)
-            result[doc_type] = excerpts[:limit]
+        for doc_type, type_mask in self._type_masks.items():
+            limit = self.limits.get(doc_type, 2) if limited else None
+            selected = []
+            for position in iter_bits(mask & type_mask):
+                if limit is not None and len(selected) >= limit:
+                    break
+                selected.append(self._positions[position])
+            result[doc_type] = selected
         
         return result
     
-    def retrieve_flat(self, question: str) -> List[ExcerptBlock]:
+    def get_by_ids(self, excerpt_ids: List[str]) -> List[ExcerptBlock]:
+        """
+        Look up excerpts by ID.
+        
+        Raises:
+            KeyError: if any ID is not in the corpus
+        """
+        positions = self.filter_index.id_positions
+        unknown = [i for i in excerpt_ids if i not in positions]
+        if unknown:
+            raise KeyError(f"Unknown excerpt IDs: {unknown}")
+        return [self._positions[positions[i]] for i in excerpt_ids]
+    
+    def retrieve_flat(
+        self,
+        question: str,
+        excerpt_filter: Optional[ExcerptFilter] = None,
+    ) -> List[ExcerptBlock]:
         """Return all retrieved excerpts as a flat list."""
-        retrieved = self.retrieve(question)
+        retrieved = self.retrieve(question, excerpt_filter)
         return [
             excerpt
             for excerpts in retrieved.values()
@@ -87,12 +156,9 @@ class SimpleRetriever:
         
         for doc_type, excerpts in retrieved.items():
             if excerpts:
-                text_parts = []
-                for excerpt in excerpts:
-                    text_parts.append(
-                        f"{excerpt.cite_token}\n{excerpt.text}"
-                    )
-                formatted[doc_type] = "\n\n---\n\n".join(text_parts)
+                formatted[doc_type] = "\n\n---\n\n".join(
+                    excerpt.prompt_block for excerpt in excerpts
+                )
             else:
                 formatted[doc_type] = "(No excerpts available)"
         
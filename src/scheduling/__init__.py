@@ -0,0 +1,58 @@
+"""
+ProofGate Scheduling Package
+
+Admission control that bounds concurrent judgments and queues the
+rest by priority, an adaptive limit on concurrent provider calls,
+weighted fair queueing across tenants, and the scheduler that runs the
+agent graph.
+"""
+
+from .admission import (
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_MAX_QUEUE_WAIT_S,
+    PRIORITIES,
+    Admission,
+    AdmissionController,
+    AdmissionRejected,
+)
+from .concurrency import (
+    DEFAULT_INITIAL_LIMIT,
+    DEFAULT_MAX_LIMIT,
+    AdaptiveConcurrencyLimiter,
+)
+from .fair import (
+    DEFAULT_TENANT,
+    DeficitRoundRobin,
+    current_tenant,
+    tenant_scope,
+)
+from .dag import (
+    AgentGraph,
+    AgentNode,
+    GraphRun,
+    GraphScheduler,
+    NodeTiming,
+    critical_path,
+)
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENT",
+    "DEFAULT_MAX_QUEUE_WAIT_S",
+    "PRIORITIES",
+    "Admission",
+    "AdmissionController",
+    "AdmissionRejected",
+    "DEFAULT_INITIAL_LIMIT",
+    "DEFAULT_MAX_LIMIT",
+    "AdaptiveConcurrencyLimiter",
+    "DEFAULT_TENANT",
+    "DeficitRoundRobin",
+    "current_tenant",
+    "tenant_scope",
+    "AgentGraph",
+    "AgentNode",
+    "GraphRun",
+    "GraphScheduler",
+    "NodeTiming",
+    "critical_path",
+]
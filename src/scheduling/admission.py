@@ -0,0 +1,229 @@
+"""
+Admission Control
+
+Bounds how many judgments run at once. Each judgment fans out to
+several provider calls, so admitting every request in a burst only
+makes all of them slow together. Requests beyond the limit wait in a
+priority queue (interactive ahead of batch; within a priority, fair
+across tenants and FIFO within a tenant) and are shed with a retry
+hint once their wait would exceed a threshold.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from src.metrics import metrics
+from .fair import DEFAULT_TENANT, DeficitRoundRobin
+
+
+# Lower value is served first
+PRIORITIES = {
+    "interactive": 0,
+    "batch": 1,
+}
+
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_QUEUE_WAIT_S = 5.0
+
+# Weight of the newest sample in the service-time moving average
+SERVICE_TIME_ALPHA = 0.2
+
+ADMISSION_IN_FLIGHT = metrics.gauge(
+    "admission_in_flight",
+    "Judgments currently admitted and running",
+)
+ADMISSION_QUEUE_DEPTH = metrics.gauge(
+    "admission_queue_depth",
+    "Judgments waiting for admission, by priority",
+)
+ADMISSION_WAIT_SECONDS = metrics.histogram(
+    "admission_wait_seconds",
+    "Time judgments spent queued before admission, by priority",
+)
+ADMISSION_REJECTED = metrics.counter(
+    "admission_rejected_total",
+    "Judgments shed by admission control, by priority and reason",
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after_s: float):
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+        super().__init__(
+            f"Server busy ({reason}); retry after {retry_after_s:.0f}s"
+        )
+
+
+class Admission:
+    """A held slot. Releasing is idempotent."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._admitted_at = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        """Give the slot back (to the next waiter, if any)."""
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(time.monotonic() - self._admitted_at)
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a priority queue and load shedding.
+
+    A request waits at most max_queue_wait_s. One is shed up front when
+    the queue is full, or when the expected wait (from queue position
+    and the moving-average time a slot is held) already exceeds the
+    threshold, so it can retry elsewhere instead of timing out later.
+    Within a priority, tenants share slots by weighted deficit
+    round-robin (`tenant_weights`), so a tenant's queue position, and
+    whether it is shed, depends on its own backlog rather than on
+    everyone else's.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_queue_wait_s: float = DEFAULT_MAX_QUEUE_WAIT_S,
+        max_queue: Optional[int] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue_wait_s = max_queue_wait_s
+        self.max_queue = max_queue
+        self._in_flight = 0
+        # One fair queue per priority, in service order
+        self._queues: Dict[str, DeficitRoundRobin[asyncio.Future]] = {
+            priority: DeficitRoundRobin(f"admission_{priority}", tenant_weights)
+            for priority in sorted(PRIORITIES, key=PRIORITIES.get)
+        }
+        self._queued = 0
+        self._service_time_s: Optional[float] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Admitted requests still holding a slot."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot."""
+        return self._queued
+
+    def estimated_wait_s(self, position: Optional[int] = None) -> float:
+        """
+        Expected wait for a request at a queue position (default: the
+        back of the queue); 0 until a service time has been measured.
+        """
+        if self._service_time_s is None:
+            return 0.0
+        if position is None:
+            position = self._queued
+        return self._service_time_s * (position + 1) / self.max_concurrent
+
+    def retry_after_s(self) -> int:
+        """Whole seconds a shed client should wait before retrying."""
+        return max(1, math.ceil(self.estimated_wait_s() or self.max_queue_wait_s))
+
+    async def acquire(
+        self,
+        priority: str = "interactive",
+        tenant: str = DEFAULT_TENANT,
+    ) -> Admission:
+        """
+        Wait for a slot.
+
+        Raises:
+            ValueError: for an unknown priority
+            AdmissionRejected: if the request is shed
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        if self._in_flight < self.max_concurrent and not self._queued:
+            self._in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self._in_flight)
+            ADMISSION_WAIT_SECONDS.observe(0.0, priority=priority)
+            return Admission(self)
+
+        if self.max_queue is not None and self._queued >= self.max_queue:
+            self._reject(priority, "queue_full")
+        if self.estimated_wait_s(self._ahead_of(priority, tenant)) > self.max_queue_wait_s:
+            self._reject(priority, "estimated_wait")
+
+        queue = self._queues[priority]
+        waiter = asyncio.get_running_loop().create_future()
+        queue.push(tenant, waiter)
+        self._queued += 1
+        ADMISSION_QUEUE_DEPTH.inc(priority=priority)
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self.max_queue_wait_s):
+                await waiter
+        except TimeoutError:
+            # A slot handed over just as the timeout fired is still ours
+            if not (waiter.done() and not waiter.cancelled()):
+                self._reject(priority, "wait_exceeded")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(None)
+            raise
+        finally:
+            queue.remove(tenant, waiter)
+            waiter.cancel()
+            self._queued -= 1
+            ADMISSION_QUEUE_DEPTH.dec(priority=priority)
+
+        ADMISSION_WAIT_SECONDS.observe(time.monotonic() - started, priority=priority)
+        return Admission(self)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        priority: str = "interactive",
+        tenant: str = DEFAULT_TENANT,
+    ) -> AsyncIterator[Admission]:
+        """Hold a slot for the duration of the block."""
+        admission = await self.acquire(priority, tenant)
+        try:
+            yield admission
+        finally:
+            admission.release()
+
+    def _ahead_of(self, priority: str, tenant: str) -> int:
+        """Queued requests expected to be served before a new one."""
+        rank = PRIORITIES[priority]
+        return self._queues[priority].ahead_of(tenant) + sum(
+            len(queue) for other, queue in self._queues.items()
+            if PRIORITIES[other] < rank
+        )
+
+    def _reject(self, priority: str, reason: str) -> None:
+        ADMISSION_REJECTED.inc(priority=priority, reason=reason)
+        raise AdmissionRejected(reason, self.retry_after_s())
+
+    def _release(self, held_s: Optional[float]) -> None:
+        """Hand the slot to the first live waiter, or free it."""
+        if held_s is not None:
+            if self._service_time_s is None:
+                self._service_time_s = held_s
+            else:
+                self._service_time_s += SERVICE_TIME_ALPHA * (held_s - self._service_time_s)
+        for queue in self._queues.values():
+            while queue:
+                waiter = queue.pop()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self._in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
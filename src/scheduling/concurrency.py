@@ -0,0 +1,197 @@
+"""
+Adaptive Concurrency
+
+Latency-driven AIMD limit on concurrent provider calls. Provider
+performance drifts over the day, so no fixed cap stays right: too low
+wastes throughput, too high queues work at the provider and inflates
+tail latency. The limit grows by about one per window of calls while
+latency stays near its baseline, and is cut multiplicatively when
+latency rises well above it or calls fail. Calls waiting for a slot
+are served fairly across tenants (see fair.py).
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from src.metrics import metrics
+from .fair import DEFAULT_TENANT, DeficitRoundRobin
+
+
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MIN_LIMIT = 2
+DEFAULT_MAX_LIMIT = 64
+
+# Smoothed latency above tolerance * baseline counts as congestion
+DEFAULT_LATENCY_TOLERANCE = 2.0
+
+# Factor applied to the limit on congestion or error
+DEFAULT_BACKOFF = 0.7
+
+# Weight of the newest sample in the smoothed latency
+LATENCY_ALPHA = 0.2
+
+# Per-sample pull of the baseline toward slower samples, so it can
+# follow a provider that has become slower for good
+BASELINE_DRIFT = 0.001
+
+CONCURRENCY_LIMIT = metrics.gauge(
+    "adaptive_concurrency_limit",
+    "Current adaptive concurrency limit, by limiter",
+)
+CONCURRENCY_IN_FLIGHT = metrics.gauge(
+    "adaptive_concurrency_in_flight",
+    "Calls currently holding an adaptive concurrency slot, by limiter",
+)
+LATENCY_BASELINE = metrics.gauge(
+    "adaptive_latency_baseline_seconds",
+    "Uncongested call latency estimate, by limiter",
+)
+LATENCY_SMOOTHED = metrics.gauge(
+    "adaptive_latency_smoothed_seconds",
+    "Moving-average call latency, by limiter",
+)
+CONCURRENCY_DECREASES = metrics.counter(
+    "adaptive_concurrency_decreases_total",
+    "Times the adaptive limit was cut, by limiter and reason",
+)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit with per-tenant fair waiters.
+
+    Each successful call updates a smoothed latency and a baseline (the
+    fastest recent latency). While the smoothed latency is within
+    `latency_tolerance` of the baseline and the limit is actually in
+    use, the limit grows by 1/limit per call. Otherwise, or on a
+    failed call, it is multiplied by `backoff`, at most once per
+    smoothed-latency window so one slow burst is not punished twice.
+    Cancelled calls give their slot back without a sample. Freed slots
+    go to waiting calls by weighted deficit round-robin over tenants
+    (`tenant_weights`, default weight 1), FIFO within a tenant.
+    """
+
+    def __init__(
+        self,
+        name: str = "provider",
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        backoff: float = DEFAULT_BACKOFF,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min <= initial <= max")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be above 1")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.limit = float(initial_limit)
+        self.baseline_s: Optional[float] = None
+        self.smoothed_s: Optional[float] = None
+        self._in_flight = 0
+        self._waiters: DeficitRoundRobin[asyncio.Future] = DeficitRoundRobin(
+            name, tenant_weights
+        )
+        self._last_decrease = -math.inf
+        self._publish()
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, tenant: str = DEFAULT_TENANT) -> AsyncIterator[None]:
+        """Hold a slot for one call, feeding its latency or failure back."""
+        await self._acquire(tenant)
+        started = time.monotonic()
+        outcome = None
+        try:
+            yield
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self._release(outcome, time.monotonic() - started)
+
+    async def _acquire(self, tenant: str) -> None:
+        if self._in_flight < int(self.limit) and not self._waiters:
+            self._in_flight += 1
+            self._publish()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.push(tenant, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._release(None, 0.0)
+            else:
+                self._waiters.remove(tenant, waiter)
+            raise
+
+    def _release(self, outcome: Optional[str], latency_s: float) -> None:
+        in_use = self._in_flight
+        self._in_flight -= 1
+        if outcome == "ok":
+            self._on_latency(latency_s, in_use)
+        elif outcome == "error":
+            self._decrease("error")
+        self._wake()
+        self._publish()
+
+    def _on_latency(self, latency_s: float, in_use: int) -> None:
+        if self.smoothed_s is None:
+            self.smoothed_s = latency_s
+        else:
+            self.smoothed_s += LATENCY_ALPHA * (latency_s - self.smoothed_s)
+        if self.baseline_s is None or latency_s < self.baseline_s:
+            self.baseline_s = latency_s
+        else:
+            self.baseline_s += BASELINE_DRIFT * (latency_s - self.baseline_s)
+
+        if self.smoothed_s > self.latency_tolerance * self.baseline_s:
+            self._decrease("latency")
+        elif in_use >= self.limit / 2:
+            # Only grow a limit that is actually being used
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self.smoothed_s or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        CONCURRENCY_DECREASES.inc(limiter=self.name, reason=reason)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in fair order."""
+        while self._waiters and self._in_flight < int(self.limit):
+            waiter = self._waiters.pop()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _publish(self) -> None:
+        CONCURRENCY_LIMIT.set(self.limit, limiter=self.name)
+        CONCURRENCY_IN_FLIGHT.set(self._in_flight, limiter=self.name)
+        if self.baseline_s is not None:
+            LATENCY_BASELINE.set(self.baseline_s, limiter=self.name)
+            LATENCY_SMOOTHED.set(self.smoothed_s, limiter=self.name)
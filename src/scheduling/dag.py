@@ -0,0 +1,213 @@
+"""
+Agent Graph
+
+Declarative agent DAG and the scheduler that runs it. Each node names
+the agent to call, the document types it reads (which are also the
+only excerpts it may cite) and the nodes whose outputs it needs. The
+scheduler starts every node the moment its dependencies have finished,
+so independent agents always run in parallel, and reports when each
+node ran and which chain of nodes set the total time.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+
+@dataclass(frozen=True)
+class AgentNode:
+    """One agent in the graph."""
+    name: str
+    agent: Any
+    view: Tuple[str, ...]
+    depends_on: Tuple[str, ...] = ()
+    version: str = "v1"
+
+    @property
+    def output_type(self) -> type:
+        """Schema the node's output must validate against."""
+        return self.agent.output_type
+
+
+class NodeTiming(BaseModel):
+    """When a node ran, in ms since the run started."""
+    start_ms: int = Field(description="When the node was started")
+    end_ms: int = Field(description="When the node finished")
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+
+class AgentGraph:
+    """
+    Validated agent DAG.
+
+    Raises ValueError on duplicate names, unknown dependencies or
+    cycles, so a misdeclared graph fails at construction.
+    """
+
+    def __init__(self, nodes: Iterable[AgentNode]):
+        self.nodes: Dict[str, AgentNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate agent node: {node.name}")
+            self.nodes[node.name] = node
+        for node in self.nodes.values():
+            unknown = set(node.depends_on) - set(self.nodes)
+            if unknown:
+                raise ValueError(f"{node.name} depends on unknown nodes: {sorted(unknown)}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Node names with every node after its dependencies (declaration order otherwise)."""
+        order: List[str] = []
+        placed = set()
+        while len(order) < len(self.nodes):
+            ready = [
+                name for name, node in self.nodes.items()
+                if name not in placed and placed.issuperset(node.depends_on)
+            ]
+            if not ready:
+                cycle = sorted(set(self.nodes) - placed)
+                raise ValueError(f"Agent graph has a cycle among: {cycle}")
+            order.extend(ready)
+            placed.update(ready)
+        return order
+
+    def downstream(self, names: Iterable[str]) -> Set[str]:
+        """Nodes that depend on any of `names`, directly or transitively."""
+        affected = set(names)
+        dependents: Set[str] = set()
+        for name in self.order:
+            if affected.intersection(self.nodes[name].depends_on):
+                affected.add(name)
+                dependents.add(name)
+        return dependents
+
+    def with_agents(self, agents: Dict[str, Any]) -> "AgentGraph":
+        """The same graph with some nodes' agents swapped (e.g. another model)."""
+        return AgentGraph(
+            replace(node, agent=agents[name]) if name in agents else node
+            for name, node in self.nodes.items()
+        )
+
+
+def critical_path(graph: AgentGraph, timings: Dict[str, NodeTiming]) -> List[str]:
+    """
+    The chain of nodes that determined when the run finished.
+
+    Starts from the node that finished last and walks back through the
+    dependency that finished last, i.e. the one that gated each start.
+    """
+    if not timings:
+        return []
+    path = [max(timings, key=lambda name: timings[name].end_ms)]
+    while True:
+        deps = [d for d in graph.nodes[path[-1]].depends_on if d in timings]
+        if not deps:
+            return path[::-1]
+        path.append(max(deps, key=lambda name: timings[name].end_ms))
+
+
+class GraphRun(BaseModel):
+    """Outcome of running a graph."""
+    outputs: Dict[str, Any] = Field(description="Output by node, in graph order")
+    timings: Dict[str, NodeTiming] = Field(description="Timing of each node that ran")
+    skipped: List[str] = Field(description="Nodes cancelled or never started after a stop")
+    critical_path: List[str] = Field(description="Nodes that set the total time")
+
+
+NodeRunner = Callable[[AgentNode, Dict[str, Any]], Awaitable[Any]]
+
+
+class GraphScheduler:
+    """
+    Runs one graph with maximal parallelism.
+
+    `run_node(node, upstream)` is called with the outputs of the node's
+    dependencies as soon as they are all available. The first node to
+    fail cancels the rest and its error is raised. Nodes cancelled by
+    the scheduler are listed in `cancelled`, also after a failure.
+    """
+
+    def __init__(
+        self,
+        graph: AgentGraph,
+        run_node: NodeRunner,
+        origin: Optional[float] = None,
+    ):
+        self.graph = graph
+        self.run_node = run_node
+        self.origin = time.perf_counter() if origin is None else origin
+        self.cancelled: List[str] = []
+
+    def _ms(self) -> int:
+        return int((time.perf_counter() - self.origin) * 1000)
+
+    async def run(
+        self,
+        done: Optional[Dict[str, Any]] = None,
+        should_stop: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> GraphRun:
+        """
+        Run every node without a known output.
+
+        Args:
+            done: Outputs already known; those nodes are not run
+            should_stop: Checked with the outputs so far whenever a node
+                finishes; once True, running nodes are cancelled and no
+                more are started
+
+        Returns:
+            GraphRun with outputs, timings, skipped nodes and critical path
+        """
+        outputs = {
+            name: output for name, output in (done or {}).items()
+            if name in self.graph.nodes
+        }
+        timings: Dict[str, NodeTiming] = {}
+        started: Dict[str, int] = {}
+        running: Dict[asyncio.Task, str] = {}
+
+        def launch_ready() -> None:
+            for name in self.graph.order:
+                node = self.graph.nodes[name]
+                if name in outputs or name in started:
+                    continue
+                if all(dep in outputs for dep in node.depends_on):
+                    upstream = {dep: outputs[dep] for dep in node.depends_on}
+                    started[name] = self._ms()
+                    running[asyncio.create_task(self.run_node(node, upstream))] = name
+
+        stopped = should_stop is not None and should_stop(outputs)
+        try:
+            if not stopped:
+                launch_ready()
+            while running and not stopped:
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    name = running.pop(task)
+                    outputs[name] = task.result()
+                    timings[name] = NodeTiming(start_ms=started[name], end_ms=self._ms())
+                stopped = should_stop is not None and should_stop(outputs)
+                if not stopped:
+                    launch_ready()
+        finally:
+            for task, name in running.items():
+                if not task.done():
+                    task.cancel()
+                    self.cancelled.append(name)
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return GraphRun(
+            outputs={name: outputs[name] for name in self.graph.order if name in outputs},
+            timings=timings,
+            skipped=sorted(set(self.graph.nodes) - set(outputs)),
+            critical_path=critical_path(self.graph, timings),
+        )
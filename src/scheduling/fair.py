@@ -0,0 +1,177 @@
+"""
+Tenant Fairness
+
+Per-tenant queues served by weighted deficit round-robin. With a single
+FIFO, one tenant's 10,000-question batch fills the queue and every other
+tenant waits behind it. Here each tenant queues separately and, whenever
+a slot frees up, tenants take turns in proportion to their weights, so
+a tenant's share of slots (and so its wait) does not depend on how much
+work the others have queued.
+
+The tenant of the current judgment travels in a context variable, so
+the provider-call limiter deep inside the orchestrator sees it without
+threading it through every call.
+"""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Generic, Iterator, Optional, Tuple, TypeVar
+
+from src.metrics import metrics
+
+
+DEFAULT_TENANT = "default"
+DEFAULT_WEIGHT = 1.0
+
+FAIR_QUEUE_DEPTH = metrics.gauge(
+    "fair_queue_depth",
+    "Items waiting in a fair queue, by queue and tenant",
+)
+FAIR_QUEUE_WAIT_SECONDS = metrics.histogram(
+    "fair_queue_wait_seconds",
+    "Time spent waiting for a fairly scheduled slot, by queue and tenant",
+)
+
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=DEFAULT_TENANT)
+
+T = TypeVar("T")
+
+
+@contextmanager
+def tenant_scope(tenant: Optional[str]) -> Iterator[str]:
+    """Run the block (and tasks it creates) as `tenant`; None keeps the current one."""
+    if tenant is None:
+        yield current_tenant.get()
+        return
+    token = current_tenant.set(tenant)
+    try:
+        yield tenant
+    finally:
+        current_tenant.reset(token)
+
+
+class DeficitRoundRobin(Generic[T]):
+    """
+    Per-tenant FIFO queues with weighted deficit round-robin.
+
+    Every item costs one slot. Tenants with queued items take turns;
+    each turn adds the tenant's weight to its deficit, and it is served
+    while the deficit covers an item. A tenant with weight 2 thus gets
+    twice the slots of a tenant with weight 1 while both have work, and
+    an idle tenant's share goes to the busy ones.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = DEFAULT_WEIGHT,
+    ):
+        weights = dict(weights or {})
+        if default_weight <= 0 or any(w <= 0 for w in weights.values()):
+            raise ValueError("Tenant weights must be positive")
+        self.name = name
+        self.weights = weights
+        self.default_weight = default_weight
+        self._queues: Dict[str, Deque[Tuple[T, float]]] = {}
+        self._active: Deque[str] = deque()
+        self._deficit: Dict[str, float] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def weight(self, tenant: str) -> float:
+        """A tenant's share weight."""
+        return self.weights.get(tenant, self.default_weight)
+
+    def depth(self, tenant: str) -> int:
+        """Items a tenant has queued."""
+        return len(self._queues.get(tenant, ()))
+
+    def push(self, tenant: str, item: T) -> None:
+        """Queue an item at the back of its tenant's queue."""
+        queue = self._queues.setdefault(tenant, deque())
+        queue.append((item, time.monotonic()))
+        self._size += 1
+        if len(queue) == 1:
+            self._active.append(tenant)
+            self._deficit[tenant] = 0.0
+            if len(self._active) == 1:
+                self._deficit[tenant] = self.weight(tenant)
+        self._publish(tenant)
+
+    def pop(self) -> T:
+        """
+        The next item in fair order.
+
+        Raises:
+            IndexError: if nothing is queued
+        """
+        if not self._size:
+            raise IndexError("pop from an empty fair queue")
+        while True:
+            tenant = self._active[0]
+            if self._deficit[tenant] >= 1:
+                break
+            # Turn over: the next tenant earns its quantum
+            self._active.rotate(-1)
+            head = self._active[0]
+            self._deficit[head] += self.weight(head)
+        self._deficit[tenant] -= 1
+        item, queued_at = self._queues[tenant].popleft()
+        self._size -= 1
+        FAIR_QUEUE_WAIT_SECONDS.observe(
+            time.monotonic() - queued_at, queue=self.name, tenant=tenant
+        )
+        if not self._queues[tenant]:
+            self._deactivate(tenant)
+        self._publish(tenant)
+        return item
+
+    def remove(self, tenant: str, item: T) -> bool:
+        """Drop a queued item (e.g. a cancelled waiter); False if absent."""
+        queue = self._queues.get(tenant)
+        if not queue:
+            return False
+        for entry in queue:
+            if entry[0] is item:
+                queue.remove(entry)
+                break
+        else:
+            return False
+        self._size -= 1
+        if not queue:
+            self._deactivate(tenant)
+        self._publish(tenant)
+        return True
+
+    def ahead_of(self, tenant: str) -> int:
+        """
+        Items expected to be served before a new item from `tenant`:
+        its own queue, plus each other tenant's items up to what its
+        weight earns in the turns that takes.
+        """
+        own = self.depth(tenant)
+        turns = (own + 1) / self.weight(tenant)
+        return own + sum(
+            min(len(queue), math.ceil(turns * self.weight(other)))
+            for other, queue in self._queues.items()
+            if other != tenant
+        )
+
+    def _deactivate(self, tenant: str) -> None:
+        """Take an emptied tenant out of the rotation; its deficit is forfeit."""
+        was_head = self._active[0] == tenant
+        self._active.remove(tenant)
+        del self._deficit[tenant]
+        del self._queues[tenant]
+        if was_head and self._active:
+            head = self._active[0]
+            self._deficit[head] += self.weight(head)
+
+    def _publish(self, tenant: str) -> None:
+        FAIR_QUEUE_DEPTH.set(self.depth(tenant), queue=self.name, tenant=tenant)
@@ -9,6 +9,9 @@ from .agents import (
     RiskAgentOutput,
     EvidenceAgentOutput,
     FinalVerdict,
+    PackedPolicyAgentOutput,
+    PackedRiskAgentOutput,
+    PackedEvidenceAgentOutput,
 )
 from .documents import (
     Document,
@@ -21,6 +24,9 @@ __all__ = [
     "RiskAgentOutput",
     "EvidenceAgentOutput",
     "FinalVerdict",
+    "PackedPolicyAgentOutput",
+    "PackedRiskAgentOutput",
+    "PackedEvidenceAgentOutput",
     "Document",
     "ExcerptBlock",
     "RunTrace",
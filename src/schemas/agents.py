@@ -117,3 +117,49 @@ class FinalVerdict(BaseModel):
     rule_applied: str = Field(
         description="Which deterministic rule fired (e.g., 'RULE_2: Evidence Missing')"
     )
+
+
+# Packed outputs: one agent call answering several questions over the
+# same excerpts. Each answer is the single-question output plus the
+# index of the question it answers.
+
+class PackedPolicyAnswer(PolicyAgentOutput):
+    """Policy Agent answer to one question of a packed call."""
+    question_index: int = Field(
+        description="Index of the question answered, as numbered in QUESTIONS"
+    )
+
+
+class PackedRiskAnswer(RiskAgentOutput):
+    """Risk Agent answer to one question of a packed call."""
+    question_index: int = Field(
+        description="Index of the question answered, as numbered in QUESTIONS"
+    )
+
+
+class PackedEvidenceAnswer(EvidenceAgentOutput):
+    """Evidence Agent answer to one question of a packed call."""
+    question_index: int = Field(
+        description="Index of the question answered, as numbered in QUESTIONS"
+    )
+
+
+class PackedPolicyAgentOutput(BaseModel):
+    """Output from a packed Policy Agent call: one answer per question."""
+    answers: List[PackedPolicyAnswer] = Field(
+        description="Exactly one answer for every question"
+    )
+
+
+class PackedRiskAgentOutput(BaseModel):
+    """Output from a packed Risk Agent call: one answer per question."""
+    answers: List[PackedRiskAnswer] = Field(
+        description="Exactly one answer for every question"
+    )
+
+
+class PackedEvidenceAgentOutput(BaseModel):
+    """Output from a packed Evidence Agent call: one answer per question."""
+    answers: List[PackedEvidenceAnswer] = Field(
+        description="Exactly one answer for every question"
+    )
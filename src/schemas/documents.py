@@ -4,10 +4,13 @@ Document and Trace Schemas
 Pydantic models for documents, excerpts, and run traces.
 """
 
-from typing import Literal, List, Dict, Optional
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import Any, Literal, List, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
 import hashlib
 
+from src.tokens import estimate_tokens
+
 
 class Document(BaseModel):
     """A source document (policy, contract, or evidence)."""
@@ -34,7 +37,13 @@ class ExcerptBlock(BaseModel):
     
     Excerpts are the atomic units that agents can cite.
     Example: [CITE=POL-004] indicates excerpt POL-004.
+    
+    Frozen, so values derived from the fields (prompt_block,
+    token_count) can be memoized on the instance; model_copy(update=...)
+    drops them.
     """
+    model_config = ConfigDict(frozen=True)
+    
     excerpt_id: str = Field(
         description="Stable excerpt ID (e.g., POL-004, CON-002, EVI-001)"
     )
@@ -46,17 +55,55 @@ class ExcerptBlock(BaseModel):
         description="Type inherited from parent document"
     )
     text: str = Field(description="Excerpt content text")
+    metadata: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Filterable attributes (e.g., customer, date, status)"
+    )
     
     @classmethod
-    def create(cls, excerpt_id: str, doc_id: str, doc_type: str, text: str) -> "ExcerptBlock":
+    def create(
+        cls,
+        excerpt_id: str,
+        doc_id: str,
+        doc_type: str,
+        text: str,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> "ExcerptBlock":
         """Factory method to create an excerpt with proper cite token."""
         return cls(
             excerpt_id=excerpt_id,
             cite_token=f"[CITE={excerpt_id}]",
             doc_id=doc_id,
             doc_type=doc_type,
-            text=text
+            text=text,
+            metadata=metadata or {},
         )
+    
+    @cached_property
+    def prompt_block(self) -> str:
+        """
+        Rendered prompt block: cite token, newline, text.
+        
+        Computed once per excerpt instance. Excerpts are rebuilt when the
+        corpus is reloaded, so the cache lives exactly as long as the
+        corpus version it was rendered from.
+        """
+        return f"{self.cite_token}\n{self.text}"
+    
+    @cached_property
+    def token_count(self) -> int:
+        """Estimated token count of the prompt block, summed for rate-limit estimates."""
+        return estimate_tokens(self.prompt_block)
+    
+    def model_copy(
+        self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "ExcerptBlock":
+        """Copy the excerpt; memoized values are re-derived if fields change."""
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            for name in ("prompt_block", "token_count"):
+                copy.__dict__.pop(name, None)
+        return copy
 
 
 class RunTrace(BaseModel):
@@ -96,6 +143,78 @@ class RunTrace(BaseModel):
         default=None,
         description="Total pipeline latency in milliseconds"
     )
+    agent_latency_ms: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-agent latency in milliseconds"
+    )
+    agent_usage: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description=(
+            "Per-agent provider token usage (input_tokens, cached_tokens, "
+            "output_tokens) summed over retries"
+        )
+    )
+    skipped_agents: List[str] = Field(
+        default_factory=list,
+        description="Agents cancelled or not started because the verdict was already determined"
+    )
+    agent_cache_hits: List[str] = Field(
+        default_factory=list,
+        description="Agents whose output was reused from the per-agent cache"
+    )
+    hedge_wins: List[str] = Field(
+        default_factory=list,
+        description="Agents whose hedged duplicate call answered first"
+    )
+    agent_models: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Model each called agent's final output came from"
+    )
+    escalations: Dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "Cascade mode: agents re-run on the strong model, with the "
+            "reason (invalid_citations, borderline or disagreement)"
+        )
+    )
+    node_timings: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description=(
+            "Agent graph: start_ms and end_ms of each node that ran, in ms "
+            "since the run started"
+        )
+    )
+    critical_path: List[str] = Field(
+        default_factory=list,
+        description="Agent graph: the chain of nodes that set the agents stage's duration"
+    )
+    reused_agents: List[str] = Field(
+        default_factory=list,
+        description=(
+            "Agents whose output was supplied rather than called: carried "
+            "over from the re-judged run, or answered by a packed batch call"
+        )
+    )
+    rejudged_from: Optional[str] = Field(
+        default=None,
+        description="run_id of the run this one re-judged after an evidence change"
+    )
+    batch_id: Optional[str] = Field(
+        default=None,
+        description="Batch this run was packed in (see run_batch); None if run alone"
+    )
+    tenant: str = Field(
+        default="default",
+        description="Tenant the run was fairly scheduled as"
+    )
+    coalesced: bool = Field(
+        default=False,
+        description="True if this run shared an identical in-flight run's result"
+    )
+    coalesced_from: Optional[str] = Field(
+        default=None,
+        description="run_id of the run whose result was shared"
+    )
     
     @staticmethod
     def compute_input_hash(
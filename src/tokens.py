@@ -0,0 +1,23 @@
+"""
+Token Estimation
+
+Cheap, dependency-free token estimates for prompt budgeting.
+"""
+
+import math
+
+
+# Average characters per token for English prose on OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a string.
+    
+    Uses the ~4 characters/token rule of thumb. Good enough for
+    budgeting and rate limiting; not an exact tokenizer count.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
@@ -23,6 +23,8 @@ class TraceStore:
     - Deterministic replay: same inputs → same outputs
     - Audit trail: every run is logged with hashes
     - Caching: skip re-computation for identical inputs
+    - Per-agent caching: reuse an agent's output when its own input
+      is unchanged, even if the run as a whole differs
     """
     
     def __init__(self, db_path: Path = None):
@@ -57,6 +59,17 @@ class TraceStore:
                 CREATE INDEX IF NOT EXISTS idx_input_hash 
                 ON traces(input_hash)
             """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS agent_outputs (
+                    cache_key TEXT PRIMARY KEY,
+                    agent TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    context_hash TEXT NOT NULL,
+                    output_json TEXT NOT NULL,
+                    timestamp TEXT NOT NULL
+                )
+            """)
             await db.commit()
     
     @staticmethod
@@ -77,6 +90,27 @@ class TraceStore:
         payload = f"{question}|{sorted_excerpts}|{sorted_prompts}"
         return hashlib.sha256(payload.encode()).hexdigest()
     
+    @staticmethod
+    def compute_context_hash(context: str) -> str:
+        """Hash of an agent's exact rendered input."""
+        return hashlib.sha256(context.encode()).hexdigest()
+    
+    @staticmethod
+    def compute_agent_cache_key(
+        agent: str,
+        prompt_version: str,
+        model: str,
+        context_hash: str,
+    ) -> str:
+        """
+        Compute the per-agent cache key.
+        
+        An agent's output can be reused only if its prompt, model and
+        rendered context are all unchanged.
+        """
+        payload = f"{agent}|{prompt_version}|{model}|{context_hash}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
     @staticmethod
     def compute_output_hash(output: Any) -> str:
         """Compute hash of an output for verification."""
@@ -94,6 +128,10 @@ class TraceStore:
         """
         Check if we have a cached result for this input hash.
         
+        Short-circuited runs (any skipped_agents) are never replayed:
+        they lack the skipped agents' outputs and citations, so the same
+        input must still be answered by a full run.
+        
         Returns:
             Cached result dict if found, None otherwise
         """
@@ -102,12 +140,79 @@ class TraceStore:
             async with db.execute(
                 "SELECT result_json FROM traces WHERE input_hash = ?",
                 (input_hash,)
+            ) as cursor:
+                async for row in cursor:
+                    if not row['result_json']:
+                        continue
+                    result = json.loads(row['result_json'])
+                    if not result.get('trace', {}).get('skipped_agents'):
+                        return result
+        return None
+    
+    async def get_result(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored result of a run.
+        
+        Returns:
+            Result dict if the run was stored with one, None otherwise
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                "SELECT result_json FROM traces WHERE run_id = ?",
+                (run_id,)
             ) as cursor:
                 row = await cursor.fetchone()
-                if row and row['result_json']:
-                    return json.loads(row['result_json'])
+                if row and row[0]:
+                    return json.loads(row[0])
         return None
     
+    async def get_agent_output(
+        self,
+        cache_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached agent output.
+        
+        Returns:
+            The stored output dict if found, None otherwise
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                "SELECT output_json FROM agent_outputs WHERE cache_key = ?",
+                (cache_key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                if row:
+                    return json.loads(row[0])
+        return None
+    
+    async def store_agent_output(
+        self,
+        cache_key: str,
+        agent: str,
+        prompt_version: str,
+        model: str,
+        context_hash: str,
+        output: BaseModel,
+    ) -> None:
+        """Store a validated agent output under its cache key."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT OR REPLACE INTO agent_outputs
+                (cache_key, agent, prompt_version, model, context_hash,
+                 output_json, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                cache_key,
+                agent,
+                prompt_version,
+                model,
+                context_hash,
+                json.dumps(output.model_dump()),
+                datetime.now(tz=None).isoformat(),
+            ))
+            await db.commit()
+    
     async def store_trace(
         self,
         trace: RunTrace,
@@ -142,6 +247,32 @@ class TraceStore:
             ))
             await db.commit()
     
+    @staticmethod
+    def _row_to_trace(row) -> RunTrace:
+        """
+        Build a RunTrace from a traces row.
+        
+        Indexed columns are authoritative; fields without their own
+        column (e.g. agent_latency_ms) come from the stored result.
+        """
+        stored = {}
+        if row['result_json']:
+            stored = json.loads(row['result_json']).get('trace', {})
+        
+        return RunTrace(**{
+            **stored,
+            'run_id': row['run_id'],
+            'input_hash': row['input_hash'],
+            'question': row['question'],
+            'excerpt_ids': json.loads(row['excerpt_ids']),
+            'prompt_versions': json.loads(row['prompt_versions']),
+            'agent_output_hashes': json.loads(row['agent_output_hashes'] or '{}'),
+            'final_output_hash': row['final_output_hash'] or '',
+            'replayed': bool(row['replayed']),
+            'timestamp': row['timestamp'],
+            'latency_ms': row['latency_ms'],
+        })
+    
     async def get_trace(self, run_id: str) -> Optional[RunTrace]:
         """Get a trace by run ID."""
         async with aiosqlite.connect(self.db_path) as db:
@@ -152,20 +283,7 @@ class TraceStore:
             ) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return RunTrace(
-                        run_id=row['run_id'],
-                        input_hash=row['input_hash'],
-                        question=row['question'],
-                        excerpt_ids=json.loads(row['excerpt_ids']),
-                        prompt_versions=json.loads(row['prompt_versions']),
-                        agent_output_hashes=json.loads(
-                            row['agent_output_hashes'] or '{}'
-                        ),
-                        final_output_hash=row['final_output_hash'] or '',
-                        replayed=bool(row['replayed']),
-                        timestamp=row['timestamp'],
-                        latency_ms=row['latency_ms'],
-                    )
+                    return self._row_to_trace(row)
         return None
     
     async def list_traces(
@@ -181,18 +299,5 @@ class TraceStore:
                 (limit,)
             ) as cursor:
                 async for row in cursor:
-                    traces.append(RunTrace(
-                        run_id=row['run_id'],
-                        input_hash=row['input_hash'],
-                        question=row['question'],
-                        excerpt_ids=json.loads(row['excerpt_ids']),
-                        prompt_versions=json.loads(row['prompt_versions']),
-                        agent_output_hashes=json.loads(
-                            row['agent_output_hashes'] or '{}'
-                        ),
-                        final_output_hash=row['final_output_hash'] or '',
-                        replayed=bool(row['replayed']),
-                        timestamp=row['timestamp'],
-                        latency_ms=row['latency_ms'],
-                    ))
+                    traces.append(self._row_to_trace(row))
         return traces
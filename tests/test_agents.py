@@ -4,6 +4,7 @@ Unit Tests for Agent Definitions
 Tests for agent creation and prompt loading.
 """
 
+import asyncio
 import pytest
 import os
 from pathlib import Path
@@ -14,6 +15,7 @@ from src.agents.definitions import (
     create_risk_agent,
     create_evidence_agent,
     create_judge_agent,
+    create_packed_agent,
     get_prompt_versions,
     _load_prompt,
     PROMPTS_DIR,
@@ -23,6 +25,7 @@ from src.schemas.agents import (
     RiskAgentOutput,
     EvidenceAgentOutput,
     FinalVerdict,
+    PackedRiskAgentOutput,
 )
 
 
@@ -68,6 +71,17 @@ class TestAgentCreation:
         """Test judge agent has correct output type."""
         agent = create_judge_agent()
         assert agent.output_type == FinalVerdict
+    
+    def test_create_packed_agent(self):
+        """Test packed agent keeps model and instructions, with a list output."""
+        risk = create_risk_agent(model="gpt-4o-mini")
+        packed = create_packed_agent(risk)
+        
+        assert packed.name == "RiskAgentPacked"
+        assert packed.output_type == PackedRiskAgentOutput
+        assert packed.model == "gpt-4o-mini"
+        assert packed.instructions.startswith(risk.instructions)
+        assert "question_index" in packed.instructions
 
 
 class TestAgentConfiguration:
@@ -113,6 +127,11 @@ class TestPromptLoading:
         prompt_file = PROMPTS_DIR / "policy_agent_v1.txt"
         assert prompt_file.exists()
     
+    def test_policy_v2_prompt_exists(self):
+        """Test that the current policy agent prompt file exists."""
+        prompt_file = PROMPTS_DIR / "policy_agent_v2.txt"
+        assert prompt_file.exists()
+    
     def test_risk_prompt_exists(self):
         """Test that risk agent prompt file exists."""
         prompt_file = PROMPTS_DIR / "risk_agent_v1.txt"
@@ -167,3 +186,116 @@ class TestPromptVersions:
         versions1 = get_prompt_versions()
         versions2 = get_prompt_versions()
         assert versions1 == versions2
+    
+    def test_get_prompt_versions_tags_models(self):
+        """Test that agents given a model carry it in their version."""
+        versions = get_prompt_versions({"policy": "gpt-4o-mini>gpt-4o"})
+        assert versions["policy"] == "v2@gpt-4o-mini>gpt-4o"
+        assert versions["risk"] == "v1"
+
+
+class TestProviderClient:
+    """Tests for the shared, pooled provider client."""
+    
+    @pytest.fixture
+    async def stub(self):
+        """Local keep-alive stub provider."""
+        from benchmarks.provider_pool import StubProvider
+        
+        server = StubProvider(connect_delay_s=0)
+        await server.start()
+        yield server
+        await server.stop()
+    
+    def test_from_env_without_key_is_none(self):
+        """Test that no client is built without an API key."""
+        from src.agents import ProviderClient
+        
+        with patch.dict(os.environ, {}, clear=True):
+            assert ProviderClient.from_env() is None
+    
+    def test_from_env_reads_pool_limits(self):
+        """Test that pool settings come from PROVIDER_* env vars."""
+        from src.agents import ProviderClient
+        
+        env = {
+            "OPENAI_API_KEY": "test",
+            "PROVIDER_MAX_CONNECTIONS": "8",
+            "PROVIDER_MAX_KEEPALIVE": "2",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            client = ProviderClient.from_env()
+        
+        pool = client.transport._pool
+        assert pool._max_connections == 8
+        assert pool._max_keepalive_connections == 2
+        assert client.openai.max_retries == 0
+    
+    @pytest.mark.asyncio
+    async def test_sequential_calls_reuse_one_connection(self, stub):
+        """Test that calls through the client share a kept-alive connection."""
+        from src.agents import ProviderClient
+        
+        client = ProviderClient(api_key="test", base_url=stub.base_url)
+        for _ in range(3):
+            await client.openai.models.list()
+        await client.aclose()
+        
+        assert stub.requests == 3
+        assert stub.connections == 1
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections(self, stub):
+        """Test that prewarming leaves connections ready in the pool."""
+        from src.agents import ProviderClient
+        from src.agents.client import POOL_CONNECTIONS, POOL_CONNECTIONS_OPENED
+        
+        opened = POOL_CONNECTIONS_OPENED.value()
+        client = ProviderClient(api_key="test", base_url=stub.base_url)
+        held = await client.prewarm(3)
+        await asyncio.gather(*(client.openai.models.list() for _ in range(3)))
+        await client.aclose()
+        
+        assert held == 3
+        assert stub.connections == 3
+        assert POOL_CONNECTIONS_OPENED.value() - opened == 3
+        assert POOL_CONNECTIONS.value(state="active") == 0
+    
+    @pytest.mark.asyncio
+    async def test_short_lived_connections_counted(self, stub):
+        """Test that connections closed before any scrape are still counted."""
+        from src.agents import ProviderClient
+        
+        # No keep-alive: every connection is dropped after its request
+        client = ProviderClient(api_key="test", base_url=stub.base_url, max_keepalive=0)
+        for _ in range(3):
+            await client.openai.models.list()
+        
+        assert client.transport.opened == 3
+        assert client.transport.connections == 0
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_requests_survive_missing_pool_internals(self, stub):
+        """Test that losing access to httpx's pool only silences the gauges."""
+        from src.agents import ProviderClient
+        
+        client = ProviderClient(api_key="test", base_url=stub.base_url)
+        with patch.object(type(client.transport), "_pool_connections", return_value=None):
+            await client.openai.models.list()
+            assert client.transport.connections == 0
+        await client.aclose()
+        
+        assert client.transport.opened == 1
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_gives_up_after_timeout(self):
+        """Test that an unreachable provider does not hold up prewarming."""
+        from src.agents import ProviderClient
+        
+        # Non-routable address: connects hang until the timeout
+        client = ProviderClient(api_key="test", base_url="http://10.255.255.1/v1")
+        held = await client.prewarm(2, timeout_s=0.05)
+        await client.aclose()
+        
+        assert held == 0
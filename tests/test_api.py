@@ -4,11 +4,28 @@ Unit Tests for API Endpoints
 Tests for the FastAPI API layer.
 """
 
+import asyncio
+
 import pytest
+from fastapi import HTTPException
 from unittest.mock import AsyncMock, patch, MagicMock
 from httpx import AsyncClient, ASGITransport
 
-from src.api.main import app
+from src.api.main import (
+    app,
+    _build_filter,
+    run_judgment,
+    JudgeRequest,
+    JUDGMENTS_ABORTED,
+    DEADLINE_HEADER,
+    _request_deadline,
+    _run_job,
+)
+from src.orchestrator import ProofGateOrchestrator
+from src.resilience import DeadlineExceeded
+from src.scheduling import AdmissionController
+from src.jobs import JobQueue
+from src.retrieve import ExcerptFilter
 from src.schemas.agents import FinalVerdict
 
 
@@ -193,6 +210,65 @@ class TestTracesEndpoint:
             response = await client.get("/api/traces/nonexistent-run-id")
         
         assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_coalesced_run_trace_fetchable(self, tmp_path):
+        """Test that a run that joined an identical in-flight run has its own trace."""
+        from src.schemas.agents import (
+            EvidenceAgentOutput,
+            PolicyAgentOutput,
+            RiskAgentOutput,
+        )
+        from src.schemas.documents import ExcerptBlock
+        
+        excerpts = {
+            'policy': [ExcerptBlock.create("POL-001", "policy1", "policy", "Policy")],
+            'contract': [],
+            'evidence': [ExcerptBlock.create("EVI-001", "evidence1", "evidence", "Evidence")],
+        }
+        
+        async def run(agent, input, run_config=None):
+            await asyncio.sleep(0.05)
+            result = MagicMock()
+            result.final_output = {
+                "PolicyAgent": PolicyAgentOutput(
+                    stance="YES", rationale="Ok.", citations=["POL-001"]
+                ),
+                "RiskAgent": RiskAgentOutput(stance="YES", rationale="Ok."),
+                "EvidenceAgent": EvidenceAgentOutput(
+                    stance="SUFFICIENT", rationale="Ok.", citations=["EVI-001"]
+                ) if "EVI-001" in input else EvidenceAgentOutput(
+                    stance="MISSING", rationale="None."
+                ),
+            }[agent.name]
+            return result
+        
+        with patch('src.orchestrator.Runner') as MockRunner, \
+                patch('src.api.main._get_orchestrator') as mock_get_orch:
+            MockRunner.run = run
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            mock_get_orch.return_value = orchestrator
+            results = await asyncio.gather(
+                orchestrator.run("Test?", excerpts),
+                orchestrator.run("Test?", excerpts),
+            )
+            (joiner,) = [r for r in results if r['trace']['coalesced']]
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                trace = await client.get(f"/api/traces/{joiner['run_id']}")
+                rejudged = await client.post(
+                    "/api/rejudge",
+                    json={"run_id": joiner['run_id'], "remove_excerpt_ids": ["EVI-001"]},
+                )
+        
+        assert trace.status_code == 200
+        assert trace.json()["coalesced_from"] == joiner['trace']['coalesced_from']
+        assert rejudged.status_code == 200
+        assert rejudged.json()["trace"]["rejudged_from"] == joiner['run_id']
 
 
 class TestJudgeEndpointValidation:
@@ -289,3 +365,434 @@ class TestRetrieverBehavior:
         
         evidence_ids = [e["excerpt_id"] for e in data["excerpts"]["evidence"]]
         assert "EVI-003" in evidence_ids
+
+
+class TestBuildFilter:
+    """Tests for combining request filters with the acceptance toggle."""
+    
+    def test_acceptance_excluded_by_default(self):
+        """Test that EVI-003 is excluded unless requested."""
+        assert _build_filter().exclude_ids == ["EVI-003"]
+        assert not _build_filter(include_acceptance=True).exclude_ids
+    
+    def test_request_filters_preserved(self):
+        """Test that request filters are merged, not replaced."""
+        request_filter = ExcerptFilter(customers=["K"], exclude_ids=["EVI-001"])
+        combined = _build_filter(filters=request_filter)
+        
+        assert combined.customers == ["K"]
+        assert combined.exclude_ids == ["EVI-001", "EVI-003"]
+        # Caller's filter is not mutated
+        assert request_filter.exclude_ids == ["EVI-001"]
+
+
+class TestJudgeStreamEndpoint:
+    """Tests for the server-sent-events judgment endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_emits_sse_events(self):
+        """Test that each orchestrator event becomes an SSE frame."""
+        async def fake_stream(question, excerpts, **kwargs):
+            yield "agent", {"agent": "risk", "output": {"stance": "NO"}, "latency_ms": 5}
+            yield "verdict", {"verdict": "REJECT"}
+            yield "trace", {"run_id": "abc", "trace": {}, "excerpts_used": [], "error": None}
+        
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run_stream = fake_stream
+            mock_get_orch.return_value = mock_orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/judge/stream",
+                    json={"question": "Can we recognize revenue?"}
+                )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in response.text.split("\n\n") if f]
+        assert frames[0].startswith("event: agent\ndata: ")
+        assert '"agent": "risk"' in frames[0]
+        assert frames[1].startswith("event: verdict")
+        assert frames[2].startswith("event: trace")
+    
+    @pytest.mark.asyncio
+    async def test_stream_reports_pipeline_errors(self):
+        """Test that a raising pipeline yields an error event."""
+        async def failing_stream(question, excerpts, **kwargs):
+            raise RuntimeError("boom")
+            yield  # pragma: no cover
+        
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run_stream = failing_stream
+            mock_get_orch.return_value = mock_orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/judge/stream",
+                    json={"question": "Q"}
+                )
+        
+        assert "event: error" in response.text
+        assert "boom" in response.text
+
+
+class TestClientDisconnect:
+    """Tests for aborting a judgment when the client goes away."""
+    
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_run(self):
+        """Test that a disconnected client cancels the pipeline."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+        
+        async def slow_run(question, excerpts, **kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        http_request = MagicMock()
+        http_request.headers = {}
+        http_request.is_disconnected = AsyncMock(side_effect=[False, True])
+        before = JUDGMENTS_ABORTED.value(reason="client_disconnect")
+        
+        with patch('src.api.main._get_orchestrator') as mock_get_orch, \
+             patch('src.api.main._retrieve_for', AsyncMock(return_value={})), \
+             patch('src.api.main.DISCONNECT_POLL_S', 0.01):
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run = slow_run
+            mock_get_orch.return_value = mock_orchestrator
+            
+            with pytest.raises(HTTPException) as exc_info:
+                await asyncio.wait_for(
+                    run_judgment(JudgeRequest(question="Q"), http_request),
+                    timeout=2,
+                )
+        
+        assert exc_info.value.status_code == 499
+        assert started.is_set() and cancelled.is_set()
+        assert JUDGMENTS_ABORTED.value(reason="client_disconnect") == before + 1
+
+
+class TestMetricsEndpoint:
+    """Tests for the metrics snapshot endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_metrics_snapshot(self):
+        """Test that registered metrics are exported."""
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test"
+        ) as client:
+            response = await client.get("/api/metrics")
+        
+        assert response.status_code == 200
+        metrics = response.json()["metrics"]
+        assert metrics["judgments_aborted_total"]["type"] == "counter"
+        assert "agent_calls_cancelled_total" in metrics
+
+
+class TestRequestDeadline:
+    """Tests for request deadlines set by header or config."""
+    
+    def _request(self, headers):
+        http_request = MagicMock()
+        http_request.headers = headers
+        return http_request
+    
+    def test_header_tightens_deadline(self):
+        """Test that a client deadline shorter than the limit is used."""
+        deadline = _request_deadline(self._request({DEADLINE_HEADER: "500"}))
+        
+        assert 0 < deadline.remaining() <= 0.5
+    
+    def test_header_cannot_extend_limit(self):
+        """Test that the configured hard limit caps client deadlines."""
+        with patch.dict('os.environ', {"REQUEST_DEADLINE_S": "2"}):
+            deadline = _request_deadline(self._request({DEADLINE_HEADER: "600000"}))
+        
+        assert deadline.remaining() <= 2
+    
+    def test_invalid_header_rejected(self):
+        """Test that a malformed header is a client error."""
+        with pytest.raises(HTTPException) as exc_info:
+            _request_deadline(self._request({DEADLINE_HEADER: "soon"}))
+        
+        assert exc_info.value.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_retrieval_overrun_fails_closed(self):
+        """Test that missing the retrieval budget skips the agents."""
+        async def slow_retrieve(request, deadline=None):
+            raise DeadlineExceeded("retrieval")
+        
+        with patch('src.api.main._get_orchestrator') as mock_get_orch, \
+             patch('src.api.main._retrieve_for', slow_retrieve):
+            orchestrator = ProofGateOrchestrator(deterministic_mode=False)
+            orchestrator.run = AsyncMock()
+            mock_get_orch.return_value = orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post("/api/judge", json={"question": "Q"})
+        
+        assert response.status_code == 200
+        verdict = response.json()["verdict"]
+        assert verdict["rule_applied"] == "DEADLINE_EXCEEDED"
+        orchestrator.run.assert_not_called()
+
+
+class TestRejudgeEndpoint:
+    """Tests for POST /api/rejudge."""
+    
+    @pytest.mark.asyncio
+    async def test_unknown_run_is_404(self):
+        """Test that re-judging a missing run is a 404."""
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.trace_store.get_result = AsyncMock(return_value=None)
+            mock_get_orch.return_value = mock_orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/rejudge", json={"run_id": "missing"}
+                )
+        
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_unknown_excerpt_is_422(self):
+        """Test that adding an excerpt outside the corpus is rejected."""
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.trace_store.get_result = AsyncMock(return_value={})
+            mock_get_orch.return_value = mock_orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/rejudge",
+                    json={"run_id": "abc", "add_excerpt_ids": ["EVI-999"]},
+                )
+        
+        assert response.status_code == 422
+        assert "EVI-999" in response.json()["detail"]
+    
+    @pytest.mark.asyncio
+    async def test_delta_forwarded_to_orchestrator(self):
+        """Test that corpus excerpts and removals reach rejudge()."""
+        previous = {'run_id': "abc"}
+        result = {
+            'run_id': "def",
+            'verdict': {"verdict": "APPROVE"},
+            'agent_outputs': {},
+            'trace': {"rejudged_from": "abc"},
+        }
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.trace_store.get_result = AsyncMock(return_value=previous)
+            mock_orchestrator.rejudge = AsyncMock(return_value=result)
+            mock_get_orch.return_value = mock_orchestrator
+            
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/rejudge",
+                    json={
+                        "run_id": "abc",
+                        "add_excerpt_ids": ["EVI-003"],
+                        "remove_excerpt_ids": ["EVI-002"],
+                    },
+                )
+        
+        assert response.status_code == 200
+        assert response.json()["trace"]["rejudged_from"] == "abc"
+        args = mock_orchestrator.rejudge.call_args.args
+        assert args[0] is previous
+        assert [e.excerpt_id for e in args[1]] == ["EVI-003"]
+        assert args[2] == ["EVI-002"]
+
+
+class TestAdmissionControl:
+    """Tests for 429 backpressure on judgment endpoints."""
+    
+    @pytest.mark.asyncio
+    async def test_shed_request_gets_429_with_retry_after(self):
+        """Test that a request shed by admission control is a 429."""
+        controller = AdmissionController(max_concurrent=1, max_queue_wait_s=0.02)
+        held = await controller.acquire()
+        
+        with patch('src.api.main._admission', controller), \
+             patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_get_orch.return_value = MagicMock()
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/judge",
+                    json={"question": "Q"},
+                    headers={"X-Request-Priority": "batch"},
+                )
+        
+        held.release()
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+    
+    @pytest.mark.asyncio
+    async def test_slot_released_after_judgment(self):
+        """Test that a finished judgment frees its admission slot."""
+        controller = AdmissionController(max_concurrent=1)
+        
+        async def fake_run(question, excerpts, **kwargs):
+            assert controller.in_flight == 1
+            raise RuntimeError("boom")
+        
+        with patch('src.api.main._admission', controller), \
+             patch('src.api.main._retrieve_for', AsyncMock(return_value={})), \
+             patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run = fake_run
+            mock_get_orch.return_value = mock_orchestrator
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post("/api/judge", json={"question": "Q"})
+        
+        assert response.status_code == 500
+        assert controller.in_flight == 0
+    
+    @pytest.mark.asyncio
+    async def test_invalid_priority_rejected(self):
+        """Test that an unknown priority header is a client error."""
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_get_orch.return_value = MagicMock()
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/judge",
+                    json={"question": "Q"},
+                    headers={"X-Request-Priority": "urgent"},
+                )
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_invalid_tenant_rejected(self):
+        """Test that a malformed tenant header is a client error."""
+        with patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_get_orch.return_value = MagicMock()
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                response = await client.post(
+                    "/api/judge",
+                    json={"question": "Q"},
+                    headers={"X-Tenant-Id": "acme corp/eu"},
+                )
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.asyncio
+    async def test_tenant_header_reaches_run(self):
+        """Test that the judgment runs as the X-Tenant-Id tenant."""
+        seen = {}
+        
+        async def fake_run(question, excerpts, **kwargs):
+            seen.update(kwargs)
+            raise RuntimeError("boom")
+        
+        with patch('src.api.main._admission', AdmissionController()), \
+             patch('src.api.main._retrieve_for', AsyncMock(return_value={})), \
+             patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run = fake_run
+            mock_get_orch.return_value = mock_orchestrator
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                await client.post(
+                    "/api/judge",
+                    json={"question": "Q"},
+                    headers={"X-Tenant-Id": "acme"},
+                )
+        
+        assert seen['tenant'] == "acme"
+
+
+class TestJobsEndpoint:
+    """Tests for POST /api/jobs and GET /api/jobs/{job_id}."""
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_then_poll(self, tmp_path):
+        """Test that a queued job can be looked up by its ID."""
+        queue = JobQueue(tmp_path / "traces.db")
+        await queue.init_db()
+        
+        with patch('src.api.main._job_queue', queue):
+            async with AsyncClient(
+                transport=ASGITransport(app=app),
+                base_url="http://test"
+            ) as client:
+                created = await client.post("/api/jobs", json={"question": "Q?"})
+                job_id = created.json()["job_id"]
+                polled = await client.get(f"/api/jobs/{job_id}")
+                missing = await client.get("/api/jobs/nope")
+        
+        assert created.status_code == 202
+        assert created.json()["status"] == "queued"
+        assert polled.json()["payload"]["question"] == "Q?"
+        assert missing.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_job_handler_runs_judgment_as_batch(self):
+        """Test that the job handler judges the queued request under admission."""
+        controller = AdmissionController(max_concurrent=1)
+        result = {
+            'run_id': 'r1',
+            'verdict': {'verdict': 'APPROVE'},
+            'agent_outputs': {},
+            'trace': {},
+        }
+        
+        async def fake_run(question, excerpts, **kwargs):
+            assert controller.in_flight == 1
+            return result
+        
+        job = MagicMock()
+        job.payload = {"question": "Q?"}
+        with patch('src.api.main._admission', controller), \
+             patch('src.api.main._retrieve_for', AsyncMock(return_value={})), \
+             patch('src.api.main._get_orchestrator') as mock_get_orch:
+            mock_orchestrator = MagicMock()
+            mock_orchestrator.run = fake_run
+            mock_get_orch.return_value = mock_orchestrator
+            output = await _run_job(job)
+        
+        assert output['run_id'] == 'r1'
+        assert output['excerpts_used'] == []
+        assert controller.in_flight == 0
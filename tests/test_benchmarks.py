@@ -0,0 +1,154 @@
+"""
+Unit Tests for Benchmarks
+
+Tests for the synthetic corpus generator and benchmark harnesses.
+"""
+
+import pytest
+
+from benchmarks.corpus import generate_corpus, _excerpt_ids
+from benchmarks.retrieval import (
+    discover_retrievers,
+    recall_at_k,
+    run_benchmark,
+)
+from benchmarks.context_build import run_benchmark as run_context_benchmark
+from benchmarks.judge_context import run_benchmark as run_judge_benchmark
+from benchmarks.jobs import run_benchmark as run_jobs_benchmark
+from benchmarks.provider_pool import run_benchmark as run_pool_benchmark
+from src.ingest.loader import CITE_PATTERN
+
+
+class TestSyntheticCorpus:
+    """Tests for synthetic doc pack generation."""
+
+    def test_corpus_size_matches_request(self):
+        """Test that the corpus has exactly the requested excerpt count."""
+        corpus = generate_corpus(100)
+        assert corpus.size == 100
+        assert len(corpus.excerpts['policy']) == 34
+        assert len(corpus.excerpts['contract']) == 33
+        assert len(corpus.excerpts['evidence']) == 33
+
+    def test_documents_use_cite_format(self):
+        """Test that generated documents parse with the real CITE pattern."""
+        corpus = generate_corpus(30)
+        parsed = sum(
+            len(CITE_PATTERN.findall(doc.content)) for doc in corpus.documents
+        )
+        assert parsed == 30
+
+    def test_excerpt_ids_unique_past_999(self):
+        """Test that IDs overflow into new prefixes without collisions."""
+        ids = _excerpt_ids("policy")
+        first = [next(ids) for _ in range(1500)]
+        assert first[0] == "POL-001"
+        assert len(set(first)) == 1500
+        assert all(len(i) == 7 for i in first)
+
+    def test_relevant_ids_exist_in_corpus(self):
+        """Test that labelled relevant IDs refer to real excerpts."""
+        corpus = generate_corpus(200, n_questions=10)
+        all_ids = {
+            e.excerpt_id for excerpts in corpus.excerpts.values() for e in excerpts
+        }
+        assert corpus.questions
+        for q in corpus.questions:
+            assert q.relevant_ids
+            assert set(q.relevant_ids) <= all_ids
+
+    def test_generation_is_deterministic(self):
+        """Test that the same seed yields the same corpus."""
+        a = generate_corpus(60, seed=7)
+        b = generate_corpus(60, seed=7)
+        assert [q.question for q in a.questions] == [q.question for q in b.questions]
+        assert [d.content_hash for d in a.documents] == [d.content_hash for d in b.documents]
+
+
+class TestRetrievalHarness:
+    """Tests for the retrieval benchmark harness."""
+
+    def test_recall_at_k(self):
+        """Test recall@k computation."""
+        assert recall_at_k(["A", "B", "C"], ["B", "D"], 2) == 0.5
+        assert recall_at_k(["A"], [], 1) == 0.0
+
+    def test_discovers_simple_retriever(self):
+        """Test that exported retrievers are discovered."""
+        assert "SimpleRetriever" in discover_retrievers()
+
+    def test_report_structure(self):
+        """Test that the report is machine-readable and complete."""
+        report = run_benchmark(sizes=[10, 50], n_questions=3, repeats=2)
+
+        assert report['benchmark'] == "retrieval"
+        sizes = {r['corpus_size'] for r in report['results']}
+        assert sizes == {10, 50}
+
+        entry = report['results'][0]
+        assert set(entry['latency_ms']) >= {"p50", "p95", "p99"}
+        assert "build_peak" in entry['memory_bytes']
+        assert "@5" in entry['recall']
+
+    def test_reports_filter_index_cost(self):
+        """Test that the filter index gets its own build time and memory row."""
+        report = run_benchmark(sizes=[50], n_questions=3, repeats=2)
+
+        rows = [r for r in report['results'] if r['retriever'] == "FilterIndex"]
+        assert len(rows) == 1
+        assert rows[0]['build_ms'] >= 0
+        assert rows[0]['memory_bytes']['retained'] > 0
+        assert rows[0]['latency_ms']['samples'] == 6
+
+
+class TestContextBuildBenchmark:
+    """Tests for the context build benchmark."""
+
+    def test_report_structure(self):
+        """Test that both builders are timed at each size."""
+        report = run_context_benchmark(sizes=[50], repeats=5)
+
+        entry = report['results'][0]
+        assert entry['excerpts'] == 50
+        assert entry['context_tokens'] > 0
+        assert "p50" in entry['uncached_us']
+        assert "p50" in entry['cached_us']
+
+
+class TestJudgeContextBenchmark:
+    """Tests for the judge context benchmark."""
+
+    def test_compact_payload_is_smaller(self):
+        """Test that the JSON payload beats the v1 layout at every length."""
+        report = run_judge_benchmark(rationale_words=[20, 300])
+
+        for entry in report['results']:
+            assert entry['v2_tokens'] < entry['v1_tokens']
+        assert report['results'][1]['saving_pct'] > report['results'][0]['saving_pct']
+
+
+class TestJobsBenchmark:
+    """Tests for the job queue throughput benchmark."""
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_workers(self):
+        """Test that more workers drain the same jobs faster."""
+        report = await run_jobs_benchmark(workers=[1, 4], jobs=8, io_s=0.05)
+
+        one, four = report['results']
+        assert four['throughput_jobs_per_s'] > one['throughput_jobs_per_s']
+
+
+class TestProviderPoolBenchmark:
+    """Tests for the provider connection pool benchmark."""
+
+    @pytest.mark.asyncio
+    async def test_pool_saves_connection_setup(self):
+        """Test that the shared pool opens fewer connections and answers faster."""
+        report = await run_pool_benchmark(concurrency=2, bursts=3, connect_delay_ms=30)
+
+        per_call, cold, warm = report['results']
+        assert per_call['connections_opened'] == 6
+        assert cold['connections_opened'] <= 2
+        assert warm['connections_opened'] == 0
+        assert warm['latency_ms']['p95'] < per_call['latency_ms']['p50']
@@ -118,6 +118,27 @@ Third excerpt content.
         assert excerpts[1].excerpt_id == "POL-002"
         assert excerpts[2].excerpt_id == "POL-003"
     
+    def test_metadata_extracted(self):
+        """Test that customer, date and status metadata are derived."""
+        doc = Document(
+            doc_id="invoice",
+            doc_type="evidence",
+            title="Invoice",
+            content=(
+                "# Invoice\n## Customer K - Billing\n\n"
+                "[CITE=EVI-001]\n**Invoice Date:** 2026-01-15\n"
+                "**Payment Status:** Pending\n"
+            )
+        )
+        
+        excerpts = parse_excerpts_from_document(doc)
+        
+        assert excerpts[0].metadata == {
+            "customer": "K",
+            "date": "2026-01-15",
+            "status": "pending",
+        }
+    
     def test_excerpts_inherit_doc_type(self):
         """Test that excerpts inherit document type."""
         doc = Document(
@@ -0,0 +1,272 @@
+"""
+Unit Tests for Jobs
+
+Tests for the durable job queue and its worker pool.
+"""
+
+import asyncio
+import time
+
+import aiosqlite
+import pytest
+
+from src.jobs import JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+async def queue(tmp_path):
+    job_queue = JobQueue(tmp_path / "traces.db")
+    await job_queue.init_db()
+    return job_queue
+
+
+async def _expire_lease(queue, job_id):
+    """Make a running job's lease lapse, as if its worker had died."""
+    async with aiosqlite.connect(queue.db_path) as db:
+        await db.execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ?",
+            (time.time() - 1, job_id),
+        )
+        await db.commit()
+
+
+async def _make_due(queue, job_id):
+    """End a requeued job's retry backoff."""
+    async with aiosqlite.connect(queue.db_path) as db:
+        await db.execute(
+            "UPDATE jobs SET available_at = ? WHERE job_id = ?",
+            (time.time() - 1, job_id),
+        )
+        await db.commit()
+
+
+class TestJobQueue:
+    """Tests for claiming, leasing and finishing jobs."""
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_and_get(self, queue):
+        """Test that an enqueued job is stored as queued."""
+        job = await queue.enqueue({"question": "Q?"})
+        stored = await queue.get(job.job_id)
+        
+        assert stored.status == "queued"
+        assert stored.payload == {"question": "Q?"}
+        assert stored.attempts == 0
+        assert await queue.get("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_claim_is_exclusive(self, queue):
+        """Test that a claimed job is not handed to another worker."""
+        await queue.enqueue({"question": "Q?"})
+        
+        claimed = await queue.claim("w1", lease_s=30)
+        
+        assert claimed.status == "running"
+        assert claimed.lease_owner == "w1"
+        assert claimed.attempts == 1
+        assert await queue.claim("w2", lease_s=30) is None
+    
+    @pytest.mark.asyncio
+    async def test_claims_oldest_first(self, queue):
+        """Test FIFO claiming."""
+        first = await queue.enqueue({"n": 1})
+        await queue.enqueue({"n": 2})
+        
+        assert (await queue.claim("w1", lease_s=30)).job_id == first.job_id
+    
+    @pytest.mark.asyncio
+    async def test_lapsed_lease_is_reclaimed(self, queue):
+        """Test that a job whose worker died is retried by another."""
+        job = await queue.enqueue({"question": "Q?"})
+        await queue.claim("w1", lease_s=30)
+        await _expire_lease(queue, job.job_id)
+        
+        reclaimed = await queue.claim("w2", lease_s=30)
+        
+        assert reclaimed.job_id == job.job_id
+        assert reclaimed.attempts == 2
+        assert not await queue.heartbeat(job.job_id, "w1", 30)
+        assert not await queue.complete(job.job_id, "w1", {"stale": True})
+        assert await queue.complete(job.job_id, "w2", {"ok": True})
+        assert (await queue.get(job.job_id)).result == {"ok": True}
+    
+    @pytest.mark.asyncio
+    async def test_lapsed_final_attempt_fails(self, queue):
+        """Test that a lapsed lease on the last attempt fails the job."""
+        job = await queue.enqueue({"question": "Q?"}, max_attempts=1)
+        await queue.claim("w1", lease_s=30)
+        await _expire_lease(queue, job.job_id)
+        
+        assert await queue.claim("w2", lease_s=30) is None
+        failed = await queue.get(job.job_id)
+        assert failed.status == "failed"
+        assert "Lease expired" in failed.error
+    
+    @pytest.mark.asyncio
+    async def test_fail_requeues_until_attempts_run_out(self, queue):
+        """Test that failed attempts are retried up to max_attempts."""
+        job = await queue.enqueue({"question": "Q?"}, max_attempts=2)
+        
+        await queue.claim("w1", lease_s=30)
+        assert await queue.fail(job.job_id, "w1", "boom")
+        assert (await queue.get(job.job_id)).status == "queued"
+        
+        await _make_due(queue, job.job_id)
+        await queue.claim("w1", lease_s=30)
+        assert await queue.fail(job.job_id, "w1", "boom again")
+        failed = await queue.get(job.job_id)
+        assert failed.status == "failed"
+        assert failed.error == "boom again"
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_backs_off(self, tmp_path):
+        """Test that a requeued job is not claimed before its backoff passes."""
+        queue = JobQueue(tmp_path / "traces.db", retry_base_s=10, retry_max_s=15)
+        await queue.init_db()
+        job = await queue.enqueue({"question": "Q?"}, max_attempts=3)
+        waits = []
+        
+        for _ in range(2):
+            await queue.claim("w1", lease_s=30)
+            before = time.time()
+            assert await queue.fail(job.job_id, "w1", "boom")
+            waits.append((await queue.get(job.job_id)).available_at - before)
+            assert await queue.claim("w2", lease_s=30) is None
+            await _make_due(queue, job.job_id)
+        
+        assert 9 < waits[0] <= 10.5
+        assert 14 < waits[1] <= 15.5
+        assert (await queue.claim("w2", lease_s=30)).attempts == 3
+    
+    @pytest.mark.asyncio
+    async def test_backoff_does_not_block_other_jobs(self, queue):
+        """Test that a job waiting out its backoff does not hold up newer ones."""
+        failing = await queue.enqueue({"n": 1})
+        await queue.claim("w1", lease_s=30)
+        await queue.fail(failing.job_id, "w1", "boom")
+        fresh = await queue.enqueue({"n": 2})
+        
+        assert (await queue.claim("w1", lease_s=30)).job_id == fresh.job_id
+    
+    @pytest.mark.asyncio
+    async def test_adds_backoff_column_to_old_table(self, tmp_path):
+        """Test that a jobs table from before retry backoff is migrated."""
+        async with aiosqlite.connect(tmp_path / "traces.db") as db:
+            await db.execute("""
+                CREATE TABLE jobs (
+                    job_id TEXT PRIMARY KEY, status TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL, result_json TEXT,
+                    error TEXT, lease_owner TEXT, lease_expires_at REAL,
+                    created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+                )
+            """)
+            await db.commit()
+        queue = JobQueue(tmp_path / "traces.db")
+        await queue.init_db()
+        await queue.init_db()
+        job = await queue.enqueue({"question": "Q?"})
+        
+        assert (await queue.claim("w1", lease_s=30)).job_id == job.job_id
+
+
+class TestJobWorkerPool:
+    """Tests for the async worker pool."""
+    
+    @pytest.mark.asyncio
+    async def test_drains_queue(self, queue):
+        """Test that workers run every job to completion."""
+        jobs = [await queue.enqueue({"n": n}) for n in range(5)]
+        
+        async def handler(job):
+            return {"double": job.payload["n"] * 2}
+        
+        pool = JobWorkerPool(queue, handler, workers=2, poll_s=0.01)
+        pool.start()
+        try:
+            for _ in range(200):
+                done = [await queue.get(j.job_id) for j in jobs]
+                if all(j.status == "succeeded" for j in done):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+        
+        assert [j.result for j in done] == [{"double": n * 2} for n in range(5)]
+    
+    @pytest.mark.asyncio
+    async def test_workers_run_jobs_concurrently(self, queue):
+        """Test that throughput scales with the worker count."""
+        for n in range(4):
+            await queue.enqueue({"n": n})
+        running, peak = 0, 0
+        finished = asyncio.Event()
+        count = 0
+        
+        async def handler(job):
+            nonlocal running, peak, count
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            count += 1
+            if count == 4:
+                finished.set()
+            return {}
+        
+        pool = JobWorkerPool(queue, handler, workers=4, poll_s=0.01)
+        pool.start()
+        try:
+            await asyncio.wait_for(finished.wait(), timeout=2)
+        finally:
+            await pool.stop()
+        
+        assert peak == 4
+    
+    @pytest.mark.asyncio
+    async def test_handler_error_is_retried(self, queue):
+        """Test that a failing attempt is requeued and retried."""
+        job = await queue.enqueue({"question": "Q?"}, max_attempts=2)
+        attempts = []
+        
+        async def handler(claimed):
+            attempts.append(claimed.attempts)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return {"ok": True}
+        
+        pool = JobWorkerPool(queue, handler, workers=1)
+        first = await pool.process(await queue.claim("w1", 30), "w1")
+        await _make_due(queue, job.job_id)
+        second = await pool.process(await queue.claim("w1", 30), "w1")
+        
+        assert (first, second) == ("retried", "succeeded")
+        assert attempts == [1, 2]
+        assert (await queue.get(job.job_id)).status == "succeeded"
+    
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_handler(self, queue):
+        """Test that a worker stops once another has taken its job."""
+        job = await queue.enqueue({"question": "Q?"})
+        cancelled = asyncio.Event()
+        
+        async def handler(claimed):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+        
+        pool = JobWorkerPool(queue, handler, workers=1, lease_s=0.06)
+        claimed = await queue.claim("w1", lease_s=0.06)
+        processing = asyncio.create_task(pool.process(claimed, "w1"))
+        await _expire_lease(queue, job.job_id)
+        await queue.claim("w2", lease_s=30)
+        
+        outcome = await asyncio.wait_for(processing, timeout=2)
+        
+        assert outcome == "lease_lost"
+        assert cancelled.is_set()
+        assert (await queue.get(job.job_id)).lease_owner == "w2"
@@ -0,0 +1,307 @@
+"""
+Unit Tests for the Judge Rule Engine
+
+Tests for deterministic verdict resolution (RULE_1 to RULE_5), the
+LLM Judge payload and cascade escalation.
+"""
+
+import json
+
+import pytest
+
+from src.judge import (
+    resolve_verdict,
+    resolve_partial,
+    aggregate_citations,
+    build_judge_payload,
+    escalation_reasons,
+)
+from src.schemas.agents import (
+    PolicyAgentOutput,
+    RiskAgentOutput,
+    EvidenceAgentOutput,
+    FinalVerdict,
+)
+
+
+def _policy(stance="YES", conditions=None, citations=None):
+    return PolicyAgentOutput(
+        stance=stance,
+        conditions=conditions or [],
+        rationale="Policy rationale.",
+        citations=citations or ["POL-001"],
+    )
+
+
+def _risk(stance="YES", flags=None, hard_stops=None, citations=None):
+    return RiskAgentOutput(
+        stance=stance,
+        risk_flags=flags or [],
+        hard_stops=hard_stops or [],
+        rationale="Risk rationale.",
+        citations=citations or ["CON-001"],
+    )
+
+
+def _evidence(stance="SUFFICIENT", missing=None, citations=None):
+    return EvidenceAgentOutput(
+        stance=stance,
+        available_evidence=["Invoice"],
+        missing_evidence=missing or [],
+        rationale="Evidence rationale.",
+        citations=citations or ["EVI-001"],
+    )
+
+
+class TestRuleOrder:
+    """Tests that rules fire in the documented order."""
+    
+    def test_rule_1_hard_stop_rejects(self):
+        """Test that hard stops reject even when evidence is missing."""
+        verdict = resolve_verdict(
+            _policy(),
+            _risk(stance="NO", hard_stops=["Termination window open"]),
+            _evidence(stance="MISSING", missing=["Acceptance"]),
+        )
+        
+        assert verdict.verdict == "REJECT"
+        assert verdict.rule_applied.startswith("RULE_1")
+        assert verdict.violations == ["Termination window open"]
+    
+    def test_rule_2_missing_evidence(self):
+        """Test that MISSING evidence yields INSUFFICIENT_EVIDENCE."""
+        verdict = resolve_verdict(
+            _policy(stance="NO"),
+            _risk(),
+            _evidence(stance="MISSING", missing=["Signed acceptance"]),
+        )
+        
+        assert verdict.verdict == "INSUFFICIENT_EVIDENCE"
+        assert verdict.rule_applied == "RULE_2: Evidence Agent stance is MISSING"
+        assert verdict.conditions_to_allow == ["Signed acceptance"]
+    
+    def test_rule_2_partial_evidence(self):
+        """Test that PARTIAL evidence is named in the rule."""
+        verdict = resolve_verdict(_policy(), _risk(), _evidence(stance="PARTIAL"))
+        
+        assert verdict.verdict == "INSUFFICIENT_EVIDENCE"
+        assert "PARTIAL" in verdict.rule_applied
+    
+    def test_rule_3_policy_blocks(self):
+        """Test that a policy NO rejects when evidence is sufficient."""
+        verdict = resolve_verdict(_policy(stance="NO"), _risk(), _evidence())
+        
+        assert verdict.verdict == "REJECT"
+        assert verdict.rule_applied.startswith("RULE_3")
+    
+    def test_rule_4_mitigable_risk(self):
+        """Test that a risk NO with flags asks for evidence."""
+        verdict = resolve_verdict(
+            _policy(), _risk(stance="NO", flags=["Prior reversal"]), _evidence()
+        )
+        
+        assert verdict.verdict == "INSUFFICIENT_EVIDENCE"
+        assert verdict.rule_applied.startswith("RULE_4")
+        assert verdict.conditions_to_allow == ["Prior reversal"]
+    
+    def test_rule_4_unmitigable_risk(self):
+        """Test that a bare risk NO rejects."""
+        verdict = resolve_verdict(_policy(), _risk(stance="NO"), _evidence())
+        
+        assert verdict.verdict == "REJECT"
+        assert verdict.rule_applied.startswith("RULE_4")
+    
+    def test_rule_5_approve_with_conditions(self):
+        """Test that all-pass approves and carries conditions forward."""
+        verdict = resolve_verdict(
+            _policy(stance="YES_CONDITIONAL", conditions=["Acceptance documented"]),
+            _risk(stance="YES_CONDITIONAL", flags=["Monitor termination window"]),
+            _evidence(),
+        )
+        
+        assert verdict.verdict == "APPROVE"
+        assert verdict.rule_applied.startswith("RULE_5")
+        assert verdict.conditions_to_allow == [
+            "Acceptance documented", "Monitor termination window"
+        ]
+
+
+class TestVerdictProperties:
+    """Tests for determinism and citation aggregation."""
+    
+    def test_returns_final_verdict(self):
+        """Test that the engine produces the Judge Agent's schema."""
+        assert isinstance(resolve_verdict(_policy(), _risk(), _evidence()), FinalVerdict)
+    
+    def test_deterministic(self):
+        """Test that identical inputs give identical verdicts."""
+        args = (_policy(), _risk(stance="NO", flags=["x"]), _evidence())
+        assert resolve_verdict(*args) == resolve_verdict(*args)
+    
+    def test_citations_aggregated_and_deduplicated(self):
+        """Test that citations are the ordered union of agent citations."""
+        citations = aggregate_citations(
+            _policy(citations=["POL-001", "CON-001"]),
+            _risk(citations=["CON-001", "CON-007"]),
+            _evidence(citations=["EVI-001"]),
+        )
+        
+        assert citations == ["POL-001", "CON-001", "CON-007", "EVI-001"]
+
+
+class TestPartialResolution:
+    """Tests for resolving verdicts before every agent has answered."""
+    
+    def test_hard_stop_decides_alone(self):
+        """Test that RULE_1 needs only the Risk Agent."""
+        verdict = resolve_partial(risk=_risk(stance="NO", hard_stops=["Bill-and-hold"]))
+        
+        assert verdict.verdict == "REJECT"
+        assert verdict.rule_applied.startswith("RULE_1")
+        assert verdict.citations == ["CON-001"]
+    
+    def test_missing_evidence_needs_risk(self):
+        """Test that RULE_2 waits until risk rules out a hard stop."""
+        evidence = _evidence(stance="MISSING", missing=["Signed acceptance"])
+        
+        assert resolve_partial(evidence=evidence) is None
+        verdict = resolve_partial(risk=_risk(), evidence=evidence)
+        assert verdict.rule_applied.startswith("RULE_2")
+    
+    def test_undetermined_without_policy(self):
+        """Test that later rules wait for every output."""
+        assert resolve_partial(risk=_risk(), evidence=_evidence()) is None
+        assert resolve_partial(policy=_policy(stance="NO")) is None
+    
+    @pytest.mark.parametrize("risk,evidence", [
+        (_risk(hard_stops=["x"]), _evidence()),
+        (_risk(), _evidence(stance="PARTIAL", missing=["y"])),
+        (_risk(stance="NO", flags=["z"]), _evidence()),
+        (_risk(), _evidence()),
+    ])
+    def test_matches_full_resolution(self, risk, evidence):
+        """Test that a partial verdict agrees with the full rule set."""
+        full = resolve_verdict(_policy(stance="NO"), risk, evidence)
+        partial = resolve_partial(risk=risk, evidence=evidence) or full
+        
+        assert partial.verdict == full.verdict
+        assert partial.rule_applied == full.rule_applied
+
+
+class TestJudgePayload:
+    """Tests for the compact canonical Judge payload."""
+    
+    def test_sorted_compact_json(self):
+        """Test that the payload is sorted-key JSON without whitespace."""
+        payload = build_judge_payload("Q?", _policy(), _risk(), _evidence())
+        
+        assert payload == json.dumps(
+            json.loads(payload), sort_keys=True, separators=(",", ":")
+        )
+    
+    def test_rationales_truncated(self):
+        """Test that long rationales are cut to the limit."""
+        risk = _risk(stance="NO").model_copy(update={"rationale": "x" * 500})
+        payload = json.loads(build_judge_payload(
+            "Q?", _policy(), risk, _evidence(), rationale_chars=50
+        ))
+        
+        assert len(payload['risk']['rationale']) == 50
+        assert payload['risk']['rationale'].endswith("...")
+        assert payload['policy']['rationale'] == "Policy rationale."
+    
+    def test_rationales_omitted_over_cap(self):
+        """Test that rationales are dropped when the payload is too large."""
+        risk = _risk().model_copy(update={"rationale": "x" * 500})
+        payload = json.loads(build_judge_payload(
+            "Q?", _policy(), risk, _evidence(), max_chars=300
+        ))
+        
+        assert "rationale" not in payload['risk']
+        assert payload['risk']['stance'] == "YES"
+    
+    def test_rationales_disabled(self):
+        """Test that rationale_chars=0 omits every rationale."""
+        payload = json.loads(build_judge_payload(
+            "Q?", _policy(), _risk(), _evidence(), rationale_chars=0
+        ))
+        
+        assert all("rationale" not in payload[n] for n in ("policy", "risk", "evidence"))
+
+
+class TestEscalation:
+    """Tests for deciding which fast-model outputs to escalate."""
+    
+    def test_clear_cut_agreement_not_escalated(self):
+        """Test that unanimous approvals and rejections are trusted."""
+        approve = {"policy": _policy(), "risk": _risk(), "evidence": _evidence()}
+        reject = {
+            "policy": _policy("NO"),
+            "risk": _risk("NO"),
+            "evidence": _evidence("MISSING"),
+        }
+        
+        assert escalation_reasons(approve, approve) == {}
+        assert escalation_reasons(reject, reject) == {}
+    
+    def test_invalid_and_borderline_escalated(self):
+        """Test that failed validation and borderline stances escalate alone."""
+        outputs = {
+            "policy": None,
+            "risk": _risk(),
+            "evidence": _evidence("PARTIAL"),
+        }
+        
+        assert escalation_reasons(outputs, outputs) == {
+            "policy": "invalid_citations",
+            "evidence": "borderline",
+        }
+    
+    def test_conditional_stances_not_borderline(self):
+        """Test that YES_CONDITIONAL, which resolves like YES, is trusted."""
+        outputs = {
+            "policy": _policy("YES_CONDITIONAL", conditions=["Signed SOW"]),
+            "risk": _risk("YES_CONDITIONAL", flags=["Renewal pending"]),
+            "evidence": _evidence(),
+        }
+        
+        assert escalation_reasons(outputs, outputs) == {}
+    
+    def test_disagreement_escalates_only_pivotal_outputs(self):
+        """Test that a conflict escalates only outputs whose flip changes the verdict."""
+        outputs = {
+            "policy": _policy(),
+            "risk": _risk(hard_stops=["Sanctioned party"]),
+            "evidence": _evidence(),
+        }
+        
+        # Policy NO would still be REJECT; risk YES would be APPROVE
+        assert escalation_reasons(outputs, ["policy", "risk"]) == {
+            "risk": "disagreement",
+        }
+    
+    def test_outputs_after_missing_evidence_not_escalated(self):
+        """Test that Policy and Risk are trusted once Evidence decides the verdict."""
+        outputs = {
+            "policy": _policy(),
+            "risk": _risk(),
+            "evidence": _evidence("MISSING"),
+        }
+        
+        assert escalation_reasons(outputs, outputs) == {"evidence": "disagreement"}
+    
+    def test_borderline_output_that_cannot_matter_not_escalated(self):
+        """Test that a borderline stance is kept when a hard stop decides anyway."""
+        outputs = {
+            "policy": _policy("NO"),
+            "risk": _risk("NO", hard_stops=["Sanctioned party"]),
+            "evidence": _evidence("PARTIAL"),
+        }
+        
+        assert escalation_reasons(outputs, outputs) == {}
+    
+    def test_skipped_agents_ignored(self):
+        """Test that agents without an output are not escalated."""
+        outputs = {"risk": _risk()}
+        
+        assert escalation_reasons(outputs, ["policy", "risk", "evidence"]) == {}
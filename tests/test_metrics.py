@@ -0,0 +1,96 @@
+"""
+Unit Tests for Metrics
+
+Tests for the in-process counter/gauge/histogram registry.
+"""
+
+import pytest
+
+from src.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestCounter:
+    """Tests for counters."""
+    
+    def test_increments_per_label_set(self):
+        """Test that label sets are counted independently."""
+        counter = Counter("calls_total")
+        counter.inc(reason="a")
+        counter.inc(2, reason="a")
+        counter.inc(reason="b")
+        
+        assert counter.value(reason="a") == 3
+        assert counter.value(reason="b") == 1
+        assert counter.value(reason="c") == 0
+    
+    def test_rejects_decrease(self):
+        """Test that counters only go up."""
+        with pytest.raises(ValueError):
+            Counter("calls_total").inc(-1)
+
+
+class TestGauge:
+    """Tests for gauges."""
+    
+    def test_set_inc_dec(self):
+        """Test that gauges move both ways."""
+        gauge = Gauge("in_flight")
+        gauge.set(5)
+        gauge.inc()
+        gauge.dec(3)
+        
+        assert gauge.value() == 3
+
+
+class TestHistogram:
+    """Tests for histograms."""
+    
+    def test_cumulative_buckets(self):
+        """Test that observations land in every bucket at or above them."""
+        histogram = Histogram("wait_seconds", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.1, 3):
+            histogram.observe(value, priority="batch")
+        
+        assert histogram.value(priority="batch") == {
+            'count': 4,
+            'sum': 3.65,
+            'buckets': {"0.1": 2, "1": 3, "+Inf": 4},
+        }
+    
+    def test_unobserved_label_set_is_empty(self):
+        """Test that an unseen label set reads as an empty distribution."""
+        histogram = Histogram("wait_seconds", buckets=(1,))
+        
+        assert histogram.value()['count'] == 0
+        assert histogram.value()['buckets'] == {"1": 0, "+Inf": 0}
+
+
+class TestMetricsRegistry:
+    """Tests for the registry and its snapshot."""
+    
+    def test_get_or_create_returns_same_metric(self):
+        """Test that repeated lookups share one metric."""
+        registry = MetricsRegistry()
+        
+        assert registry.counter("x") is registry.counter("x")
+    
+    def test_kind_conflict_raises(self):
+        """Test that a name cannot be reused for another metric type."""
+        registry = MetricsRegistry()
+        registry.counter("x")
+        
+        with pytest.raises(TypeError):
+            registry.gauge("x")
+    
+    def test_snapshot(self):
+        """Test that snapshots are JSON-ready and label-keyed."""
+        registry = MetricsRegistry()
+        registry.counter("cancelled_total", "Cancelled calls").inc(reason="agent_error")
+        
+        snapshot = registry.snapshot()
+        
+        assert snapshot["cancelled_total"] == {
+            'type': "counter",
+            'description': "Cancelled calls",
+            'samples': [{'labels': {'reason': "agent_error"}, 'value': 1.0}],
+        }
@@ -4,11 +4,20 @@ Unit Tests for ProofGate Orchestrator
 Tests for the multi-agent orchestrator module.
 """
 
+import asyncio
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from pathlib import Path
 
-from src.orchestrator import ProofGateOrchestrator
+from src.orchestrator import (
+    ProofGateOrchestrator,
+    AGENT_CALLS_CANCELLED,
+    CIRCUIT_OPEN_RULE,
+    DEADLINE_RULE,
+    EXPECTED_OUTPUT_TOKENS,
+)
 from src.schemas.agents import (
     PolicyAgentOutput,
     RiskAgentOutput,
@@ -17,6 +26,94 @@ from src.schemas.agents import (
 )
 from src.schemas.documents import ExcerptBlock, RunTrace
 from src.guards import CitationValidationError
+from src.trace import TraceStore
+from src.resilience import (
+    CircuitBreakers,
+    Deadline,
+    DeadlineExceeded,
+    HedgePolicy,
+    RetryPolicy,
+    StageBudgets,
+)
+from src.scheduling import AdaptiveConcurrencyLimiter, AgentNode
+from src.tokens import estimate_tokens
+
+
+# Agent outputs that pass every rule; tests override what they exercise
+AGENT_OUTPUTS = {
+    "PolicyAgent": PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-001"]),
+    "RiskAgent": RiskAgentOutput(stance="YES", rationale="Ok."),
+    "EvidenceAgent": EvidenceAgentOutput(
+        stance="SUFFICIENT", rationale="Ok.", citations=["EVI-001"]
+    ),
+}
+
+
+@pytest.fixture
+def sample_excerpts():
+    """One policy, contract and evidence excerpt."""
+    return {
+        'policy': [ExcerptBlock.create("POL-001", "policy1", "policy", "Policy")],
+        'contract': [ExcerptBlock.create("CON-001", "contract1", "contract", "Contract")],
+        'evidence': [ExcerptBlock.create("EVI-001", "evidence1", "evidence", "Evidence")],
+    }
+
+
+def _per_call(value, n):
+    """A per-agent setting for its n-th call: lists give one per call, the last repeating."""
+    return value[min(n, len(value) - 1)] if isinstance(value, list) else value
+
+
+def fake_runner(
+    outputs=None,
+    delays=None,
+    failures=None,
+    calls=None,
+    cancelled=None,
+    record=lambda agent, input: agent.name,
+    error=lambda: RuntimeError("provider error"),
+    usage=None,
+):
+    """
+    Runner.run stand-in answering each agent by name.
+    
+    Args:
+        outputs: Agent name to output, over AGENT_OUTPUTS; a callable is
+            given (agent, input)
+        delays: Agent name to seconds before answering
+        failures: Agent name to how many calls raise error() first
+        calls: Gets record(agent, input) for every call
+        cancelled: Gets the name of every agent cancelled mid-call
+        usage: Provider usage attached to every result
+    
+    Outputs and delays may be lists, one per call of that agent.
+    """
+    outputs = {**AGENT_OUTPUTS, **(outputs or {})}
+    failures = dict(failures or {})
+    counts = {}
+    
+    async def run(agent, input, run_config=None):
+        n = counts[agent.name] = counts.get(agent.name, -1) + 1
+        if calls is not None:
+            calls.append(record(agent, input))
+        if failures.get(agent.name, 0) > 0:
+            failures[agent.name] -= 1
+            raise error()
+        delay = _per_call((delays or {}).get(agent.name, 0), n)
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.append(agent.name)
+                raise
+        output = _per_call(outputs[agent.name], n)
+        result = MagicMock()
+        result.final_output = output(agent, input) if callable(output) else output
+        if usage is not None:
+            result.context_wrapper.usage = usage
+        return result
+    return run
 
 
 class TestBuildContext:
@@ -74,6 +171,62 @@ class TestBuildContext:
         assert "## POLICY_EXCERPTS" in context
         assert "## CONTRACT_EXCERPTS" in context
         assert "## EVIDENCE_EXCERPTS" in context
+    
+    def test_build_context_static_prefix_first(self, orchestrator, sample_excerpts):
+        """Test that static sections precede evidence and the question is last."""
+        context = orchestrator._build_context("Test?", sample_excerpts)
+        
+        order = [
+            context.index(h) for h in (
+                "## POLICY_EXCERPTS", "## CONTRACT_EXCERPTS",
+                "## EVIDENCE_EXCERPTS", "## QUESTION",
+            )
+        ]
+        assert order == sorted(order)
+        assert context.endswith("## QUESTION\nTest?")
+    
+    def test_build_context_canonical_order(self, orchestrator, sample_excerpts):
+        """Test that excerpt order from retrieval does not change the context."""
+        shuffled = {k: list(reversed(v)) for k, v in sample_excerpts.items()}
+        
+        assert (
+            orchestrator._build_context("Test?", shuffled)
+            == orchestrator._build_context("Test?", sample_excerpts)
+        )
+    
+    def test_build_context_shared_prefix(self, orchestrator, sample_excerpts):
+        """Test that requests differing in question and evidence share a prefix."""
+        other = dict(sample_excerpts, evidence=[
+            ExcerptBlock.create("EVI-009", "evidence9", "evidence", "Other evidence"),
+        ])
+        first = orchestrator._build_context("First?", sample_excerpts)
+        second = orchestrator._build_context("Second?", other)
+        
+        prefix = first[:first.index("## EVIDENCE_EXCERPTS")]
+        assert "[CITE=CON-001]" in prefix
+        assert second.startswith(prefix)
+    
+    def test_build_packed_context(self, orchestrator, sample_excerpts):
+        """Test packed context numbers questions after the same excerpts."""
+        context = orchestrator._build_packed_context(["First?", "Second?"], sample_excerpts)
+        single = orchestrator._build_context("First?", sample_excerpts)
+        
+        assert context.endswith("## QUESTIONS\n[0] First?\n[1] Second?")
+        assert context.split("## QUESTIONS")[0] == single.split("## QUESTION")[0]
+    
+    def test_build_context_estimate_sums_excerpt_counts(self, orchestrator, sample_excerpts):
+        """Test that the token estimate reuses each excerpt's memoized count."""
+        context = orchestrator._build_context("Test?", sample_excerpts)
+        excerpts = [e for group in sample_excerpts.values() for e in group]
+        
+        rest = len(context) - sum(len(e.prompt_block) for e in excerpts)
+        assert context.estimated_tokens == (
+            sum(e.token_count for e in excerpts) + estimate_tokens("x" * rest)
+        )
+        assert abs(context.estimated_tokens - estimate_tokens(context)) <= len(excerpts) + 1
+        
+        amended = context + "\n\nINVALID_CITATIONS: POL-009"
+        assert amended.estimated_tokens > context.estimated_tokens
 
 
 class TestBuildJudgeContext:
@@ -121,24 +274,34 @@ class TestBuildJudgeContext:
             agent_outputs['evidence'],
         )
         
-        assert "## QUESTION" in context
-        assert "Can we approve?" in context
+        assert json.loads(context)['question'] == "Can we approve?"
     
     def test_build_judge_context_includes_all_agents(self, orchestrator, agent_outputs):
-        """Test judge context includes all agent outputs."""
+        """Test judge context carries the fields the rules read."""
         context = orchestrator._build_judge_context(
             "Test?",
             agent_outputs['policy'],
             agent_outputs['risk'],
             agent_outputs['evidence'],
         )
+        payload = json.loads(context)
+        
+        assert payload['policy']['stance'] == "YES_CONDITIONAL"
+        assert payload['policy']['conditions'] == ["Acceptance required"]
+        assert payload['risk']['risk_flags'] == ["Minor risk"]
+        assert payload['risk']['hard_stops'] == []
+        assert payload['evidence']['stance'] == "SUFFICIENT"
+        assert payload['evidence']['citations'] == ["EVI-001"]
+        assert "available_evidence" not in payload['evidence']
+    
+    def test_build_judge_context_is_canonical(self, orchestrator, agent_outputs):
+        """Test judge context is compact and identical for identical outputs."""
+        args = ("Test?", agent_outputs['policy'], agent_outputs['risk'], agent_outputs['evidence'])
+        copies = [o.model_copy(deep=True) for o in args[1:]]
+        context = orchestrator._build_judge_context(*args)
         
-        assert "## POLICY_AGENT_OUTPUT" in context
-        assert "YES_CONDITIONAL" in context
-        assert "## RISK_AGENT_OUTPUT" in context
-        assert "Minor risk" in context
-        assert "## EVIDENCE_AGENT_OUTPUT" in context
-        assert "SUFFICIENT" in context
+        assert context == orchestrator._build_judge_context("Test?", *copies)
+        assert ": " not in context and "\n" not in context
 
 
 class TestFailClosedResult:
@@ -211,20 +374,6 @@ class TestFailClosedResult:
 class TestOrchestratorRunMocked:
     """Tests for orchestrator run method with mocked LLM calls."""
     
-    @pytest.fixture
-    def sample_excerpts(self):
-        return {
-            'policy': [
-                ExcerptBlock.create("POL-001", "policy1", "policy", "Policy excerpt"),
-            ],
-            'contract': [
-                ExcerptBlock.create("CON-001", "contract1", "contract", "Contract excerpt"),
-            ],
-            'evidence': [
-                ExcerptBlock.create("EVI-001", "evidence1", "evidence", "Evidence excerpt"),
-            ],
-        }
-    
     @pytest.fixture
     def mock_policy_output(self):
         return PolicyAgentOutput(
@@ -391,16 +540,6 @@ class TestOrchestratorRunMocked:
 class TestOrchestratorErrorHandling:
     """Tests for orchestrator error handling."""
     
-    @pytest.fixture
-    def sample_excerpts(self):
-        return {
-            'policy': [
-                ExcerptBlock.create("POL-001", "policy1", "policy", "Policy"),
-            ],
-            'contract': [],
-            'evidence': [],
-        }
-    
     @pytest.mark.asyncio
     async def test_citation_error_fails_closed(self, sample_excerpts):
         """Test that citation validation error results in fail-closed."""
@@ -432,3 +571,1366 @@ class TestOrchestratorErrorHandling:
             
             assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
             assert "error" in result['error'].lower()
+
+
+class TestJudgeModes:
+    """Tests for rule-engine vs LLM judge resolution."""
+    
+    @pytest.fixture
+    def agent_results(self):
+        """Runner results for policy, risk, evidence (in call order)."""
+        outputs = [
+            PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-001"]),
+            RiskAgentOutput(stance="YES", rationale="Ok.", citations=["CON-001"]),
+            EvidenceAgentOutput(stance="SUFFICIENT", rationale="Ok.", citations=["EVI-001"]),
+        ]
+        results = []
+        for output in outputs:
+            result = MagicMock()
+            result.final_output = output
+            results.append(result)
+        return results
+    
+    def test_unknown_judge_mode_rejected(self, tmp_path):
+        """Test that a mistyped judge mode fails at construction."""
+        with pytest.raises(ValueError, match="judge_mode"):
+            ProofGateOrchestrator(data_dir=tmp_path, judge_mode="rule")
+    
+    @pytest.mark.asyncio
+    async def test_rules_mode_skips_judge_call(self, sample_excerpts, agent_results, tmp_path):
+        """Test that rules mode makes only the three agent calls."""
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = AsyncMock(side_effect=agent_results)
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+            
+            assert MockRunner.run.await_count == 3
+            assert result['verdict']['verdict'] == "APPROVE"
+            assert result['verdict']['rule_applied'].startswith("RULE_5")
+            assert result['verdict']['citations'] == ["POL-001", "CON-001", "EVI-001"]
+            assert result['trace']['prompt_versions']['judge'] == "rules-v1"
+    
+    @pytest.mark.asyncio
+    async def test_llm_mode_calls_judge(self, sample_excerpts, agent_results, tmp_path):
+        """Test that llm mode still delegates to the Judge Agent."""
+        judge_result = MagicMock()
+        judge_result.final_output = FinalVerdict(
+            verdict="REJECT",
+            confidence=0.9,
+            citations=[],
+            rule_applied="RULE_3",
+        )
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = AsyncMock(side_effect=agent_results + [judge_result])
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False, judge_mode="llm"
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+            
+            assert MockRunner.run.await_count == 4
+            assert result['verdict']['rule_applied'] == "RULE_3"
+            assert result['trace']['prompt_versions']['judge'] == "v2"
+    
+    @pytest.mark.asyncio
+    async def test_identical_judge_payload_reuses_verdict(self, sample_excerpts, tmp_path):
+        """Test that the judge call is cached on its canonical payload."""
+        verdict = FinalVerdict(
+            verdict="APPROVE", confidence=0.9, citations=["POL-001"], rule_applied="RULE_5",
+        )
+        calls = []
+        more_evidence = dict(sample_excerpts, evidence=sample_excerpts['evidence'] + [
+            ExcerptBlock.create("EVI-002", "evidence1", "evidence", "More evidence"),
+        ])
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner({"JudgeAgent": verdict}, calls=calls)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, judge_mode="llm")
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            result = await orchestrator.run("Test?", more_evidence)
+        
+        assert calls.count("JudgeAgent") == 1
+        assert sorted(calls[4:]) == ["EvidenceAgent", "RiskAgent"]
+        assert result['trace']['agent_cache_hits'] == ["judge", "policy"]
+        assert result['verdict']['rule_applied'] == "RULE_5"
+
+
+class TestRunStream:
+    """Tests for streaming agent results as they complete."""
+    
+    MISSING = {
+        "EvidenceAgent": EvidenceAgentOutput(stance="MISSING", rationale="No.", citations=["EVI-001"]),
+    }
+    
+    @pytest.mark.asyncio
+    async def test_agents_streamed_in_completion_order(self, sample_excerpts, tmp_path):
+        """Test that agent events arrive as each agent finishes."""
+        delays = {"PolicyAgent": 0.06, "RiskAgent": 0.0, "EvidenceAgent": 0.03}
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(self.MISSING, delays)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            events = [e async for e in orchestrator.run_stream("Test?", sample_excerpts)]
+        
+        names = [event for event, _ in events]
+        assert names == ["agent", "agent", "agent", "verdict", "trace"]
+        assert [d['agent'] for e, d in events if e == "agent"] == ["risk", "evidence", "policy"]
+        assert events[3][1]['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert set(events[4][1]['trace']['agent_latency_ms']) == {"policy", "risk", "evidence"}
+    
+    @pytest.mark.asyncio
+    async def test_replayed_run_streams_stored_outputs(self, sample_excerpts, tmp_path):
+        """Test that a cache replay still yields agent events."""
+        delays = {"PolicyAgent": 0.0, "RiskAgent": 0.0, "EvidenceAgent": 0.0}
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(self.MISSING, delays)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=True)
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            events = [e async for e in orchestrator.run_stream("Test?", sample_excerpts)]
+        
+        agent_events = [d for e, d in events if e == "agent"]
+        assert len(agent_events) == 3
+        assert all(d['replayed'] for d in agent_events)
+        assert events[-1][1]['trace']['replayed'] is True
+
+
+class TestShortCircuit:
+    """Tests for cancelling agents once the verdict is determined."""
+    
+    @pytest.mark.asyncio
+    async def test_hard_stop_cancels_remaining_agents(self, sample_excerpts, tmp_path):
+        """Test that RULE_1 rejects without waiting for Policy and Evidence."""
+        outputs = {
+            "RiskAgent": RiskAgentOutput(
+                stance="NO", hard_stops=["Bill-and-hold"], rationale="Stop.",
+                citations=["CON-001"],
+            ),
+        }
+        delays = {"RiskAgent": 0.0, "PolicyAgent": 5.0, "EvidenceAgent": 5.0}
+        cancelled = []
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(outputs, delays, cancelled=cancelled)
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False, short_circuit=True
+            )
+            await orchestrator.init()
+            result = await asyncio.wait_for(
+                orchestrator.run("Test?", sample_excerpts), timeout=2
+            )
+        
+        assert result['verdict']['verdict'] == "REJECT"
+        assert result['verdict']['rule_applied'].startswith("RULE_1")
+        assert result['trace']['skipped_agents'] == ["evidence", "policy"]
+        assert set(result['agent_outputs']) == {"risk"}
+        assert sorted(cancelled) == ["EvidenceAgent", "PolicyAgent"]
+    
+    @pytest.mark.asyncio
+    async def test_missing_evidence_skips_policy(self, sample_excerpts, tmp_path):
+        """Test that RULE_2 skips Policy once Risk and Evidence are in."""
+        outputs = {
+            "RiskAgent": RiskAgentOutput(stance="YES", rationale="Ok."),
+            "EvidenceAgent": EvidenceAgentOutput(
+                stance="MISSING", missing_evidence=["Acceptance"],
+                rationale="None.", citations=["EVI-001"],
+            ),
+        }
+        delays = {"RiskAgent": 0.0, "EvidenceAgent": 0.01, "PolicyAgent": 5.0}
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(outputs, delays)
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False, short_circuit=True
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert result['trace']['skipped_agents'] == ["policy"]
+        assert set(result['trace']['agent_output_hashes']) == {"risk", "evidence", "judge"}
+    
+    @pytest.mark.asyncio
+    async def test_short_circuited_result_not_replayed(self, sample_excerpts, tmp_path):
+        """Test that a full run of the same input is not served the partial result."""
+        outputs = {
+            "RiskAgent": RiskAgentOutput(
+                stance="NO", hard_stops=["Bill-and-hold"], rationale="Stop.",
+                citations=["CON-001"],
+            ),
+            "PolicyAgent": PolicyAgentOutput(
+                stance="NO", rationale="No.", citations=["POL-001"]
+            ),
+            "EvidenceAgent": EvidenceAgentOutput(
+                stance="SUFFICIENT", rationale="Ok.", citations=["EVI-001"]
+            ),
+        }
+        delays = {"RiskAgent": 0.0, "PolicyAgent": 0.05, "EvidenceAgent": 0.05}
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(outputs, delays)
+            
+            short = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=True, short_circuit=True
+            )
+            await short.init()
+            partial = await short.run("Test?", sample_excerpts)
+            
+            full = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=True)
+            await full.init()
+            replay = await full.run("Test?", sample_excerpts)
+        
+        citations = lambda r: sorted(
+            c for output in r['agent_outputs'].values() for c in output['citations']
+        )
+        assert partial['trace']['skipped_agents'] == ["evidence", "policy"]
+        assert replay['trace']['replayed'] is False
+        assert replay['trace']['skipped_agents'] == []
+        assert citations(partial) == ["CON-001"]
+        assert citations(replay) == ["CON-001", "EVI-001", "POL-001"]
+    
+    @pytest.mark.asyncio
+    async def test_undetermined_verdict_waits_for_all(self, sample_excerpts, tmp_path):
+        """Test that nothing is skipped when every rule input is needed."""
+        outputs = {
+            "RiskAgent": RiskAgentOutput(stance="YES", rationale="Ok."),
+            "EvidenceAgent": EvidenceAgentOutput(stance="SUFFICIENT", rationale="Ok."),
+            "PolicyAgent": PolicyAgentOutput(
+                stance="YES", rationale="Ok.", citations=["POL-001"]
+            ),
+        }
+        delays = {"RiskAgent": 0.0, "EvidenceAgent": 0.0, "PolicyAgent": 0.02}
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(outputs, delays)
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False, short_circuit=True
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert result['verdict']['verdict'] == "APPROVE"
+        assert result['trace']['skipped_agents'] == []
+    
+    def test_disabled_in_llm_judge_mode(self, tmp_path):
+        """Test that the LLM Judge always receives every agent output."""
+        orchestrator = ProofGateOrchestrator(
+            data_dir=tmp_path, judge_mode="llm", short_circuit=True
+        )
+        assert orchestrator.short_circuit is False
+
+
+class TestStructuredCancellation:
+    """Tests for cancelling sibling agent calls."""
+    
+    @staticmethod
+    def _runner(cancelled, failing="RiskAgent"):
+        """One agent fails fast, the others hang."""
+        return fake_runner(
+            delays=dict.fromkeys(AGENT_OUTPUTS, 5),
+            failures={failing: 1} if failing else None,
+            cancelled=cancelled,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_first_error_cancels_siblings(self, sample_excerpts, tmp_path):
+        """Test that a failing agent stops the others and fails closed."""
+        cancelled = []
+        before = AGENT_CALLS_CANCELLED.value(reason="agent_error")
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(cancelled)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            result = await asyncio.wait_for(
+                orchestrator.run("Test?", sample_excerpts), timeout=2
+            )
+        
+        assert result['verdict']['rule_applied'] == "FAIL_CLOSED_ON_ERROR"
+        assert "provider error" in result['error']
+        assert sorted(cancelled) == ["EvidenceAgent", "PolicyAgent"]
+        assert AGENT_CALLS_CANCELLED.value(reason="agent_error") == before + 2
+    
+    @pytest.mark.asyncio
+    async def test_cancelling_run_cancels_agents(self, sample_excerpts, tmp_path):
+        """Test that an aborted run leaves no agent call running."""
+        cancelled = []
+        before = AGENT_CALLS_CANCELLED.value(reason="run_cancelled")
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(cancelled, failing=None)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            task = asyncio.create_task(orchestrator.run("Test?", sample_excerpts))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        assert len(cancelled) == 3
+        assert AGENT_CALLS_CANCELLED.value(reason="run_cancelled") == before + 3
+
+
+class TestDeadlines:
+    """Tests for deadline propagation through the pipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_slow_agent_fails_closed(self, sample_excerpts, tmp_path):
+        """Test that an agent overrunning its budget fails closed."""
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(delays=dict.fromkeys(AGENT_OUTPUTS, 5))
+            
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                deterministic_mode=False,
+                stage_budgets=StageBudgets(agents=0.05),
+            )
+            await orchestrator.init()
+            result = await asyncio.wait_for(
+                orchestrator.run("Test?", sample_excerpts), timeout=2
+            )
+        
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert result['verdict']['rule_applied'] == DEADLINE_RULE
+        assert "agents" in result['error']
+    
+    @pytest.mark.asyncio
+    async def test_request_deadline_caps_stage_budget(self, sample_excerpts, tmp_path):
+        """Test that the request deadline wins over a larger stage budget."""
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(delays=dict.fromkeys(AGENT_OUTPUTS, 5))
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            result = await asyncio.wait_for(
+                orchestrator.run("Test?", sample_excerpts, deadline=Deadline.after(0.05)),
+                timeout=2,
+            )
+        
+        assert result['verdict']['rule_applied'] == DEADLINE_RULE
+    
+    @pytest.mark.asyncio
+    async def test_retry_skipped_when_it_cannot_finish(self, tmp_path):
+        """Test that a retry is not started without time to complete."""
+        calls = []
+        bad = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["FAKE-001"])
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(
+                {"PolicyAgent": bad}, {"PolicyAgent": 0.05}, calls=calls
+            )
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, max_retries=1)
+            with pytest.raises(DeadlineExceeded) as exc_info:
+                await orchestrator._run_agent_with_retry(
+                    orchestrator.policy_agent, "context", {"POL-001"}, "policy",
+                    deadline=Deadline.after(0.08),
+                )
+        
+        assert exc_info.value.stage == "retries"
+        assert calls == ["PolicyAgent"]
+    
+    def test_deadline_exceeded_result(self, tmp_path):
+        """Test the fail-closed result for a deadline missed before run()."""
+        orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+        result = orchestrator.deadline_exceeded_result(
+            "Test?", DeadlineExceeded("retrieval")
+        )
+        
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert result['verdict']['rule_applied'] == "DEADLINE_EXCEEDED"
+        assert "retrieval" in result['error']
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical runs."""
+    
+    @staticmethod
+    def _runner(calls, delay=0.05):
+        """Every agent answers after a delay."""
+        return fake_runner(delays=dict.fromkeys(AGENT_OUTPUTS, delay), calls=calls)
+    
+    @pytest.mark.asyncio
+    async def test_identical_runs_share_one_execution(self, sample_excerpts, tmp_path):
+        """Test that concurrent identical runs call the agents once."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            results = await asyncio.gather(*(
+                orchestrator.run("Test?", sample_excerpts) for _ in range(5)
+            ))
+            stored = await orchestrator.trace_store.list_traces()
+        
+        assert len(calls) == 3
+        assert len({r['run_id'] for r in results}) == 5
+        (leader,) = [r for r in results if not r['trace']['coalesced']]
+        for follower in (r for r in results if r is not leader):
+            assert follower['trace']['coalesced'] is True
+            assert follower['trace']['coalesced_from'] == leader['run_id']
+            assert follower['trace']['run_id'] == follower['run_id']
+            assert follower['verdict'] == leader['verdict']
+        assert {t.run_id for t in stored} == {r['run_id'] for r in results}
+        for follower in (r for r in results if r is not leader):
+            trace = await orchestrator.trace_store.get_trace(follower['run_id'])
+            assert trace.coalesced_from == leader['run_id']
+        assert orchestrator._in_flight == {}
+    
+    @pytest.mark.asyncio
+    async def test_leader_cancel_keeps_execution_for_followers(self, sample_excerpts, tmp_path):
+        """Test that a disconnecting leader does not fail its followers."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            leader = asyncio.create_task(orchestrator.run("Test?", sample_excerpts))
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(orchestrator.run("Test?", sample_excerpts))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await follower
+        
+        assert result['verdict']['verdict'] == "APPROVE"
+        assert result['trace']['coalesced'] is True
+        assert len(calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancel_cancels_execution(self, sample_excerpts, tmp_path):
+        """Test that nobody waiting means the agents are stopped."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, delay=5)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            task = asyncio.create_task(orchestrator.run("Test?", sample_excerpts))
+            await asyncio.sleep(0.01)
+            (flight,) = orchestrator._in_flight.values()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(flight.task, timeout=1)
+        
+        assert orchestrator._in_flight == {}
+    
+    @pytest.mark.asyncio
+    async def test_no_coalescing_without_deterministic_mode(self, sample_excerpts, tmp_path):
+        """Test that non-deterministic runs always execute."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            await asyncio.gather(*(
+                orchestrator.run("Test?", sample_excerpts) for _ in range(2)
+            ))
+        
+        assert len(calls) == 6
+
+
+class TestAgentOutputCache:
+    """Tests for reusing unchanged agent outputs across runs."""
+    
+    @pytest.mark.asyncio
+    async def test_prompt_bump_reruns_only_that_agent(self, sample_excerpts, tmp_path):
+        """Test that agents with unchanged inputs are served from cache."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(calls=calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            first = await orchestrator.run("Test?", sample_excerpts)
+            
+            bumped = {"policy": "v3", "risk": "v1", "evidence": "v1", "judge": "v1"}
+            with patch('src.orchestrator.get_prompt_versions', return_value=bumped):
+                second = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert first['trace']['agent_cache_hits'] == []
+        assert second['trace']['replayed'] is False
+        assert second['trace']['agent_cache_hits'] == ["evidence", "risk"]
+        assert calls[3:] == ["PolicyAgent"]
+        assert second['agent_outputs'] == first['agent_outputs']
+    
+    @pytest.mark.asyncio
+    async def test_changed_context_misses(self, sample_excerpts, tmp_path):
+        """Test that a different rendered context is never served from cache."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(calls=calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            result = await orchestrator.run("Another question?", sample_excerpts)
+        
+        assert result['trace']['agent_cache_hits'] == []
+        assert len(calls) == 6
+    
+    @pytest.mark.asyncio
+    async def test_disabled_without_deterministic_mode(self, sample_excerpts, tmp_path):
+        """Test that non-deterministic runs always call the agents."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(calls=calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            await orchestrator.run("Test?", sample_excerpts)
+        
+        assert len(calls) == 6
+
+
+class TestAgentUsage:
+    """Tests for recording provider token usage per agent."""
+    
+    @pytest.mark.asyncio
+    async def test_cached_tokens_recorded_per_agent(self, sample_excerpts, tmp_path):
+        """Test that usage, including retries, is summed into the trace."""
+        from agents.usage import Usage
+        from openai.types.responses.response_usage import (
+            InputTokensDetails,
+            OutputTokensDetails,
+        )
+        
+        bad_policy = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-999"])
+        usage = Usage(
+            requests=1,
+            input_tokens=1000,
+            input_tokens_details=InputTokensDetails(
+                cached_tokens=768, cache_write_tokens=0
+            ),
+            output_tokens=50,
+            output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+            total_tokens=1050,
+        )
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(
+                {"PolicyAgent": [bad_policy, AGENT_OUTPUTS["PolicyAgent"]]}, usage=usage
+            )
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        usage = result['trace']['agent_usage']
+        assert usage['risk'] == {
+            "input_tokens": 1000, "cached_tokens": 768, "output_tokens": 50,
+        }
+        assert usage['policy'] == {
+            "input_tokens": 2000, "cached_tokens": 1536, "output_tokens": 100,
+        }
+    
+    @pytest.mark.asyncio
+    async def test_missing_usage_counts_as_zero(self, sample_excerpts, tmp_path):
+        """Test that results without a usage block record zeros."""
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner()
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert result['trace']['agent_usage']['evidence'] == {
+            "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+        }
+
+
+class TestProviderPacing:
+    """Tests for pacing agent calls through the rate and concurrency limiters."""
+    
+    @pytest.mark.asyncio
+    async def test_every_call_reserved_and_settled(self, sample_excerpts, tmp_path):
+        """Test that each call reserves an estimate and settles actual usage."""
+        from agents.usage import Usage
+        
+        usage = Usage(requests=1, input_tokens=100, output_tokens=20, total_tokens=120)
+        limiter = MagicMock()
+        reservation = MagicMock()
+        limiter.acquire = AsyncMock(return_value=reservation)
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(usage=usage)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, rate_limiter=limiter)
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+        
+        model = str(orchestrator.policy_agent.model)
+        assert limiter.acquire.await_count == 3
+        for call in limiter.acquire.await_args_list:
+            reserved_model, estimated = call.args
+            assert reserved_model == model
+            assert estimated > EXPECTED_OUTPUT_TOKENS
+        assert [c.args for c in reservation.settle.call_args_list] == [(120,)] * 3
+    
+    @pytest.mark.asyncio
+    async def test_calls_held_under_concurrency_limit(self, sample_excerpts, tmp_path):
+        """Test that agent calls take adaptive slots and report latency."""
+        limiter = AdaptiveConcurrencyLimiter(
+            name="orchestrator", initial_limit=1, min_limit=1, max_limit=1
+        )
+        peak = []
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(
+                delays=dict.fromkeys(AGENT_OUTPUTS, 0.01),
+                calls=peak,
+                record=lambda agent, input: limiter.in_flight,
+            )
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, concurrency_limiter=limiter
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert result['verdict']['verdict'] == "APPROVE"
+        assert peak == [1, 1, 1]
+    
+    @pytest.mark.asyncio
+    async def test_calls_queue_as_run_tenant(self, sample_excerpts, tmp_path):
+        """Test that a run's provider calls wait in its tenant's fair queue."""
+        from src.scheduling import current_tenant
+        from src.scheduling.fair import FAIR_QUEUE_WAIT_SECONDS
+        
+        limiter = AdaptiveConcurrencyLimiter(
+            name="tenant-test", initial_limit=1, min_limit=1, max_limit=1
+        )
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(delays=dict.fromkeys(AGENT_OUTPUTS, 0.01))
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, concurrency_limiter=limiter
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts, tenant="acme")
+        
+        # First call takes the free slot; the other two queue as acme
+        waits = FAIR_QUEUE_WAIT_SECONDS.value(queue="tenant-test", tenant="acme")
+        assert waits['count'] == 2
+        assert result['trace']['tenant'] == "acme"
+        assert current_tenant.get() == "default"
+        assert limiter.in_flight == 0
+        assert limiter.baseline_s >= 0.01
+    
+    @pytest.mark.asyncio
+    async def test_shared_client_used_for_every_call(self, sample_excerpts, tmp_path):
+        """Test that every agent call goes through the shared provider client."""
+        from openai import AsyncOpenAI
+        
+        client = AsyncOpenAI(api_key="test")
+        providers = []
+        runner = fake_runner()
+        
+        async def run(agent, input, run_config):
+            providers.append(run_config.model_provider)
+            return await runner(agent, input)
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = run
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, openai_client=client)
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+        
+        assert len(providers) == 3
+        assert all(p is orchestrator.run_config.model_provider for p in providers)
+        # Agents keep plain model names, so per-model keys are unchanged
+        assert isinstance(orchestrator.policy_agent.model, str)
+    
+    def test_provider_client_never_retries(self, tmp_path, monkeypatch):
+        """Test that retries stay with RetryPolicy, with or without a shared client."""
+        from openai import AsyncOpenAI
+        
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        shared = ProofGateOrchestrator(
+            data_dir=tmp_path, openai_client=AsyncOpenAI(api_key="test")
+        )
+        default = ProofGateOrchestrator(data_dir=tmp_path)
+        
+        for orchestrator in (shared, default):
+            client = orchestrator.run_config.model_provider._get_client()
+            assert client.max_retries == 0
+
+
+class TestHedging:
+    """Tests for hedging agent calls slower than their rolling p95."""
+    
+    @staticmethod
+    def _policy(max_hedge_rate=1.0):
+        policy = HedgePolicy(max_hedge_rate=max_hedge_rate, min_samples=5)
+        for name in ("policy", "risk", "evidence"):
+            for _ in range(5):
+                policy.record(name, 0.01)
+        return policy
+    
+    @staticmethod
+    def _runner(calls, cancelled, slow_primary, hedge_policy_output=None):
+        """The first Policy call is slow; its hedge answers at once."""
+        policy = AGENT_OUTPUTS["PolicyAgent"]
+        return fake_runner(
+            {"PolicyAgent": [policy, hedge_policy_output or policy]},
+            {"PolicyAgent": [slow_primary, 0]},
+            calls=calls,
+            cancelled=cancelled,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_primary_cancelled(self, tmp_path, sample_excerpts):
+        """Test that a slow call is duplicated and the faster answer used."""
+        calls, cancelled = [], []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, cancelled, slow_primary=5)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, hedge_policy=self._policy()
+            )
+            await orchestrator.init()
+            result = await asyncio.wait_for(orchestrator.run("Test?", sample_excerpts), timeout=2)
+        
+        assert calls.count("PolicyAgent") == 2
+        assert cancelled == ["PolicyAgent"]
+        assert result['trace']['hedge_wins'] == ["policy"]
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_recorded_as_censored(self, tmp_path, sample_excerpts):
+        """Test that a primary beaten by its hedge still counts as a slow sample."""
+        calls, cancelled = [], []
+        policy = self._policy()
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, cancelled, slow_primary=5)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, hedge_policy=policy)
+            await orchestrator.init()
+            await asyncio.wait_for(orchestrator.run("Test?", sample_excerpts), timeout=2)
+        
+        samples = policy._latencies["policy"]
+        # Five seeded, the winning hedge, and the censored primary
+        assert len(samples) == 7
+        assert samples[-1] >= 0.01
+        assert samples[-1] > samples[-2]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_hedge_response_does_not_win(self, tmp_path, sample_excerpts):
+        """Test that only a citation-valid response can win the race."""
+        calls, cancelled = [], []
+        bad = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-999"])
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(
+                calls, cancelled, slow_primary=0.1, hedge_policy_output=bad
+            )
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, hedge_policy=self._policy()
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert calls.count("PolicyAgent") == 2
+        assert cancelled == []
+        assert result['trace']['hedge_wins'] == []
+        assert result['agent_outputs']['policy']['citations'] == ["POL-001"]
+    
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_budget(self, tmp_path, sample_excerpts):
+        """Test that a spent hedge budget leaves slow calls alone."""
+        calls, cancelled = [], []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, cancelled, slow_primary=0.1)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, hedge_policy=self._policy(max_hedge_rate=0)
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert calls.count("PolicyAgent") == 1
+        assert result['trace']['hedge_wins'] == []
+
+
+class TestProviderFailures:
+    """Tests for retrying transient provider errors and breaking the circuit."""
+    
+    @staticmethod
+    def _server_error():
+        import httpx
+        import openai
+        request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+        return openai.InternalServerError(
+            "upstream error", response=httpx.Response(503, request=request), body=None
+        )
+    
+    @classmethod
+    def _runner(cls, calls, failures):
+        return fake_runner(failures=failures, calls=calls, error=cls._server_error)
+    
+    @pytest.mark.asyncio
+    async def test_transient_error_retried(self, tmp_path, sample_excerpts):
+        """Test that a 5xx is retried after backoff instead of failing the run."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, {"RiskAgent": 2})
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                retry_policy=RetryPolicy(max_attempts=3, base_delay_s=0.001),
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert calls.count("RiskAgent") == 3
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_retries_exhausted_fail_closed(self, tmp_path, sample_excerpts):
+        """Test that persistent transient errors still fail closed."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, {"RiskAgent": 10})
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                retry_policy=RetryPolicy(max_attempts=2, base_delay_s=0.001),
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert calls.count("RiskAgent") == 2
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, tmp_path, sample_excerpts):
+        """Test that once the breaker opens, runs fail closed without calling."""
+        calls = []
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout_s=60)
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, {"RiskAgent": 1})
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                deterministic_mode=False,
+                retry_policy=RetryPolicy(max_attempts=1),
+                circuit_breakers=breakers,
+            )
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            calls.clear()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert calls == []
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert result['verdict']['rule_applied'] == CIRCUIT_OPEN_RULE
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_resumes_traffic(self, tmp_path, sample_excerpts):
+        """Test that a successful probe closes the breaker."""
+        calls = []
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout_s=0)
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, {"RiskAgent": 1})
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                deterministic_mode=False,
+                short_circuit=False,
+                retry_policy=RetryPolicy(max_attempts=1),
+                circuit_breakers=breakers,
+            )
+            await orchestrator.init()
+            await orchestrator.run("Test?", sample_excerpts)
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        model = str(orchestrator.risk_agent.model)
+        assert breakers.for_model(model).state == "closed"
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_hanging_provider_opens_circuit(self, tmp_path, sample_excerpts):
+        """Test that calls cut off by the stage deadline count as failures."""
+        breakers = CircuitBreakers(failure_threshold=3, reset_timeout_s=60)
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(delays=dict.fromkeys(AGENT_OUTPUTS, 60))
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                deterministic_mode=False,
+                stage_budgets=StageBudgets(agents=0.05, retries=0.05),
+                circuit_breakers=breakers,
+            )
+            await orchestrator.init()
+            timed_out = await orchestrator.run("Test?", sample_excerpts)
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        model = str(orchestrator.risk_agent.model)
+        assert timed_out['verdict']['rule_applied'] == DEADLINE_RULE
+        assert breakers.for_model(model).state == "open"
+        assert result['verdict']['rule_applied'] == CIRCUIT_OPEN_RULE
+    
+    @pytest.mark.asyncio
+    async def test_short_circuit_cancel_is_not_a_failure(self, tmp_path, sample_excerpts):
+        """Test that calls cancelled once the verdict is known leave the breaker alone."""
+        stop = RiskAgentOutput(stance="NO", hard_stops=["Bill-and-hold"], rationale="Stop.")
+        breakers = CircuitBreakers(failure_threshold=1, reset_timeout_s=60)
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = fake_runner(
+                {"RiskAgent": stop}, {"PolicyAgent": 60, "EvidenceAgent": 60}
+            )
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path,
+                deterministic_mode=False,
+                short_circuit=True,
+                circuit_breakers=breakers,
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        model = str(orchestrator.risk_agent.model)
+        assert result['trace']['skipped_agents'] == ["evidence", "policy"]
+        assert breakers.for_model(model).state == "closed"
+
+
+class TestCascade:
+    """Tests for running agents on a fast model and escalating doubtful outputs."""
+    
+    @staticmethod
+    def _runner(calls, fast_overrides):
+        """fast_overrides replace the fast model's outputs only."""
+        outputs = {
+            name: lambda agent, input, output=output: (
+                output if agent.model == "fast-model" else AGENT_OUTPUTS[agent.name]
+            )
+            for name, output in fast_overrides.items()
+        }
+        return fake_runner(
+            outputs, calls=calls, record=lambda agent, input: (agent.name, agent.model)
+        )
+    
+    async def _run(self, tmp_path, sample_excerpts, fast_overrides):
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, fast_overrides)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, cascade=True, fast_model="fast-model"
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        return result, calls
+    
+    @pytest.mark.asyncio
+    async def test_clear_cut_answered_by_fast_model(self, tmp_path, sample_excerpts):
+        """Test that agreeing fast outputs are used without escalation."""
+        result, calls = await self._run(tmp_path, sample_excerpts, {})
+        
+        assert {model for _, model in calls} == {"fast-model"}
+        assert result['trace']['escalations'] == {}
+        assert set(result['trace']['agent_models'].values()) == {"fast-model"}
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_borderline_stance_escalated(self, tmp_path, sample_excerpts):
+        """Test that a borderline fast output is re-run on the strong model."""
+        partial = EvidenceAgentOutput(
+            stance="PARTIAL", rationale="Some.", citations=["EVI-001"]
+        )
+        result, calls = await self._run(tmp_path, sample_excerpts, {"EvidenceAgent": partial})
+        
+        strong = [name for name, model in calls if model != "fast-model"]
+        assert strong == ["EvidenceAgent"]
+        assert result['trace']['escalations'] == {"evidence": "borderline"}
+        assert result['trace']['agent_models']['evidence'] != "fast-model"
+        assert result['trace']['agent_models']['policy'] == "fast-model"
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_invalid_citations_escalated(self, tmp_path, sample_excerpts):
+        """Test that a fast output failing validation escalates instead of failing."""
+        bad = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-999"])
+        result, calls = await self._run(tmp_path, sample_excerpts, {"PolicyAgent": bad})
+        
+        assert calls.count(("PolicyAgent", "fast-model")) == 2  # incl. correction retry
+        assert result['trace']['escalations'] == {"policy": "invalid_citations"}
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_disagreement_escalates_pivotal_outputs(self, tmp_path, sample_excerpts):
+        """Test that a dissent sends only outputs the verdict hinges on to the strong model."""
+        no = RiskAgentOutput(stance="NO", rationale="Risky.")
+        result, calls = await self._run(tmp_path, sample_excerpts, {"RiskAgent": no})
+        
+        # Policy NO would leave the REJECT unchanged, so Policy is kept
+        assert result['trace']['escalations'] == {
+            "risk": "disagreement",
+            "evidence": "disagreement",
+        }
+        assert result['trace']['agent_models']['policy'] == "fast-model"
+        assert result['trace']['agent_models']['risk'] != "fast-model"
+        assert result['verdict']['verdict'] == "APPROVE"
+    
+    @pytest.mark.asyncio
+    async def test_versions_and_cache_keys_reflect_models(self, tmp_path, sample_excerpts):
+        """Test that prompt versions name the cascade and cache keys the model used."""
+        partial = EvidenceAgentOutput(
+            stance="PARTIAL", rationale="Some.", citations=["EVI-001"]
+        )
+        result, _ = await self._run(tmp_path, sample_excerpts, {"EvidenceAgent": partial})
+        
+        versions = result['trace']['prompt_versions']
+        assert versions['policy'].startswith("v2@fast-model>")
+        store = TraceStore(tmp_path / "traces.db")
+        fast_key = TraceStore.compute_agent_cache_key(
+            "evidence", versions['evidence'], "fast-model",
+            TraceStore.compute_context_hash(
+                ProofGateOrchestrator(data_dir=tmp_path)._build_context(
+                    "Test?", sample_excerpts, ProofGateOrchestrator.AGENT_VIEWS['evidence']
+                )
+            ),
+        )
+        cached = await store.get_agent_output(fast_key)
+        assert cached['stance'] == "PARTIAL"
+
+
+class TestAgentGraph:
+    """Tests for extra agent nodes scheduled from the agent graph."""
+    
+    @staticmethod
+    def _tax_node(depends_on=("policy",)):
+        from agents import Agent
+        return AgentNode(
+            "tax",
+            Agent(name="TaxAgent", instructions="Tax.", output_type=PolicyAgentOutput),
+            view=("policy",),
+            depends_on=depends_on,
+        )
+    
+    @staticmethod
+    def _runner(calls, tax_output, delays=None):
+        return fake_runner(
+            {"TaxAgent": tax_output}, delays, calls=calls,
+            record=lambda agent, input: (agent.name, input),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_extra_node_runs_after_its_dependency(self, tmp_path, sample_excerpts):
+        """Test that an extra node gets its upstream output and is traced."""
+        tax = PolicyAgentOutput(stance="YES", rationale="No tax issue.", citations=["POL-001"])
+        calls = []
+        delays = {"PolicyAgent": 0.05, "RiskAgent": 0.0, "EvidenceAgent": 0.0, "TaxAgent": 0.02}
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, tax, delays)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, agent_nodes=[self._tax_node()]
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        inputs = dict(calls)
+        assert result['verdict']['verdict'] == "APPROVE"
+        assert result['agent_outputs']['tax']['rationale'] == "No tax issue."
+        assert "## UPSTREAM_OUTPUTS" in inputs["TaxAgent"]
+        assert '"policy":' in inputs["TaxAgent"]
+        assert "## UPSTREAM_OUTPUTS" not in inputs["PolicyAgent"]
+        
+        timings = result['trace']['node_timings']
+        assert set(timings) == {"policy", "risk", "evidence", "tax"}
+        assert timings['tax']['start_ms'] >= timings['policy']['end_ms']
+        assert result['trace']['critical_path'] == ["policy", "tax"]
+        assert result['trace']['prompt_versions']['tax'] == "v1"
+    
+    @pytest.mark.asyncio
+    async def test_extra_node_citations_limited_to_its_view(self, tmp_path, sample_excerpts):
+        """Test that an extra node citing outside its view fails closed."""
+        tax = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["EVI-001"])
+        
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner([], tax)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, deterministic_mode=False,
+                agent_nodes=[self._tax_node()],
+            )
+            await orchestrator.init()
+            result = await orchestrator.run("Test?", sample_excerpts)
+        
+        assert result['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert "EVI-001" in result['verdict']['conditions_to_allow'][0]
+    
+    @pytest.mark.asyncio
+    async def test_rejudge_reruns_dependents(self, tmp_path, sample_excerpts):
+        """Test that re-judging reruns nodes downstream of a changed agent."""
+        tax = PolicyAgentOutput(stance="YES", rationale="Ok.", citations=["POL-001"])
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner([], tax)
+            orchestrator = ProofGateOrchestrator(
+                data_dir=tmp_path, agent_nodes=[self._tax_node(("evidence",))]
+            )
+            await orchestrator.init()
+            previous = await orchestrator.run("Test?", sample_excerpts)
+            
+            added = ExcerptBlock.create("EVI-002", "evidence2", "evidence", "More")
+            result = await orchestrator.rejudge(previous, [added], [])
+        
+        assert result['trace']['reused_agents'] == ["policy"]
+        assert set(result['trace']['node_timings']) == {"evidence", "risk", "tax"}
+    
+    def test_invalid_graph_rejected(self, tmp_path):
+        """Test that an extra node with an unknown dependency is a config error."""
+        with pytest.raises(ValueError, match="unknown"):
+            ProofGateOrchestrator(
+                data_dir=tmp_path, agent_nodes=[self._tax_node(("fx",))]
+            )
+
+
+class TestRunBatch:
+    """Tests for packing several questions into one call per agent."""
+    
+    @staticmethod
+    def _runner(calls, bad_policy_index=None, fail_packed=False):
+        """Packed agents answer every question like their single-question agent."""
+        def packed(agent, input):
+            base = AGENT_OUTPUTS[agent.name.removesuffix("Packed")]
+            n_questions = input.split("## QUESTIONS\n")[1].count("\n") + 1
+            answers = []
+            for i in range(n_questions):
+                answer = base.model_dump()
+                if agent.name == "PolicyAgentPacked" and i == bad_policy_index:
+                    answer['citations'] = ["POL-999"]
+                answers.append({**answer, "question_index": i})
+            return agent.output_type.model_validate({"answers": answers})
+        
+        names = [f"{name}Packed" for name in AGENT_OUTPUTS]
+        return fake_runner(
+            dict.fromkeys(names, packed),
+            failures=dict.fromkeys(names, 1) if fail_packed else None,
+            calls=calls,
+            error=lambda: RuntimeError("packed call failed"),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_one_call_per_agent_per_pack(self, sample_excerpts, tmp_path):
+        """Test that a pack of questions costs one call per agent."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            results = await orchestrator.run_batch(
+                ["Q1?", "Q2?", "Q3?"], sample_excerpts
+            )
+        
+        assert sorted(calls) == ["EvidenceAgentPacked", "PolicyAgentPacked", "RiskAgentPacked"]
+        assert [r['trace']['question'] for r in results] == ["Q1?", "Q2?", "Q3?"]
+        assert all(r['verdict']['verdict'] == "APPROVE" for r in results)
+        assert len({r['trace']['batch_id'] for r in results}) == 1
+        assert results[0]['trace']['reused_agents'] == ["evidence", "policy", "risk"]
+    
+    @pytest.mark.asyncio
+    async def test_packed_agents_built_once(self, sample_excerpts, tmp_path):
+        """Test that batches reuse the packed agents built at construction."""
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner([])
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            with patch('src.orchestrator.create_packed_agent') as create:
+                await orchestrator.run_batch(["Q1?", "Q2?"], sample_excerpts)
+                await orchestrator.run_batch(["Q3?", "Q4?"], sample_excerpts)
+        
+        create.assert_not_called()
+        assert orchestrator.packed_agents['policy'].name == "PolicyAgentPacked"
+    
+    @pytest.mark.asyncio
+    async def test_invalid_answer_falls_back_to_single_call(self, sample_excerpts, tmp_path):
+        """Test that only the question with a bad packed answer is re-asked."""
+        from src.orchestrator import PACKED_FALLBACKS
+        before = PACKED_FALLBACKS.value(agent="policy")
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, bad_policy_index=1)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            results = await orchestrator.run_batch(["Q1?", "Q2?"], sample_excerpts)
+        
+        assert calls.count("PolicyAgent") == 1
+        assert len(calls) == 4
+        assert results[1]['trace']['reused_agents'] == ["evidence", "risk"]
+        assert results[1]['agent_outputs']['policy']['citations'] == ["POL-001"]
+        assert PACKED_FALLBACKS.value(agent="policy") == before + 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_pack_runs_singly(self, sample_excerpts, tmp_path):
+        """Test that a failed packed call falls back for every question."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls, fail_packed=True)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            results = await orchestrator.run_batch(["Q1?", "Q2?"], sample_excerpts)
+        
+        assert len(calls) == 3 + 6
+        assert all(r['verdict']['verdict'] == "APPROVE" for r in results)
+        assert results[0]['trace']['reused_agents'] == []
+    
+    @pytest.mark.asyncio
+    async def test_stored_results_are_replayed_not_packed(self, sample_excerpts, tmp_path):
+        """Test that questions already judged are left out of the packs."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path)
+            await orchestrator.init()
+            await orchestrator.run("Q1?", sample_excerpts)
+            results = await orchestrator.run_batch(["Q1?", "Q2?", "Q3?"], sample_excerpts)
+        
+        assert results[0]['trace']['replayed'] is True
+        assert results[0]['trace']['batch_id'] is None
+        assert calls[3:].count("PolicyAgentPacked") == 1
+        assert results[1]['trace']['batch_id'] == results[2]['trace']['batch_id']
+        assert results[1]['trace']['batch_id'] is not None
+
+
+class TestRejudge:
+    """Tests for agent views and incremental re-judgment."""
+    
+    @pytest.fixture
+    def acceptance(self):
+        return ExcerptBlock.create("EVI-003", "evidence3", "evidence", "Acceptance email")
+    
+    @staticmethod
+    def _runner(calls):
+        """Evidence is SUFFICIENT only once the acceptance email is visible."""
+        def evidence(agent, input):
+            if "EVI-003" in input:
+                return EvidenceAgentOutput(
+                    stance="SUFFICIENT", rationale="Ok.", citations=["EVI-001", "EVI-003"]
+                )
+            return EvidenceAgentOutput(
+                stance="MISSING", missing_evidence=["Acceptance"],
+                rationale="No.", citations=["EVI-001"],
+            )
+        
+        return fake_runner(
+            {
+                "RiskAgent": RiskAgentOutput(
+                    stance="YES", rationale="Ok.", citations=["CON-001"]
+                ),
+                "EvidenceAgent": evidence,
+            },
+            calls=calls,
+            record=lambda agent, input: (agent.name, input),
+        )
+    
+    def test_context_limited_to_view(self, sample_excerpts):
+        """Test that an agent's context holds only its view's sections."""
+        orchestrator = ProofGateOrchestrator()
+        
+        context = orchestrator._build_context(
+            "Q?", sample_excerpts, orchestrator.AGENT_VIEWS['policy']
+        )
+        
+        assert "## CONTRACT_EXCERPTS" in context
+        assert "EVIDENCE_EXCERPTS" not in context
+        assert "EVI-001" not in context
+    
+    @pytest.mark.asyncio
+    async def test_agents_receive_their_views(self, sample_excerpts, tmp_path):
+        """Test that the Policy Agent is not shown evidence."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            await orchestrator.run("Q?", sample_excerpts)
+        
+        contexts = dict(calls)
+        assert "EVI-001" not in contexts["PolicyAgent"]
+        assert "EVI-001" in contexts["RiskAgent"]
+        assert "EVI-001" in contexts["EvidenceAgent"]
+    
+    def test_views_match_prompt_inputs(self):
+        """Test that each agent is shown exactly the sections its prompt declares."""
+        orchestrator = ProofGateOrchestrator()
+        sections = dict(orchestrator.CONTEXT_SECTIONS)
+        
+        for name, view in orchestrator.AGENT_VIEWS.items():
+            instructions = orchestrator.agent_graph.nodes[name].agent.instructions
+            declared = {
+                doc_type for doc_type, header in sections.items()
+                if f"- {header.removeprefix('## ')}:" in instructions
+            }
+            assert declared == set(view), name
+    
+    @pytest.mark.asyncio
+    async def test_evidence_flip_reuses_policy(
+        self, sample_excerpts, acceptance, tmp_path
+    ):
+        """Test that adding the acceptance email reruns only evidence readers."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            before = await orchestrator.run("Q?", sample_excerpts)
+            previous = await orchestrator.trace_store.get_result(before['run_id'])
+            calls.clear()
+            
+            after = await orchestrator.rejudge(previous, [acceptance], [])
+        
+        assert before['verdict']['verdict'] == "INSUFFICIENT_EVIDENCE"
+        assert after['verdict']['verdict'] == "APPROVE"
+        assert sorted(name for name, _ in calls) == ["EvidenceAgent", "RiskAgent"]
+        assert after['trace']['reused_agents'] == ["policy"]
+        assert after['trace']['rejudged_from'] == before['run_id']
+        assert "EVI-003" in after['trace']['excerpt_ids']
+        assert after['agent_outputs']['policy'] == before['agent_outputs']['policy']
+    
+    @pytest.mark.asyncio
+    async def test_removal_reruns_affected_agents(
+        self, sample_excerpts, acceptance, tmp_path
+    ):
+        """Test that removing a contract clause reruns every agent that saw it."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            before = await orchestrator.run("Q?", sample_excerpts)
+            previous = await orchestrator.trace_store.get_result(before['run_id'])
+            calls.clear()
+            
+            after = await orchestrator.rejudge(previous, [], ["CON-001"])
+        
+        assert {name for name, _ in calls} == {"EvidenceAgent", "PolicyAgent", "RiskAgent"}
+        # Risk still cites the removed clause, which is no longer allowed
+        assert "CON-001" in after['error']
+    
+    @pytest.mark.asyncio
+    async def test_prompt_version_change_is_not_reused(
+        self, sample_excerpts, acceptance, tmp_path
+    ):
+        """Test that an output from an older prompt is not carried over."""
+        calls = []
+        with patch('src.orchestrator.Runner') as MockRunner:
+            MockRunner.run = self._runner(calls)
+            
+            orchestrator = ProofGateOrchestrator(data_dir=tmp_path, deterministic_mode=False)
+            await orchestrator.init()
+            before = await orchestrator.run("Q?", sample_excerpts)
+            previous = await orchestrator.trace_store.get_result(before['run_id'])
+            previous['trace']['prompt_versions']['risk'] = "v0"
+            calls.clear()
+            
+            after = await orchestrator.rejudge(previous, [acceptance], [])
+        
+        assert sorted(name for name, _ in calls) == ["EvidenceAgent", "RiskAgent"]
+        assert after['trace']['reused_agents'] == ["policy"]
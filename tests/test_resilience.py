@@ -0,0 +1,362 @@
+"""
+Unit Tests for Resilience
+
+Tests for request deadlines, stage budgets, provider rate limiting,
+request hedging, retries and circuit breakers.
+"""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from src.resilience import (
+    CircuitBreaker,
+    CircuitOpen,
+    Deadline,
+    DeadlineExceeded,
+    HedgePolicy,
+    RateLimiter,
+    RateLimits,
+    RetryPolicy,
+    StageBudgets,
+    TokenBucket,
+    deadline_passed,
+    is_transient,
+)
+
+
+class TestDeadline:
+    """Tests for deadline arithmetic and enforcement."""
+    
+    def test_child_never_extends_parent(self):
+        """Test that a stage budget can only tighten the deadline."""
+        parent = Deadline.after(1.0)
+        
+        assert parent.child(10.0).expires_at == parent.expires_at
+        assert parent.child(0.1).expires_at < parent.expires_at
+        assert parent.child(None) is parent
+    
+    def test_fits(self):
+        """Test that work is only admitted if it can finish in time."""
+        deadline = Deadline.after(1.0)
+        
+        assert deadline.fits(0.5)
+        assert not deadline.fits(5.0)
+    
+    @pytest.mark.asyncio
+    async def test_enforce_raises_with_stage(self):
+        """Test that overrunning a block names the stage."""
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            async with Deadline.after(0.01).enforce("agents"):
+                await asyncio.sleep(1)
+        
+        assert exc_info.value.stage == "agents"
+    
+    @pytest.mark.asyncio
+    async def test_enforce_rejects_expired_deadline(self):
+        """Test that no work starts after the deadline."""
+        with pytest.raises(DeadlineExceeded):
+            async with Deadline.after(0).enforce("judge"):
+                pytest.fail("block should not run")
+    
+    @pytest.mark.asyncio
+    async def test_enforce_passes_fast_work(self):
+        """Test that work finishing in time is unaffected."""
+        async with Deadline.after(1.0).enforce("retrieval"):
+            await asyncio.sleep(0)
+    
+    @pytest.mark.asyncio
+    async def test_deadline_passed_tells_deadline_from_other_cancels(self):
+        """Test that tasks under a deadline see whether it cut them off."""
+        seen = []
+        
+        async def call():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                seen.append(deadline_passed())
+                raise
+        
+        async with Deadline.after(1.0).enforce("agents"):
+            task = asyncio.create_task(call())
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        with pytest.raises(DeadlineExceeded):
+            async with Deadline.after(0.01).enforce("agents"):
+                await asyncio.gather(call())
+        
+        assert seen == [False, True]
+        assert not deadline_passed()
+    
+    def test_default_budgets_match_design_limits(self):
+        """Test the DESIGN.md hard limits used as defaults."""
+        budgets = StageBudgets()
+        
+        assert budgets.agents == 15.0
+        assert budgets.judge == 10.0
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+    
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        """Test that an empty bucket blocks until enough has refilled."""
+        bucket = TokenBucket(per_minute=600)  # 10 per second
+        await bucket.acquire(600)
+        
+        started = time.monotonic()
+        await bucket.acquire(1)
+        
+        assert time.monotonic() - started >= 0.08
+    
+    @pytest.mark.asyncio
+    async def test_oversized_request_allowed_on_full_bucket(self):
+        """Test that a request above capacity is not blocked forever."""
+        bucket = TokenBucket(per_minute=100)
+        
+        await asyncio.wait_for(bucket.acquire(250), timeout=0.5)
+        
+        assert bucket.tokens < 0
+    
+    def test_rejects_non_positive_rate(self):
+        """Test that a zero limit is a configuration error."""
+        with pytest.raises(ValueError):
+            TokenBucket(per_minute=0)
+
+
+class TestRateLimiter:
+    """Tests for per-model request and token limiting."""
+    
+    @pytest.mark.asyncio
+    async def test_settle_refunds_and_charges(self):
+        """Test that actual usage replaces the pre-flight estimate."""
+        limiter = RateLimiter(default=RateLimits(tpm=10_000))
+        bucket = limiter.for_model("gpt-4o").tokens
+        
+        reservation = await limiter.acquire("gpt-4o", 1_000)
+        reservation.settle(400)
+        assert bucket.tokens == pytest.approx(9_600, abs=5)
+        
+        reservation = await limiter.acquire("gpt-4o", 1_000)
+        reservation.settle(3_000)
+        reservation.settle(100)  # second settle is ignored
+        assert bucket.tokens == pytest.approx(6_600, abs=5)
+    
+    @pytest.mark.asyncio
+    async def test_unknown_usage_keeps_estimate(self):
+        """Test that a call without usage stays charged at its estimate."""
+        limiter = RateLimiter(default=RateLimits(tpm=10_000))
+        
+        (await limiter.acquire("gpt-4o", 1_000)).settle(0)
+        
+        assert limiter.for_model("gpt-4o").tokens.tokens == pytest.approx(9_000, abs=5)
+    
+    @pytest.mark.asyncio
+    async def test_models_limited_independently(self):
+        """Test that exhausting one model does not slow another."""
+        limiter = RateLimiter(
+            default=RateLimits(rpm=600),
+            per_model={"gpt-4o": RateLimits(rpm=1)},
+        )
+        await limiter.acquire("gpt-4o", 0)
+        
+        await asyncio.wait_for(limiter.acquire("gpt-4o-mini", 0), timeout=0.5)
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(limiter.acquire("gpt-4o", 0), timeout=0.1)
+    
+    @pytest.mark.asyncio
+    async def test_unlimited_by_default(self):
+        """Test that no configured limits means no buckets."""
+        limiter = RateLimiter()
+        
+        (await limiter.acquire("gpt-4o", 10**9)).settle(10**9)
+        
+        assert limiter.for_model("gpt-4o").requests is None
+        assert limiter.for_model("gpt-4o").tokens is None
+    
+    def test_from_env(self, monkeypatch):
+        """Test that defaults and per-model overrides are read from env."""
+        monkeypatch.setenv("RATE_LIMIT_RPM", "500")
+        monkeypatch.setenv("RATE_LIMIT_TPM", "30000")
+        monkeypatch.setenv("RATE_LIMITS_JSON", '{"gpt-4o-mini": {"tpm": 200000}}')
+        
+        limiter = RateLimiter.from_env()
+        
+        assert limiter.default == RateLimits(rpm=500, tpm=30_000)
+        assert limiter.for_model("gpt-4o-mini").requests is None
+        assert limiter.for_model("gpt-4o-mini").tokens.capacity == 200_000
+    
+    def test_from_env_rejects_bad_json(self, monkeypatch):
+        """Test that malformed overrides fail loudly."""
+        monkeypatch.setenv("RATE_LIMITS_JSON", "{not json")
+        
+        with pytest.raises(ValueError):
+            RateLimiter.from_env()
+
+
+class TestHedgePolicy:
+    """Tests for hedge delays and the hedge budget."""
+    
+    def test_no_delay_until_enough_samples(self):
+        """Test that an agent is not hedged before its latency is known."""
+        policy = HedgePolicy(min_samples=5)
+        for _ in range(4):
+            policy.record("policy", 1.0)
+        
+        assert policy.delay_s("policy") is None
+        policy.record("policy", 1.0)
+        assert policy.delay_s("policy") == 1.0
+        assert policy.delay_s("risk") is None
+    
+    def test_delay_is_rolling_percentile(self):
+        """Test that the delay is the p95 of the most recent window."""
+        policy = HedgePolicy(window=100, min_samples=1)
+        for ms in range(1, 201):
+            policy.record("policy", ms / 1000)
+        
+        # Window holds 101..200 ms; the 95th of those is 195 ms
+        assert policy.delay_s("policy") == pytest.approx(0.195)
+    
+    def test_censored_samples_keep_delay_from_drifting_down(self):
+        """Test that cancelled primaries count at least the delay they outlived."""
+        policy = HedgePolicy(window=20, min_samples=1)
+        for _ in range(19):
+            policy.record("policy", 0.1)
+        policy.record_censored("policy", elapsed_s=0.05, floor_s=0.1)
+        
+        # Fast hedges alone would pull p95 under 0.1 s; the censored primaries hold it
+        for _ in range(10):
+            policy.record("policy", 0.02)
+            policy.record_censored("policy", elapsed_s=0.1, floor_s=0.1)
+        
+        assert policy.delay_s("policy") == pytest.approx(0.1)
+    
+    def test_budget_caps_hedge_rate(self):
+        """Test that at most max_hedge_rate of calls are hedged."""
+        policy = HedgePolicy(max_hedge_rate=0.1)
+        hedges = 0
+        for _ in range(100):
+            policy.on_call()
+            hedges += policy.try_hedge("policy")
+        
+        assert 9 <= hedges <= 10
+    
+    def test_budget_does_not_bank_beyond_burst(self):
+        """Test that a quiet spell cannot fund unlimited hedges later."""
+        policy = HedgePolicy(max_hedge_rate=0.5, burst=2)
+        for _ in range(100):
+            policy.on_call()
+        
+        assert [policy.try_hedge("policy") for _ in range(3)] == [True, True, False]
+
+
+def _status_error(cls, status, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    response = httpx.Response(status, headers=headers, request=request)
+    return cls("provider error", response=response, body=None)
+
+
+class TestRetryPolicy:
+    """Tests for transient-error classification and backoff."""
+    
+    def test_transient_errors(self):
+        """Test that timeouts, 429s and 5xx are retried and 4xx are not."""
+        request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+        
+        assert is_transient(openai.APITimeoutError(request=request))
+        assert is_transient(openai.APIConnectionError(request=request))
+        assert is_transient(_status_error(openai.RateLimitError, 429))
+        assert is_transient(_status_error(openai.InternalServerError, 503))
+        assert not is_transient(_status_error(openai.BadRequestError, 400))
+        assert not is_transient(ValueError("bad output"))
+    
+    def test_attempts_capped(self):
+        """Test that a call is tried at most max_attempts times."""
+        policy = RetryPolicy(max_attempts=3)
+        error = _status_error(openai.InternalServerError, 500)
+        
+        assert policy.should_retry(error, 0)
+        assert policy.should_retry(error, 1)
+        assert not policy.should_retry(error, 2)
+    
+    def test_backoff_is_jittered_and_bounded(self):
+        """Test full-jitter backoff under an exponential, capped ceiling."""
+        policy = RetryPolicy(base_delay_s=0.5, max_delay_s=4.0)
+        
+        delays = [policy.backoff_s(1) for _ in range(200)]
+        assert all(0 <= d <= 1.0 for d in delays)
+        assert len(set(delays)) > 1
+        assert all(policy.backoff_s(10) <= 4.0 for _ in range(50))
+    
+    def test_backoff_honours_retry_after(self):
+        """Test that the provider's Retry-After sets a floor on the delay."""
+        policy = RetryPolicy(base_delay_s=0.01, max_delay_s=8.0)
+        error = _status_error(openai.RateLimitError, 429, {"retry-after": "2"})
+        
+        assert policy.backoff_s(0, error) >= 2.0
+
+
+class TestCircuitBreaker:
+    """Tests for the per-model circuit breaker."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker opens at the threshold and fails fast."""
+        breaker = CircuitBreaker("gpt-4o", failure_threshold=3, reset_timeout_s=30)
+        for _ in range(2):
+            breaker.on_failure(breaker.acquire())
+        breaker.on_success(breaker.acquire())  # a success resets the count
+        for _ in range(3):
+            breaker.on_failure(breaker.acquire())
+        
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpen) as exc_info:
+            breaker.acquire()
+        assert exc_info.value.model == "gpt-4o"
+        assert 0 < exc_info.value.retry_after_s <= 30
+    
+    def test_half_open_admits_one_probe(self):
+        """Test that after the reset timeout exactly one probe goes through."""
+        breaker = CircuitBreaker("gpt-4o", failure_threshold=1, reset_timeout_s=0)
+        breaker.on_failure(breaker.acquire())
+        
+        assert breaker.acquire() is True
+        assert breaker.state == "half_open"
+        with pytest.raises(CircuitOpen):
+            breaker.acquire()
+    
+    def test_probe_success_closes(self):
+        """Test that a successful probe resumes normal traffic."""
+        breaker = CircuitBreaker("gpt-4o", failure_threshold=1, reset_timeout_s=0)
+        breaker.on_failure(breaker.acquire())
+        
+        breaker.on_success(breaker.acquire())
+        
+        assert breaker.state == "closed"
+        assert breaker.acquire() is False
+    
+    def test_probe_failure_reopens(self):
+        """Test that a failed probe opens the breaker for another timeout."""
+        breaker = CircuitBreaker("gpt-4o", failure_threshold=1, reset_timeout_s=0)
+        breaker.on_failure(breaker.acquire())
+        probe = breaker.acquire()
+        breaker.reset_timeout_s = 30
+        
+        breaker.on_failure(probe)
+        
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpen):
+            breaker.acquire()
+    
+    def test_abandoned_probe_frees_the_slot(self):
+        """Test that a cancelled probe lets another call probe."""
+        breaker = CircuitBreaker("gpt-4o", failure_threshold=1, reset_timeout_s=0)
+        breaker.on_failure(breaker.acquire())
+        
+        breaker.on_abandon(breaker.acquire())
+        
+        assert breaker.acquire() is True
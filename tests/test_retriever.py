@@ -4,9 +4,15 @@ Unit Tests for Retrieval
 Tests for the SimpleRetriever module.
 """
 
+import asyncio
+import threading
+from unittest.mock import patch
+
 import pytest
 
+from src.retrieve.executor import RetrievalExecutor
 from src.retrieve.simple import SimpleRetriever
+from src.retrieve.filters import ExcerptFilter, FilterIndex, iter_bits
 from src.schemas.documents import ExcerptBlock
 
 
@@ -134,3 +140,221 @@ class TestSimpleRetriever:
         assert len(result['policy']) == 1
         assert len(result['contract']) == 0
         assert len(result['evidence']) == 0
+    
+    def test_get_by_ids(self, sample_excerpts):
+        """Test looking excerpts up by ID, in request order."""
+        retriever = SimpleRetriever(sample_excerpts)
+        
+        found = retriever.get_by_ids(["EVI-003", "POL-001"])
+        
+        assert [e.excerpt_id for e in found] == ["EVI-003", "POL-001"]
+        with pytest.raises(KeyError):
+            retriever.get_by_ids(["EVI-999"])
+
+
+class TestFilteredRetrieval:
+    """Tests for bitmap-backed metadata filters."""
+    
+    @pytest.fixture
+    def tagged_excerpts(self):
+        """Excerpts with customer/date/status metadata."""
+        return {
+            'policy': [
+                ExcerptBlock.create("POL-001", "policy1", "policy", "Policy 1"),
+                ExcerptBlock.create("POL-002", "policy1", "policy", "Policy 2"),
+            ],
+            'contract': [
+                ExcerptBlock.create("CON-001", "contract_k", "contract", "K terms",
+                                    metadata={"customer": "K"}),
+                ExcerptBlock.create("CON-002", "contract_j", "contract", "J terms",
+                                    metadata={"customer": "J"}),
+            ],
+            'evidence': [
+                ExcerptBlock.create("EVI-001", "invoice", "evidence", "Invoice",
+                                    metadata={"customer": "K", "date": "2026-01-15", "status": "pending"}),
+                ExcerptBlock.create("EVI-002", "tracker", "evidence", "Tracker",
+                                    metadata={"customer": "K", "date": "2026-01-10", "status": "complete"}),
+                ExcerptBlock.create("EVI-003", "email", "evidence", "Acceptance",
+                                    metadata={"customer": "K", "date": "2026-01-20"}),
+            ],
+        }
+    
+    def _ids(self, result):
+        return [e.excerpt_id for excerpts in result.values() for e in excerpts]
+    
+    def test_no_filter_matches_unfiltered(self, tagged_excerpts):
+        """Test that an empty filter keeps the original slicing behaviour."""
+        retriever = SimpleRetriever(tagged_excerpts)
+        assert retriever.retrieve("Q", ExcerptFilter()) == retriever.retrieve("Q")
+    
+    def test_exclude_ids(self, tagged_excerpts):
+        """Test that excluded IDs are dropped before limits apply."""
+        retriever = SimpleRetriever(tagged_excerpts, evidence_limit=3)
+        result = retriever.retrieve("Q", ExcerptFilter(exclude_ids=["EVI-001"]))
+        
+        assert [e.excerpt_id for e in result['evidence']] == ["EVI-002", "EVI-003"]
+    
+    def test_customer_filter(self, tagged_excerpts):
+        """Test filtering by customer metadata."""
+        retriever = SimpleRetriever(tagged_excerpts)
+        result = retriever.retrieve("Q", ExcerptFilter(customers=["J"]))
+        
+        assert self._ids(result) == ["CON-002"]
+    
+    def test_date_range_filter(self, tagged_excerpts):
+        """Test inclusive date range filtering."""
+        retriever = SimpleRetriever(tagged_excerpts, evidence_limit=3)
+        result = retriever.retrieve(
+            "Q", ExcerptFilter(date_from="2026-01-10", date_to="2026-01-15")
+        )
+        
+        assert self._ids(result) == ["EVI-001", "EVI-002"]
+    
+    def test_combined_filters_intersect(self, tagged_excerpts):
+        """Test that filter fields are AND-ed together."""
+        retriever = SimpleRetriever(tagged_excerpts, evidence_limit=3)
+        result = retriever.retrieve("Q", ExcerptFilter(
+            doc_types=["evidence"],
+            statuses=["pending", "complete"],
+            exclude_ids=["EVI-002"],
+        ))
+        
+        assert self._ids(result) == ["EVI-001"]
+    
+    def test_filter_does_not_mutate_corpus(self, tagged_excerpts):
+        """Test that filtering leaves the underlying lists untouched."""
+        retriever = SimpleRetriever(tagged_excerpts)
+        retriever.retrieve("Q", ExcerptFilter(exclude_ids=["POL-001"]))
+        
+        assert len(retriever.excerpts_by_type['policy']) == 2
+    
+    def test_select_ignores_limits(self, tagged_excerpts):
+        """Test that select returns every match regardless of limits."""
+        retriever = SimpleRetriever(tagged_excerpts, evidence_limit=1)
+        result = retriever.select(ExcerptFilter(customers=["K"]))
+        
+        assert len(result['evidence']) == 3
+    
+    def test_unknown_values_match_nothing(self, tagged_excerpts):
+        """Test that unknown attribute values yield an empty result."""
+        index = FilterIndex(
+            [e for excerpts in tagged_excerpts.values() for e in excerpts]
+        )
+        assert index.mask(ExcerptFilter(doc_ids=["missing"])) == 0
+    
+    def test_customer_bitmaps_built_on_first_use(self, tagged_excerpts):
+        """Test that high-cardinality bitmaps are not materialised up front."""
+        index = FilterIndex(
+            [e for excerpts in tagged_excerpts.values() for e in excerpts]
+        )
+        assert index.bitmaps['customer'] == {}
+        
+        index.mask(ExcerptFilter(customers=["K"]))
+        
+        assert list(index.bitmaps['customer']) == ["K"]
+    
+    def test_date_ranges_match_brute_force(self):
+        """Test date ranges whether or not every date gets a prefix checkpoint."""
+        excerpts = [
+            ExcerptBlock.create(
+                f"EVI-{i:03d}", "evidence1", "evidence", "Record",
+                metadata={'date': f"2026-{1 + i % 12:02d}-{1 + (i * 7) % 28:02d}"},
+            )
+            for i in range(300)
+        ]
+        ranges = [("2026-02-10", "2026-06-03"), (None, "2026-01-15"), ("2026-11-30", None)]
+        
+        for checkpoints in (1000, 8):
+            with patch.object(FilterIndex, "MAX_DATE_CHECKPOINTS", checkpoints):
+                index = FilterIndex(excerpts)
+            for date_from, date_to in ranges:
+                expected = {
+                    i for i, e in enumerate(excerpts)
+                    if (date_from is None or e.metadata['date'] >= date_from)
+                    and (date_to is None or e.metadata['date'] <= date_to)
+                }
+                mask = index.mask(ExcerptFilter(date_from=date_from, date_to=date_to))
+                assert set(iter_bits(mask)) == expected
+    
+    def test_lazy_bitmaps_bounded(self, tagged_excerpts):
+        """Test that lazily built bitmaps are kept in a bounded LRU."""
+        excerpts = [e for group in tagged_excerpts.values() for e in group]
+        with patch.object(FilterIndex, "MAX_CACHED_BITMAPS", 1):
+            index = FilterIndex(excerpts)
+            first = index.mask(ExcerptFilter(doc_ids=[excerpts[0].doc_id]))
+            index.mask(ExcerptFilter(doc_ids=[excerpts[-1].doc_id]))
+            
+            assert list(index.bitmaps['doc_id']) == [excerpts[-1].doc_id]
+            assert index.mask(ExcerptFilter(doc_ids=[excerpts[0].doc_id])) == first
+
+
+class ThreadRecordingRetriever(SimpleRetriever):
+    """CPU-bound retriever that records which thread ran it."""
+    
+    cpu_bound = True
+    
+    def retrieve(self, question, excerpt_filter=None):
+        self.thread_name = threading.current_thread().name
+        return super().retrieve(question, excerpt_filter)
+
+
+class TestRetrievalExecutor:
+    """Tests for off-event-loop retrieval."""
+    
+    @pytest.fixture
+    def sample_excerpts(self):
+        return {
+            'policy': [
+                ExcerptBlock.create("POL-001", "policy1", "policy", "Policy 1"),
+            ],
+            'contract': [],
+            'evidence': [
+                ExcerptBlock.create("EVI-001", "evidence1", "evidence", "Evidence 1"),
+                ExcerptBlock.create("EVI-003", "evidence3", "evidence", "Evidence 3"),
+            ],
+        }
+    
+    def test_auto_mode_inline_for_cheap_retriever(self, sample_excerpts):
+        """Test that non-CPU-bound retrievers take the inline fast path."""
+        executor = RetrievalExecutor(SimpleRetriever(sample_excerpts))
+        assert executor.mode == "inline"
+    
+    def test_auto_mode_thread_for_cpu_bound(self, sample_excerpts):
+        """Test that CPU-bound retrievers are offloaded to threads."""
+        executor = RetrievalExecutor(ThreadRecordingRetriever(sample_excerpts))
+        assert executor.mode == "thread"
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_inline_matches_sync(self, sample_excerpts):
+        """Test that inline results equal a direct retrieve() call."""
+        retriever = SimpleRetriever(sample_excerpts)
+        executor = RetrievalExecutor(retriever)
+        
+        result = await executor.retrieve("Q", ExcerptFilter(exclude_ids=["EVI-001"]))
+        
+        assert result == retriever.retrieve("Q", ExcerptFilter(exclude_ids=["EVI-001"]))
+    
+    @pytest.mark.asyncio
+    async def test_thread_mode_runs_off_loop(self, sample_excerpts):
+        """Test that thread mode runs retrieval on a pool thread."""
+        retriever = ThreadRecordingRetriever(sample_excerpts)
+        executor = RetrievalExecutor(retriever, max_workers=2)
+        
+        results = await asyncio.gather(*(executor.retrieve("Q") for _ in range(5)))
+        executor.shutdown()
+        
+        assert retriever.thread_name.startswith("retrieval")
+        assert all(len(r['evidence']) == 2 for r in results)
+    
+    @pytest.mark.asyncio
+    async def test_process_mode(self, sample_excerpts):
+        """Test that process mode retrieves via worker-local retrievers."""
+        executor = RetrievalExecutor(
+            SimpleRetriever(sample_excerpts), mode="process", max_workers=1
+        )
+        
+        result = await executor.retrieve("Q", ExcerptFilter(exclude_ids=["EVI-003"]))
+        executor.shutdown()
+        
+        assert [e.excerpt_id for e in result['evidence']] == ["EVI-001"]
@@ -255,6 +255,42 @@ class TestExcerptBlock:
         )
         assert excerpt.cite_token == "[CITE=CON-007]"
 
+    
+    def test_prompt_block_rendering(self):
+        """Test that the prompt block is cite token + newline + text."""
+        excerpt = ExcerptBlock.create("POL-001", "policy", "policy", "Clause text.")
+        assert excerpt.prompt_block == "[CITE=POL-001]\nClause text."
+    
+    def test_prompt_block_memoized(self):
+        """Test that the prompt block is rendered once per instance."""
+        excerpt = ExcerptBlock.create("POL-001", "policy", "policy", "Clause text.")
+        assert excerpt.prompt_block is excerpt.prompt_block
+        assert "prompt_block" not in excerpt.model_dump()
+    
+    def test_assignment_rejected(self):
+        """Test that excerpts are immutable, so the memoized block stays valid."""
+        excerpt = ExcerptBlock.create("POL-001", "policy", "policy", "Clause text.")
+        excerpt.prompt_block
+        with pytest.raises(ValidationError):
+            excerpt.text = "changed"
+    
+    def test_copy_with_update_rerenders_block(self):
+        """Test that model_copy(update=...) does not carry a stale block."""
+        excerpt = ExcerptBlock.create("POL-001", "policy", "policy", "Clause text.")
+        excerpt.prompt_block
+        
+        copy = excerpt.model_copy(update={'text': "changed"})
+        
+        assert copy.prompt_block == "[CITE=POL-001]\nchanged"
+        assert excerpt.prompt_block == "[CITE=POL-001]\nClause text."
+    
+    def test_token_count_memoized(self):
+        """Test that the token count is estimated once and follows updates."""
+        excerpt = ExcerptBlock.create("POL-001", "policy", "policy", "x" * 400)
+        
+        assert 100 <= excerpt.token_count <= 110
+        assert "token_count" in excerpt.__dict__
+        assert excerpt.model_copy(update={'text': "x"}).token_count < 10
 
 class TestRunTrace:
     """Tests for RunTrace schema."""
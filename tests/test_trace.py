@@ -199,3 +199,28 @@ class TestTraceStore:
         retrieved = await trace_store.get_trace("upsert-test")
         assert retrieved.input_hash == "hash2"
         assert retrieved.question == "Updated question?"
+    
+    def test_agent_cache_key_covers_every_input(self):
+        """Test that agent, prompt, model and context all change the key."""
+        base = ("policy", "v1", "gpt-4o", TraceStore.compute_context_hash("ctx"))
+        key = TraceStore.compute_agent_cache_key(*base)
+        
+        for i, changed in enumerate(("risk", "v2", "gpt-4o-mini", TraceStore.compute_context_hash("ctx2"))):
+            variant = list(base)
+            variant[i] = changed
+            assert TraceStore.compute_agent_cache_key(*variant) != key
+        assert TraceStore.compute_agent_cache_key(*base) == key
+    
+    @pytest.mark.asyncio
+    async def test_agent_output_roundtrip(self, trace_store):
+        """Test storing and looking up a per-agent output."""
+        from src.schemas.agents import RiskAgentOutput
+        
+        output = RiskAgentOutput(stance="NO", risk_flags=["x"], rationale="r")
+        key = TraceStore.compute_agent_cache_key("risk", "v1", "gpt-4o", "h")
+        
+        assert await trace_store.get_agent_output(key) is None
+        await trace_store.store_agent_output(key, "risk", "v1", "gpt-4o", "h", output)
+        
+        cached = await trace_store.get_agent_output(key)
+        assert RiskAgentOutput.model_validate(cached) == output